@@ -0,0 +1,84 @@
+"""Compare the sync (WSGI) and async (ASGI) read paths under concurrent load.
+
+Serve the same database twice, from `backend/`:
+
+    gunicorn django_app.wsgi -w 1 --threads 32 -b 127.0.0.1:8000
+    uvicorn django_app.asgi:application --workers 1 --port 8001
+
+then run, ideally on another core or machine so the client is not the bottleneck:
+
+    python -m benchmarks.bench_async --concurrency 16 64 256
+
+Each target is hit by `concurrency` keep-alive clients for `--duration`
+seconds and reports requests/s, p50 and p99 latency. Every request carries
+a unique `_` query parameter so the response cache never answers it.
+"""
+import argparse
+import http.client
+import itertools
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+TARGETS = {
+    "wsgi-sync": "http://127.0.0.1:8000/products/?limit=50",
+    "asgi-async": "http://127.0.0.1:8001/async/products/?limit=50",
+}
+
+
+def worker(url, deadline, counter):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        path = f"{parts.path}?{parts.query}&_={next(counter)}"
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Accept": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    connection.close()
+    return latencies, errors
+
+
+def run(url, concurrency, duration):
+    counter = itertools.count()  # shared; next() on it is atomic under the GIL
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: worker(url, deadline, counter), range(concurrency)))
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in results)
+    if not latencies:
+        return 0.0, None, None, errors
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / duration, statistics.median(latencies), p99, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sync-url", default=TARGETS["wsgi-sync"])
+    parser.add_argument("--async-url", default=TARGETS["asgi-async"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        for name, url in (("wsgi-sync", args.sync_url), ("asgi-async", args.async_url)):
+            rps, p50, p99, errors = run(url, concurrency, args.duration)
+            if p50 is None:
+                print(f"{name:>10} c={concurrency:<4} no successful requests ({errors} errors)")
+                continue
+            print(f"{name:>10} c={concurrency:<4} {rps:8.1f} req/s  p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  errors {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare full-document reads with `?fields=` projections on large descriptions.
+
+Run from `backend/` against a disposable database:
+
+    python -m benchmarks.bench_projection --products 20000 --description-size 4096
+
+For each variant it reports the bytes Mongo sent back (summed over the
+`find`/`getMore` replies) and the latency of loading one page.
+"""
+import argparse
+import statistics
+import time
+
+import bson
+from mongoengine import connect, disconnect
+from pymongo import monitoring
+
+from product.models.CategoryModel import ProductCategory
+from product.models.ProductModel import Product
+from product.repositories.ProductRepository import ProductRepository
+
+
+class ReplySizeListener(monitoring.CommandListener):
+    def __init__(self):
+        self.bytes = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        if event.command_name in ("find", "getMore"):
+            self.bytes += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+
+def seed(products, description_size):
+    Product.objects.delete()
+    ProductCategory.objects.delete()
+    category = ProductCategory(title="Benchmark").save()
+    description = "x" * description_size
+    docs = [
+        Product(name=f"Product {i}", description=description, category=category,
+                price=10 + i % 100, brand=f"Brand {i % 20}", quantity=i % 50).to_mongo()
+        for i in range(products)
+    ]
+    Product._get_collection().insert_many(docs)
+
+
+def measure(listener, limit, fields, repeat):
+    timings, sizes = [], []
+    for _ in range(repeat):
+        listener.bytes = 0
+        start = time.perf_counter()
+        list(ProductRepository.get_all(limit=limit, fields=fields))
+        timings.append((time.perf_counter() - start) * 1000)
+        sizes.append(listener.bytes)
+    return {"bytes": statistics.median(sizes), "median_ms": statistics.median(timings)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="mongodb://localhost:27017/")
+    parser.add_argument("--db", default="benchmark_db")
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--description-size", type=int, default=4096)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    listener = ReplySizeListener()
+    connect(args.db, host=args.host, event_listeners=[listener])
+    try:
+        seed(args.products, args.description_size)
+        variants = {
+            "full document": None,
+            "id,name,price": ["id", "name", "price"],
+        }
+        for label, fields in variants.items():
+            result = measure(listener, args.limit, fields, args.repeat)
+            print(f"{label:>15}: {result['bytes']:>10,.0f} bytes  {result['median_ms']:8.2f} ms / page of {args.limit}")
+    finally:
+        disconnect()
+
+
+if __name__ == "__main__":
+    main()
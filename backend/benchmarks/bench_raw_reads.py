@@ -0,0 +1,69 @@
+"""Compare Document hydration with the raw `as_pymongo()` read path.
+
+Run from `backend/` against a disposable database:
+
+    python -m benchmarks.bench_raw_reads --sizes 1000 10000 100000
+
+For each catalog size it times loading and serializing the whole
+collection through both paths, as `ProductListView` does for one page.
+"""
+import argparse
+import statistics
+import time
+
+from mongoengine import connect, disconnect
+
+from product.models.CategoryModel import ProductCategory
+from product.models.ProductModel import Product
+from product.repositories.ProductRepository import ProductRepository
+from product.serializers import product_to_dict, raw_product_to_dict
+
+FIELDS = ["id", "name", "description", "brand", "category", "price", "quantity"]
+
+
+def seed(products):
+    Product.objects.delete()
+    ProductCategory.objects.delete()
+    categories = [ProductCategory(title=f"Category {i}").save() for i in range(10)]
+    batch = []
+    for i in range(products):
+        batch.append(Product(name=f"Product {i}", description="A benchmark product.",
+                             category=categories[i % 10], price=10 + i % 100,
+                             brand=f"Brand {i % 20}", quantity=i % 50).to_mongo())
+        if len(batch) == 10000:
+            Product._get_collection().insert_many(batch)
+            batch = []
+    if batch:
+        Product._get_collection().insert_many(batch)
+
+
+def run(raw):
+    to_dict = raw_product_to_dict if raw else product_to_dict
+    start = time.perf_counter()
+    products = list(ProductRepository.get_all(fields=FIELDS, raw=raw))
+    categories = ProductRepository.get_category_map(products)
+    [to_dict(p, FIELDS, categories) for p in products]
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="mongodb://localhost:27017/")
+    parser.add_argument("--db", default="benchmark_db")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    connect(args.db, host=args.host)
+    try:
+        for size in args.sizes:
+            seed(size)
+            documents = statistics.median(run(raw=False) for _ in range(args.repeat))
+            raw = statistics.median(run(raw=True) for _ in range(args.repeat))
+            print(f"{size:>8,} products: documents {documents:9.1f} ms  raw {raw:9.1f} ms  ({documents / raw:.1f}x)")
+    finally:
+        disconnect()
+
+
+if __name__ == "__main__":
+    main()
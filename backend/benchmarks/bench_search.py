@@ -0,0 +1,94 @@
+"""Time `/products/search/` queries on the text index against a regex scan.
+
+Run from `backend/` against a disposable database:
+
+    python -m benchmarks.bench_search --products 500000
+
+Seeds a synthetic catalog (skipped with `--no-seed` when it is already
+there), then times `ProductRepository.search` and the `$regex` query a
+client-side "search" amounts to, for a few terms of different
+selectivity.
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+
+from mongoengine import connect, disconnect
+
+from product.models.CategoryModel import ProductCategory
+from product.models.ProductModel import Product
+from product.repositories.ProductRepository import ProductRepository
+
+ADJECTIVES = ["compact", "stainless", "cordless", "smart", "vintage", "heavy-duty", "portable", "digital"]
+NOUNS = ["mixer", "blender", "kettle", "toaster", "grinder", "juicer", "scale", "fryer", "oven", "lamp",
+         "speaker", "router", "monitor", "keyboard", "drill", "sander", "backpack", "tent", "stove", "cooler"]
+BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka"]
+TERMS = ["mixer", "stainless kettle", "wonka", "cordless drill sander"]
+FIELDS = ["id", "name", "brand", "price"]
+
+
+def seed(products):
+    Product.objects.delete()
+    ProductCategory.objects.delete()
+    Product.ensure_indexes()
+    categories = [ProductCategory(title=f"Category {i}").save() for i in range(20)]
+    rng = random.Random(42)
+    batch = []
+    for i in range(products):
+        noun = rng.choice(NOUNS)
+        batch.append(Product(
+            name=f"{rng.choice(ADJECTIVES).title()} {noun.title()} {i}",
+            description=f"A {rng.choice(ADJECTIVES)} {noun} that pairs well with a {rng.choice(NOUNS)}.",
+            category=categories[i % 20], price=5 + rng.random() * 500,
+            brand=rng.choice(BRANDS), quantity=rng.randint(0, 100),
+        ).to_mongo())
+        if len(batch) == 10000:
+            Product._get_collection().insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        Product._get_collection().insert_many(batch, ordered=False)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def regex_scan(term):
+    pattern = re.compile("|".join(map(re.escape, term.split())), re.IGNORECASE)
+    query = {"$or": [{"name": pattern}, {"description": pattern}, {"brand": pattern}]}
+    return list(Product._get_collection().find(query, {"name": 1, "brand": 1, "price": 1}).limit(21))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="mongodb://localhost:27017/")
+    parser.add_argument("--db", default="benchmark_db")
+    parser.add_argument("--products", type=int, default=500000)
+    parser.add_argument("--no-seed", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    connect(args.db, host=args.host)
+    try:
+        if not args.no_seed:
+            start = time.perf_counter()
+            seed(args.products)
+            print(f"seeded {args.products:,} products in {time.perf_counter() - start:.1f} s")
+        for term in TERMS:
+            text = timed(lambda: ProductRepository.search(term, limit=20, fields=FIELDS), args.repeat)
+            deep = timed(lambda: ProductRepository.search(term, offset=980, limit=20, fields=FIELDS), args.repeat)
+            scan = timed(lambda: regex_scan(term), args.repeat)
+            print(f"{term!r:>26}: text index {text:8.1f} ms  (offset 980: {deep:8.1f} ms)  regex scan {scan:8.1f} ms")
+    finally:
+        disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""Time every product API route and the main repository methods on synthetic catalogs.
+
+Run from `backend/` against a disposable database:
+
+    python -m benchmarks.bench_suite --sizes 1000 100000 1000000
+
+or, without a mongod, on mongomock (`pip install mongomock`):
+
+    python -m benchmarks.bench_suite --backend memory --sizes 1000
+
+For each size the catalog is regenerated in-process by `manage.py
+generate_catalog --reset` (see `product.fixtures.catalog`), then
+every case runs `--warmup` times untimed and `--repeat` times timed
+(`--heavy-repeat` for full scans such as the export). A case records
+latency percentiles, the Mongo commands it sent per call, by command
+name, and the peak Python heap of one more, traced, call; the
+concurrent stock case also records reservations and releases per second
+across its threads. Routes are
+requested through Django's test client, so the numbers include URL
+resolution, the views and rendering but no network or WSGI server.
+
+Results are written as JSON (`--output`, default
+`benchmarks/results/<timestamp>.json`); `--compare` prints the p50 change
+of every case against an earlier result file.
+
+Caveats: write cases change the catalog that later cases read, the
+response cache is disabled unless `--response-cache` is given, and the
+memory backend cannot run the async routes or count commands (mongomock
+emits no command events). Cases mongomock cannot serve, such as `$text`
+search, are reported with their error instead of timings.
+"""
+import argparse
+import asyncio
+import datetime
+import io
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+import tracemalloc
+from collections import Counter, namedtuple
+from pathlib import Path
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
+import mongoengine  # noqa: E402
+import pymongo  # noqa: E402
+from asgiref.sync import iscoroutinefunction  # noqa: E402
+from bson import ObjectId  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import AsyncClient, Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from mongoengine import connect, disconnect  # noqa: E402
+from mongoengine.connection import get_db  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+
+from product.cache.CategoryCache import category_cache  # noqa: E402
+from product.fixtures import catalog  # noqa: E402
+from product.models.CategoryModel import ProductCategory  # noqa: E402
+from product.models.JobModel import CategoryDeleteJob  # noqa: E402
+from product.models.ProductModel import Product  # noqa: E402
+from product.repositories.CategoryRepository import CategoryRepository  # noqa: E402
+from product.repositories.ProductRepository import ProductRepository  # noqa: E402
+from product.urls import urlpatterns  # noqa: E402
+
+FIELDS = ["id", "name", "brand", "category", "price", "quantity"]
+MEMORY_BACKEND_SKIPS = "needs a mongod: the async views use pymongo's AsyncMongoClient"
+STOCK_THREADS, STOCK_CALLS_PER_THREAD = 16, 50
+
+# `prepare()` runs untimed before every call and returns the zero-argument callable that is timed;
+# a case whose call makes `ops` operations also reports their throughput
+Case = namedtuple("Case", "kind name route method prepare heavy skip ops",
+                  defaults=(None, None, None, False, None, None))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts, by command name, the Mongo commands started while `active` is set."""
+
+    def __init__(self):
+        self.active = False
+        self.commands = Counter()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            commands, self.commands = self.commands, Counter()
+        return commands
+
+    def started(self, event):
+        if self.active:
+            with self._lock:
+                self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def connect_backend(backend, host, db):
+    """Point both connection aliases at the benchmark database."""
+    for alias in ("default", "readonly"):
+        disconnect(alias)
+    if backend == "memory":
+        import mongomock  # only needed for the in-memory stand-in
+
+        for alias in ("default", "readonly"):
+            connect(db, host="mongodb://localhost", mongo_client_class=mongomock.MongoClient, alias=alias)
+        return
+    options = settings.MONGO_CLIENT_OPTIONS
+    connect(db, host=host, alias="default", **options)
+    connect(db, host=host, alias="readonly", read_preference=settings.MONGO_READ_PREFERENCE, **options)
+
+
+def wait_for_jobs(timeout=600):
+    """Block until no background category delete is pending or running."""
+    deadline = time.monotonic() + timeout
+    while CategoryDeleteJob.objects(status__in=["pending", "running"]).count():
+        if time.monotonic() > deadline:
+            raise RuntimeError("Background jobs did not finish.")
+        time.sleep(0.05)
+
+
+class Context:
+    """Ids, titles and clients shared by the cases of one catalog."""
+
+    def __init__(self, categories, backend):
+        self.backend = backend
+        self.categories = [category["title"] for category in categories]
+        self.brands = catalog.make_brands()[:2]  # the two most common
+        collection = Product._get_collection()
+        self.product_ids = [doc["_id"] for doc in collection.find({}, {"_id": 1}).sort("_id", 1).limit(1000)]
+        last = list(collection.find({}, {"_id": 1}).sort("_id", -1).limit(100))
+        self.deep_after = last[-1]["_id"]  # a keyset position 100 products from the end
+        self.product_id = str(self.product_ids[0])
+        # Stock cases reserve and adjust this one, so give it room
+        self.stock_id = str(self.product_ids[1])
+        collection.update_one({"_id": self.product_ids[1]}, {"$set": {"quantity": 10 ** 9}})
+        self.counter = itertools.count()
+        self.client = Client(raise_request_exception=False, HTTP_ACCEPT="application/json")
+        self.async_client = AsyncClient(raise_request_exception=False, headers={"Accept": "application/json"})
+        # One loop for every async request, so one AsyncMongoClient serves them all
+        self.loop = asyncio.new_event_loop()
+        self.delete_job_id = str(self._finished_delete_job())
+
+    def unique(self, prefix):
+        return f"{prefix} {next(self.counter)}"
+
+    def product_row(self, category=None):
+        return {"name": self.unique("Bench Product"), "description": "Created by the benchmark suite.",
+                "category_title": category or self.categories[0], "price": 19.99, "brand": "Acme", "quantity": 5}
+
+    def new_product_id(self):
+        return str(ProductRepository.create(**self.product_row()).id)
+
+    def new_category_with_products(self, products=100):
+        category = ProductCategory(title=self.unique("Bench Category")).save()
+        docs = [{"_id": ObjectId(), "name": f"Doomed {i}", "category": category.id, "category_title": category.title,
+                 "price": 1.0, "brand": "Acme", "quantity": 1} for i in range(products)]
+        Product._get_collection().insert_many(docs)
+        return category.title
+
+    def _finished_delete_job(self):
+        title = self.new_category_with_products(10)
+        job = CategoryRepository.start_delete(title)
+        CategoryRepository.run_delete(job.id)
+        return job.id
+
+    def close(self):
+        self.loop.close()
+
+
+def route_callbacks():
+    return {str(pattern.pattern): pattern.callback for pattern in urlpatterns}
+
+
+def url_case(ctx, route, method, path, body=None, content_type="application/json", label=None, heavy=False):
+    """A Case requesting `path` with `body`; either can be a callable, evaluated untimed before each call."""
+    is_async = iscoroutinefunction(route_callbacks()[route])
+    name = f"{method} /{route}" + (f" [{label}]" if label else "")
+    if is_async and ctx.backend == "memory":
+        return Case("url", name, route, method, None, heavy, MEMORY_BACKEND_SKIPS)
+
+    def prepare():
+        url = path() if callable(path) else path
+        payload = body() if callable(body) else body
+        data = payload if isinstance(payload, (str, bytes)) or payload is None else json.dumps(payload)
+        if is_async:
+            return lambda: ctx.loop.run_until_complete(ctx.async_client.generic(method, url, data or "", content_type))
+
+        def call():
+            response = ctx.client.generic(method, url, data or "", content_type)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            return response
+        return call
+    return Case("url", name, route, method, prepare, heavy)
+
+
+def url_cases(ctx):
+    product, stock, category = ctx.product_id, ctx.stock_id, ctx.categories[0]
+    ndjson = "\n".join(json.dumps(ctx.product_row()) for _ in range(100))
+    bulk = [{"id": str(product_id), "changes": {"price": 42.5}} for product_id in ctx.product_ids[:100]]
+    moves = itertools.cycle(ctx.categories[:2])
+    return [
+        url_case(ctx, "", "GET", "/"),
+        url_case(ctx, "products/", "GET", "/products/?limit=50"),
+        url_case(ctx, "products/", "GET", f"/products/?limit=50&sort=-price&brand={','.join(ctx.brands)}&price_max=250",
+                 label="sorted, filtered"),
+        url_case(ctx, "products/search/", "GET", "/products/search/?q=stainless%20kettle&limit=20"),
+        url_case(ctx, "products/create/", "POST", "/products/create/", body=ctx.product_row()),
+        url_case(ctx, "products/import/", "POST", "/products/import/", body=ndjson,
+                 content_type="application/x-ndjson", label="100 rows"),
+        url_case(ctx, "products/export/", "GET", "/products/export/?fields=id,name,price", heavy=True),
+        url_case(ctx, "products/bulk-update/", "PATCH", "/products/bulk-update/", body=bulk, label="100 items"),
+        url_case(ctx, "products/<str:product_id>/", "GET", f"/products/{product}/"),
+        url_case(ctx, "products/<str:product_id>/", "PUT", f"/products/{product}/", body={"price": 12.5}),
+        url_case(ctx, "products/<str:product_id>/", "DELETE", lambda: f"/products/{ctx.new_product_id()}/"),
+        url_case(ctx, "products/<str:product_id>/stock/reserve/", "POST", f"/products/{stock}/stock/reserve/",
+                 body={"quantity": 1}),
+        url_case(ctx, "products/<str:product_id>/stock/release/", "POST", f"/products/{stock}/stock/release/",
+                 body={"quantity": 1}),
+        url_case(ctx, "products/<str:product_id>/stock/adjust/", "POST", f"/products/{stock}/stock/adjust/",
+                 body={"delta": 1}),
+        url_case(ctx, "categories/<str:category_title>/products/", "GET", f"/categories/{category}/products/?limit=50"),
+        url_case(ctx, "categories/", "GET", "/categories/"),
+        url_case(ctx, "categories/stats/", "GET", "/categories/stats/", heavy=True),
+        url_case(ctx, "categories/create/", "POST", "/categories/create/",
+                 body=lambda: {"title": ctx.unique("Bench Category")}),
+        # Shadowed by the route above, which Django matches first
+        url_case(ctx, "categories/<str:title>/products/", "GET", f"/categories/{category}/products/?limit=50",
+                 label="shadowed"),
+        url_case(ctx, "categories/add-product/", "POST", "/categories/add-product/",
+                 body=lambda: {"product_id": product, "category_title": next(moves)}),
+        url_case(ctx, "categories/delete-jobs/<str:job_id>/", "GET", f"/categories/delete-jobs/{ctx.delete_job_id}/"),
+        url_case(ctx, "categories/<str:title>/", "DELETE", lambda: f"/categories/{ctx.new_category_with_products()}/",
+                 label="100 products, background"),
+        url_case(ctx, "async/products/", "GET", "/async/products/?limit=50"),
+        url_case(ctx, "async/products/<str:product_id>/", "GET", f"/async/products/{product}/"),
+        url_case(ctx, "async/categories/", "GET", "/async/categories/"),
+        url_case(ctx, "async/categories/<str:category_title>/products/", "GET",
+                 f"/async/categories/{category}/products/?limit=50"),
+        url_case(ctx, "metrics", "GET", "/metrics"),
+    ] + ([
+        # Only routed with DEBUG_ENDPOINTS on
+        url_case(ctx, "debug/caches/", "GET", "/debug/caches/"),
+        url_case(ctx, "debug/pools/", "GET", "/debug/pools/"),
+        url_case(ctx, "debug/slow-queries/", "GET", "/debug/slow-queries/"),
+    ] if "debug/caches/" in route_callbacks() else [])
+
+
+def repository_cases(ctx):
+    product_ids = ctx.product_ids
+    moves = itertools.cycle(ctx.categories[:2])
+
+    def page_without_snapshots():
+        category_cache.clear()
+        page = list(ProductRepository.get_all(limit=50, fields=FIELDS, raw=True))
+        for doc in page:
+            doc.pop("category_title", None)
+        return lambda: ProductRepository.get_category_map(page)
+
+    def bulk_create():
+        rows = list(enumerate((ctx.product_row() for _ in range(1000)), 1))
+        return lambda: ProductRepository.bulk_create(rows)
+
+    def delete():
+        product_id = ctx.new_product_id()
+        return lambda: ProductRepository.delete(product_id)
+
+    def add_product_to_category():
+        title = next(moves)
+        return lambda: CategoryRepository.add_product_to_category(ctx.product_id, title)
+
+    def concurrent_stock():
+        start_gate = threading.Barrier(STOCK_THREADS)
+
+        def worker():
+            start_gate.wait()
+            for _ in range(STOCK_CALLS_PER_THREAD // 2):
+                ProductRepository.reserve_stock(ctx.stock_id, 1)
+                ProductRepository.release_stock(ctx.stock_id, 1)
+
+        def call():
+            threads = [threading.Thread(target=worker) for _ in range(STOCK_THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return call
+
+    def case(name, call, heavy=False, prepare=None, ops=None):
+        return Case("repository", name, prepare=prepare or (lambda: call), heavy=heavy, ops=ops)
+
+    return [
+        case("ProductRepository.get_all", lambda: list(ProductRepository.get_all(limit=50, fields=FIELDS, raw=True))),
+        case("ProductRepository.get_all [sorted, filtered]", lambda: list(ProductRepository.get_all(
+            limit=50, fields=FIELDS, raw=True, sort="-price", filters={"brand": ctx.brands, "price_max": 250.0}))),
+        case("ProductRepository.get_all [deep page]", lambda: list(ProductRepository.get_all(
+            after=ctx.deep_after, limit=50, fields=FIELDS, raw=True))),
+        case("ProductRepository.search", lambda: ProductRepository.search("stainless kettle", limit=20, fields=FIELDS)),
+        case("ProductRepository.get_product_by_id", lambda: ProductRepository.get_product_by_id(
+            ctx.product_id, fields=FIELDS, raw=True)),
+        case("ProductRepository.get_products_by_category", lambda: list(ProductRepository.get_products_by_category(
+            ctx.categories[0], limit=50, fields=FIELDS, raw=True))),
+        case("ProductRepository.get_category_map [cold cache]", None, prepare=page_without_snapshots),
+        case("ProductRepository.export", lambda: sum(1 for _ in ProductRepository.export(["id", "name", "price"])),
+             heavy=True),
+        case("ProductRepository.create", None, prepare=lambda: ctx.new_product_id),
+        case("ProductRepository.bulk_create [1000 rows]", None, prepare=bulk_create),
+        case("ProductRepository.update", lambda: ProductRepository.update(ctx.product_id, price=13.5)),
+        case("ProductRepository.bulk_update [100 items]", lambda: ProductRepository.bulk_update(
+            [{"id": str(product_id), "changes": {"price": 21.0}} for product_id in product_ids[:100]])),
+        case("ProductRepository.adjust_stock", lambda: ProductRepository.adjust_stock(ctx.stock_id, 1)),
+        case(f"ProductRepository.reserve/release_stock [{STOCK_THREADS} threads]", None, prepare=concurrent_stock,
+             ops=STOCK_THREADS * STOCK_CALLS_PER_THREAD),
+        case("ProductRepository.delete", None, prepare=delete),
+        case("CategoryRepository.get_all", lambda: list(CategoryRepository.get_all(raw=True))),
+        case("CategoryRepository.category_stats", CategoryRepository.category_stats, heavy=True),
+        case("CategoryRepository.get_category_by_title", lambda: CategoryRepository.get_category_by_title(
+            ctx.categories[0])),
+        case("CategoryRepository.add_product_to_category", None, prepare=add_product_to_category),
+        case("CategoryRepository.update", lambda: CategoryRepository.update(
+            ctx.categories[-1], new_description=ctx.unique("Description"))),
+    ]
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "min": round(min(samples), 3),
+        "p50": round(statistics.median(samples), 3),
+        "p90": round(cuts[89], 3),
+        "p99": round(cuts[98], 3),
+        "max": round(max(samples), 3),
+        "mean": round(statistics.fmean(samples), 3),
+    }
+
+
+def measure(case, counter, repeat, warmup, count_commands):
+    samples, statuses, commands = [], Counter(), Counter()
+    for i in range(warmup + repeat):
+        call = case.prepare()
+        counter.take()
+        counter.active = i >= warmup
+        start = time.perf_counter()
+        result = call()
+        elapsed = (time.perf_counter() - start) * 1000
+        counter.active = False
+        if i < warmup:
+            continue
+        samples.append(elapsed)
+        commands += counter.take()
+        if hasattr(result, "status_code"):
+            statuses[result.status_code] += 1
+        wait_for_jobs()
+
+    call = case.prepare()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    wait_for_jobs()
+
+    return {
+        "repeat": repeat,
+        "latency_ms": percentiles(samples),
+        "db_commands": {
+            "per_call": round(sum(commands.values()) / repeat, 2),
+            "by_name": {name: round(count / repeat, 2) for name, count in sorted(commands.items())},
+        } if count_commands else None,
+        "peak_python_kb": round(peak / 1024, 1),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())} or None,
+        "ops_per_s": round(case.ops * repeat / (sum(samples) / 1000)) if case.ops else None,
+    }
+
+
+def run_size(size, args, counter):
+    start = time.perf_counter()
+    # One worker: it writes through this process's connection, which may be mongomock or --host
+    call_command("generate_catalog", products=size, categories=args.categories, workers=1, reset=True,
+                 stdout=io.StringIO())
+    categories = list(ProductCategory._get_collection().find({}, {"title": 1}).sort("_id", 1))
+    print(f"seeded {size:,} products in {time.perf_counter() - start:.1f} s")
+    category_cache.clear()
+    ctx = Context(categories, args.backend)
+    try:
+        cases = url_cases(ctx) + repository_cases(ctx)
+        missing = set(route_callbacks()) - {case.route for case in cases if case.kind == "url"}
+        if missing:
+            raise SystemExit(f"No benchmark case for route(s): {', '.join(sorted(missing))}")
+        results = []
+        for case in cases:
+            if args.only and not any(pattern in case.name for pattern in args.only):
+                continue
+            result = {"size": size, "kind": case.kind, "name": case.name, "route": case.route, "method": case.method}
+            if case.skip:
+                result["skipped"] = case.skip
+                print(f"{size:>9,}  {case.name:<58} skipped: {case.skip}")
+            else:
+                repeat = min(args.repeat, args.heavy_repeat) if case.heavy else args.repeat
+                try:
+                    result.update(measure(case, counter, repeat, args.warmup, args.backend == "mongod"))
+                except Exception as e:  # report the failure and keep going with the other cases
+                    result["error"] = f"{type(e).__name__}: {e}"
+                    print(f"{size:>9,}  {case.name:<58} error: {result['error']}")
+                else:
+                    latency, commands = result["latency_ms"], result["db_commands"]
+                    print(f"{size:>9,}  {case.name:<58} p50 {latency['p50']:9.2f} ms  p99 {latency['p99']:9.2f} ms"
+                          f"  cmds {commands['per_call'] if commands else '-':>6}  heap {result['peak_python_kb']:>9} KB"
+                          + (f"  {result['ops_per_s']:,} ops/s" if result["ops_per_s"] else ""))
+            results.append(result)
+        return results
+    finally:
+        ctx.close()
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "backend": args.backend,
+        "server_version": get_db().command("buildInfo")["version"] if args.backend == "mongod" else None,
+        "sizes": args.sizes,
+        "categories": args.categories,
+        "repeat": args.repeat,
+        "heavy_repeat": args.heavy_repeat,
+        "warmup": args.warmup,
+        "response_cache": args.response_cache,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "pymongo": pymongo.version,
+        "mongoengine": mongoengine.__version__ if hasattr(mongoengine, "__version__") else None,
+        "platform": platform.platform(),
+    }
+
+
+def compare(previous_path, results):
+    previous = {
+        (r["size"], r["kind"], r["name"]): r for r in json.loads(Path(previous_path).read_text())["results"]
+        if "latency_ms" in r
+    }
+    print(f"\np50 against {previous_path}:")
+    for result in results:
+        before = previous.get((result["size"], result["kind"], result["name"]))
+        if before is None or "latency_ms" not in result:
+            continue
+        old, new = before["latency_ms"]["p50"], result["latency_ms"]["p50"]
+        change = f"{(new - old) / old:+7.1%}" if old else "      -"
+        print(f"{result['size']:>9,}  {result['name']:<58} {old:9.2f} -> {new:9.2f} ms  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["mongod", "memory"], default="mongod")
+    parser.add_argument("--host", default="mongodb://localhost:27017/")
+    parser.add_argument("--db", default="benchmark_db")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--heavy-repeat", type=int, default=3, help="repeat cap for full scans (export, stats)")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", nargs="+", help="run only the cases whose name contains one of these")
+    parser.add_argument("--response-cache", action="store_true", help="leave the response cache enabled")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="an earlier result file to print p50 changes against")
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    monitoring.register(counter)  # applies to the clients connected below
+    connect_backend(args.backend, args.host, args.db)
+    setup_test_environment()  # lets the test client through ALLOWED_HOSTS
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)  # 5xx are counted in status_codes
+    overrides = override_settings(
+        MONGO_DATABASE_NAME=args.db,
+        MONGO_CONNECTION_STRING=args.host,
+        RESPONSE_CACHE={**settings.RESPONSE_CACHE, "ENABLED": args.response_cache},
+    )
+    overrides.enable()
+    try:
+        report = {"meta": metadata(args), "results": []}
+        for size in args.sizes:
+            report["results"] += run_size(size, args, counter)
+    finally:
+        overrides.disable()
+        disconnect("default")
+        disconnect("readonly")
+
+    output = Path(args.output) if args.output else (
+        Path(__file__).parent / "results" / f"{datetime.datetime.now():%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nwrote {output}")
+    if args.compare:
+        compare(args.compare, report["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,14 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
+import os
 import mongoengine
 from pathlib import Path
 from mongoengine import connect
+from pymongo import ReadPreference
+from product.monitoring.CommandMonitor import install as install_command_monitor
+from product.monitoring.PoolMonitor import pool_monitor
+from product.monitoring.SlowQueryLog import install as install_slow_query_log
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,6 +31,11 @@ SECRET_KEY = "setup key"
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Route the unauthenticated /debug/ endpoints (cache and pool stats, the slow query log
+# `manage.py slow_queries` reads). Independent of DEBUG so production can turn them on,
+# but only where the port is not reachable from outside.
+DEBUG_ENDPOINTS = os.environ.get("DEBUG_ENDPOINTS", "1" if DEBUG else "0") == "1"
+
 ALLOWED_HOSTS = []
 
 
@@ -48,6 +58,9 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    # Outermost, so the request latencies and the Server-Timing `app` entry cover the whole stack
+    "product.middleware.MetricsMiddleware",
+    "product.middleware.DbCommandMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -91,16 +104,100 @@ DATABASES = {
     }
 }
 
-MONGO_DATABASE_NAME = "interneers_lab_mongodb"
-MONGO_CONNECTION_STRING = "mongodb://localhost:27017/interneers_lab_mongodb"
+MONGO_DATABASE_NAME = os.environ.get("MONGO_DATABASE_NAME", "interneers_lab_mongodb")
+MONGO_CONNECTION_STRING = os.environ.get("MONGO_CONNECTION_STRING", "mongodb://localhost:27017/interneers_lab_mongodb")
 
-# Connect MongoEngine
-import mongoengine
+
+def _env_int(name, default=None):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Driver pool/timeout options shared by every client; unset ones keep the pymongo defaults
+# (100 connections, no minimum, wait for a free connection forever, 30s server selection)
+MONGO_CLIENT_OPTIONS = {
+    name: value
+    for name, value in {
+        "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE"),
+        "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE"),
+        "waitQueueTimeoutMS": _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+        "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+        "compressors": os.environ.get("MONGO_COMPRESSORS"),  # e.g. "zstd,snappy,zlib"
+    }.items()
+    if value is not None
+}
+
+# Alias the read-only GET paths use (see product/db.py). "readonly" sends them to
+# secondaries when there are any; replicas lag, so it is opt-in.
+MONGO_READ_ALIAS = os.environ.get("MONGO_READ_ALIAS", "default")
+MONGO_READ_PREFERENCE = ReadPreference.SECONDARY_PREFERRED
+
+# Mongo commands slower than THRESHOLD_MS, newest MAX_ENTRIES kept for GET /debug/slow-queries/;
+# EXPLAIN_SAMPLE_RATE of the slow reads are re-run through explain to capture their plan
+SLOW_QUERY_LOG = {
+    "THRESHOLD_MS": _env_int("MONGO_SLOW_QUERY_MS", 100),
+    "MAX_ENTRIES": 200,
+    "EXPLAIN_SAMPLE_RATE": 0.1,
+    "EXPLAIN_VERBOSITY": "queryPlanner",
+}
+
+# Per-request command counts for DbCommandMiddleware and the slow query log;
+# both must be registered before any client exists
+install_command_monitor()
+install_slow_query_log(SLOW_QUERY_LOG)
+
+# Connect MongoEngine: one client (and pool) per alias, each reporting to a PoolMonitor
 mongoengine.connect(
     db=MONGO_DATABASE_NAME,
     host=MONGO_CONNECTION_STRING,
-    alias="default"
+    alias="default",
+    event_listeners=[pool_monitor("default")],
+    **MONGO_CLIENT_OPTIONS,
 )
+mongoengine.connect(
+    db=MONGO_DATABASE_NAME,
+    host=MONGO_CONNECTION_STRING,
+    alias="readonly",
+    read_preference=MONGO_READ_PREFERENCE,
+    event_listeners=[pool_monitor("readonly")],
+    **MONGO_CLIENT_OPTIONS,
+)
+
+# X-DB-Commands / Server-Timing headers from product.middleware.DbCommandMiddleware
+DB_COMMAND_HEADERS = DEBUG
+
+# In-process category cache shared by the repositories (entries, seconds)
+CATEGORY_CACHE = {
+    "MAX_SIZE": 1024,
+    "TTL": 300,
+}
+
+# Rendered GET responses of the list endpoints, served with ETags. Writes from other
+# processes are only seen once TTL seconds have passed.
+RESPONSE_CACHE = {
+    "ENABLED": True,
+    "MAX_ENTRIES": 256,
+    "TTL": 60,
+}
+
+# Bulk product import (POST /products/import/)
+PRODUCT_IMPORT_BATCH_SIZE = 1000
+PRODUCT_IMPORT_MAX_BATCH_SIZE = 10000
+
+# Streaming catalog export (GET /products/export/): documents per cursor batch
+PRODUCT_EXPORT_BATCH_SIZE = 1000
+PRODUCT_EXPORT_MAX_BATCH_SIZE = 10000
+
+# Bulk product patch (PATCH /products/bulk-update/)
+PRODUCT_BULK_UPDATE_BATCH_SIZE = 1000
+
+# Background category delete (DELETE /categories/<title>/): products per delete_many,
+# and threads shared by all background jobs of a process
+CATEGORY_DELETE_BATCH_SIZE = 1000
+BACKGROUND_JOB_WORKERS = 2
+# Seconds without progress after which a delete job's process is presumed dead; another
+# DELETE of the category then resumes the job
+CATEGORY_DELETE_JOB_LEASE = 300
 
 
 # Password validation
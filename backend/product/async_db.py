@@ -0,0 +1,63 @@
+"""Non-blocking Mongo access for the async (ASGI) views.
+
+mongoengine only speaks the blocking driver, so the async repositories go
+through pymongo's `AsyncMongoClient` on the same database. A client is
+bound to the event loop it was first used on, so one is kept per loop and
+closed when that loop shuts down. Under ASGI that is one client for the
+life of the server; under WSGI, Django runs each async view on a fresh
+loop, so every request opens and closes its own client (and pool): serve
+the /async/ routes with ASGI.
+Clients take `MONGO_CLIENT_OPTIONS` and report to the "async" PoolMonitor;
+the async views only read, so they follow `MONGO_READ_ALIAS` to the
+secondaries when it is routed away from the default connection.
+"""
+import asyncio
+import weakref
+
+from mongoengine.connection import DEFAULT_CONNECTION_NAME
+from pymongo import AsyncMongoClient
+
+from .conf import get_setting
+from .db import read_alias
+from .monitoring.PoolMonitor import pool_monitor
+
+_clients = weakref.WeakKeyDictionary()  # loop -> (client, closer)
+
+
+def get_async_db():
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(loop)
+    if entry is None:
+        options = dict(get_setting("MONGO_CLIENT_OPTIONS", {}))
+        if read_alias() != DEFAULT_CONNECTION_NAME:
+            options["read_preference"] = get_setting("MONGO_READ_PREFERENCE")
+        client = AsyncMongoClient(
+            get_setting("MONGO_CONNECTION_STRING", "mongodb://localhost:27017/"),
+            event_listeners=[pool_monitor("async")],
+            **options,
+        )
+        closer = _close_on_shutdown(client)
+        loop.create_task(anext(closer))
+        entry = _clients[loop] = (client, closer)
+    return entry[0][get_setting("MONGO_DATABASE_NAME", "interneers_lab_mongodb")]
+
+
+async def _close_on_shutdown(client):
+    """Closes `client` once the loop shuts down.
+
+    Parked at its `yield` for the life of the loop; `asyncio.run` (which
+    asgiref and the ASGI servers use) finalizes the loop's async
+    generators before closing it, which runs the `finally`. `_clients`
+    holds a reference, so it is not finalized earlier by garbage collection.
+    """
+    try:
+        yield
+    finally:
+        # The client refers to its loop, so the weak key alone would keep the entry alive
+        _clients.pop(asyncio.get_running_loop(), None)
+        await client.close()
+
+
+def get_async_collection(document):
+    """Return the async collection backing a mongoengine Document class."""
+    return get_async_db()[document._get_collection_name()]
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+
+from mongoengine import signals
+
+from ..conf import get_setting
+from ..models.CategoryModel import ProductCategory
+from ..monitoring.Metrics import cache_collector, registry
+
+
+class CategoryCache:
+    """In-process LRU + TTL cache of ProductCategory documents, keyed by id and by title.
+
+    Lookups take a loader that is only called on a miss, so the cache does
+    not care how categories are fetched. Entries are dropped by the
+    ProductCategory save/delete signals, so a `.save()` or `.delete()` from
+    anywhere in this process invalidates, and explicitly by CategoryRepository
+    on every write, including raw collection updates that send no signals;
+    the TTL bounds how stale a category changed by another process can get.
+    """
+
+    def __init__(self, max_size=1024, ttl=300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # id -> (category, expires_at)
+        self._ids_by_title = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_title(self, title, load):
+        """Return the category titled `title`, calling `load()` on a miss."""
+        category = self._lookup_title(title)
+        if category is None:
+            category = load()
+            if category is not None:
+                self.put(category)
+        return category
+
+    async def aget_by_title(self, title, load):
+        """Async `get_by_title`; `load()` is awaited on a miss."""
+        category = self._lookup_title(title)
+        if category is None:
+            category = await load()
+            if category is not None:
+                self.put(category)
+        return category
+
+    def get_many_by_title(self, titles, load_many):
+        """Return `{title: category}`, loading every miss with one `load_many(titles)` call."""
+        found, missing = self._lookup_many(titles, self._ids_by_title.get)
+        if missing:
+            for category in load_many(missing):
+                self.put(category)
+                found[category.title] = category
+        return found
+
+    def get_many_by_id(self, category_ids, load_many):
+        """Return `{id: category}`, loading every miss with one `load_many(ids)` call."""
+        found, missing = self._lookup_many(category_ids, lambda category_id: category_id)
+        if missing:
+            for category in load_many(missing):
+                self.put(category)
+                found[category.id] = category
+        return found
+
+    async def aget_many_by_id(self, category_ids, load_many):
+        """Async `get_many_by_id`; `load_many(ids)` is awaited for the misses."""
+        found, missing = self._lookup_many(category_ids, lambda category_id: category_id)
+        if missing:
+            for category in await load_many(missing):
+                self.put(category)
+                found[category.id] = category
+        return found
+
+    def put(self, category):
+        with self._lock:
+            self._remove(category.id)
+            self._entries[category.id] = (category, self._clock() + self.ttl)
+            self._ids_by_title[category.title] = category.id
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, category_id=None, title=None):
+        with self._lock:
+            if title is not None:
+                self._remove(self._ids_by_title.pop(title, None))
+            self._remove(category_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_title.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+    def _lookup_title(self, title):
+        with self._lock:
+            return self._get(self._ids_by_title.get(title))
+
+    def _lookup_many(self, keys, to_id):
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                category = self._get(to_id(key))
+                if category is None:
+                    missing.append(key)
+                else:
+                    found[key] = category
+        return found, missing
+
+    def _get(self, category_id):
+        entry = self._entries.get(category_id) if category_id is not None else None
+        if entry is not None and entry[1] > self._clock():
+            self._entries.move_to_end(category_id)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            self._remove(category_id)
+        self.misses += 1
+        return None
+
+    def _remove(self, category_id):
+        entry = self._entries.pop(category_id, None)
+        if entry is not None and self._ids_by_title.get(entry[0].title) == category_id:
+            del self._ids_by_title[entry[0].title]
+
+
+_options = get_setting("CATEGORY_CACHE", {})
+category_cache = CategoryCache(max_size=_options.get("MAX_SIZE", 1024), ttl=_options.get("TTL", 300))
+registry.register_collector(cache_collector("category", category_cache))
+
+
+def _invalidate_category(sender, document, **kwargs):
+    category_cache.invalidate(document.id)
+
+
+signals.post_save.connect(_invalidate_category, sender=ProductCategory)
+signals.post_delete.connect(_invalidate_category, sender=ProductCategory)
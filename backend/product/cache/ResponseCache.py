@@ -0,0 +1,153 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from ..conf import get_setting
+from ..monitoring.Metrics import cache_collector, registry
+
+
+class ResponseCache:
+    """In-process cache of rendered GET responses, invalidated by per-collection version counters.
+
+    The ETag of a response is derived from its URL, Accept header and the
+    current versions of the collections it reads, so a matching
+    `If-None-Match` can be answered with a 304 before the view (or Mongo)
+    is touched. Repositories call `bump()` on every write; the old entries
+    are never served again and age out of the LRU. A random per-process
+    nonce keeps ETags from colliding after a restart resets the counters.
+
+    The counters only see writes made in this process, so the ETag also
+    includes the current `ttl`-second window of the clock: a response and
+    its ETag are served for at most `ttl` seconds, which bounds how stale
+    a write by another worker or a management command can leave them.
+    """
+
+    def __init__(self, max_entries=256, ttl=60, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._nonce = secrets.token_hex(8)
+        self._versions = defaultdict(int)
+        self._entries = OrderedDict()  # etag -> (content, content_type)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def bump(self, *collections):
+        with self._lock:
+            for collection in collections:
+                self._versions[collection] += 1
+
+    def etag(self, request, collections):
+        with self._lock:
+            versions = [f"{c}:{self._versions[c]}" for c in collections]
+        window = str(int(self._clock() // self.ttl))
+        params = sorted((key, value) for key, values in request.GET.lists() for value in values)
+        key = "|".join([self._nonce, window, request.path, repr(params), request.META.get("HTTP_ACCEPT", ""), *versions])
+        return '"%s"' % hashlib.sha1(key.encode()).hexdigest()
+
+    def get(self, etag):
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return entry
+
+    def put(self, etag, content, content_type):
+        with self._lock:
+            self._entries[etag] = (content, content_type)
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "versions": dict(self._versions),
+        }
+
+
+_options = get_setting("RESPONSE_CACHE", {})
+response_cache = ResponseCache(max_entries=_options.get("MAX_ENTRIES", 256), ttl=_options.get("TTL", 60))
+registry.register_collector(cache_collector("response", response_cache))
+
+
+def cache_response(*collections):
+    """Cache a view's 200 GET responses until one of `collections` is written to, or for at most the TTL.
+
+    Responses carry a strong ETag; a request whose If-None-Match matches it
+    gets a 304 without calling the view. Sync and async views are both supported.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapped(request, *args, **kwargs):
+                etag, response = _cached_response(request, collections)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _store_response(etag, response)
+            return markcoroutinefunction(wrapped)
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            etag, response = _cached_response(request, collections)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _store_response(etag, response)
+        return wrapped
+    return decorator
+
+
+def _cached_response(request, collections):
+    """Return `(etag, response)`, where `response` is None when the view has to run."""
+    if request.method not in ("GET", "HEAD") or not get_setting("RESPONSE_CACHE", {}).get("ENABLED", True):
+        return None, None
+
+    etag = response_cache.etag(request, collections)
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        response_cache.not_modified += 1
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return None, response
+
+    cached = response_cache.get(etag)
+    if cached is None:
+        return etag, None
+    response = HttpResponse(cached[0], content_type=cached[1])
+    response["ETag"] = etag
+    return etag, response
+
+
+def _store_response(etag, response):
+    if etag is None or response.status_code != 200:
+        return response
+    if "ETag" not in response:  # freshly rendered by the view, not served from the cache
+        if hasattr(response, "render"):
+            response.render()
+        response_cache.put(etag, response.content, response["Content-Type"])
+    response["ETag"] = etag
+    patch_vary_headers(response, ["Accept"])
+    return response
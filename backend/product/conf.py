@@ -0,0 +1,10 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def get_setting(name, default=None):
+    """Read a Django setting, or `default` when it is unset or settings are not configured."""
+    try:
+        return getattr(settings, name, default)
+    except ImproperlyConfigured:
+        return default
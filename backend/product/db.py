@@ -0,0 +1,36 @@
+"""Routing of the read-only GET paths to the `MONGO_READ_ALIAS` connection.
+
+With the default alias these return exactly what the Document would
+(`Product.objects`, `Product._get_collection()`). With `readonly` they are
+bound to that alias's client, whose `secondaryPreferred` read preference
+spreads list/search/stats/export reads over the replica set. Nothing that
+a write depends on should read through here: secondaries lag the primary.
+"""
+from mongoengine.connection import DEFAULT_CONNECTION_NAME, get_db
+from mongoengine.queryset import QuerySet
+
+from .conf import get_setting
+
+
+def read_alias():
+    return get_setting("MONGO_READ_ALIAS", DEFAULT_CONNECTION_NAME)
+
+
+def read_collection(document):
+    """The pymongo collection of `document` on the read alias."""
+    alias = read_alias()
+    if alias == DEFAULT_CONNECTION_NAME:
+        return document._get_collection()
+    return get_db(alias)[document._get_collection_name()]
+
+
+def read_objects(document):
+    """`document.objects`, evaluated against the read alias.
+
+    Binds a fresh QuerySet to the alias's collection rather than using
+    `QuerySet.using()`, whose `switch_db` swaps the class-wide collection
+    and so is not safe with concurrent requests.
+    """
+    if read_alias() == DEFAULT_CONNECTION_NAME:
+        return document.objects
+    return QuerySet(document, read_collection(document))
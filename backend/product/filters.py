@@ -0,0 +1,63 @@
+"""Product list filters, parsed from query params into one raw Mongo query.
+
+Each filter maps onto an indexed field, so filtering happens in Mongo and
+only the matching page travels over the wire.
+"""
+import datetime
+
+
+def parse_product_filters(params):
+    """Validate the filter query params into a dict, leaving out the ones not given."""
+    filters = {}
+    for name in ("price_min", "price_max"):
+        if params.get(name):
+            try:
+                filters[name] = float(params.get(name))
+            except ValueError:
+                raise ValueError(f"{name} must be a number.")
+    if params.get("brand"):
+        # Comma-separated: brand=Acme,Globex
+        filters["brand"] = [b.strip() for b in params.get("brand").split(",") if b.strip()]
+    if params.get("in_stock"):
+        value = params.get("in_stock").lower()
+        if value not in ("true", "false", "1", "0"):
+            raise ValueError("in_stock must be true or false.")
+        filters["in_stock"] = value in ("true", "1")
+    if params.get("category"):
+        filters["category"] = params.get("category")
+    if params.get("created_after"):
+        try:
+            created_after = datetime.datetime.fromisoformat(params.get("created_after"))
+        except ValueError:
+            raise ValueError("created_after must be an ISO 8601 date or datetime.")
+        if created_after.tzinfo is not None:
+            # created_at is stored as naive local time
+            created_after = created_after.astimezone().replace(tzinfo=None)
+        filters["created_after"] = created_after
+    return filters
+
+
+def filter_query(filters, category_id=None):
+    """Translate parsed `filters` into a raw Mongo query.
+
+    The category title filter has to be resolved to `category_id` by the
+    caller, since that lookup goes through the category cache.
+    """
+    query = {}
+    price = {}
+    if "price_min" in filters:
+        price["$gte"] = filters["price_min"]
+    if "price_max" in filters:
+        price["$lte"] = filters["price_max"]
+    if price:
+        query["price"] = price
+    if filters.get("brand"):
+        brands = filters["brand"]
+        query["brand"] = brands[0] if len(brands) == 1 else {"$in": brands}
+    if "in_stock" in filters:
+        query["quantity"] = {"$gt": 0} if filters["in_stock"] else {"$lte": 0}
+    if category_id is not None:
+        query["category"] = category_id
+    if "created_after" in filters:
+        query["created_at"] = {"$gte": filters["created_after"]}
+    return query
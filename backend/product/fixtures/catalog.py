@@ -0,0 +1,148 @@
+"""Deterministic synthetic catalogs for load testing (`manage.py generate_catalog`).
+
+Products are generated in fixed blocks of BLOCK_SIZE, each from its own
+`Random(f"{seed}:{block}")`, with ids derived from their index; the
+catalog is the same for a given seed and size however many workers
+write it, and each block can be built and inserted by any process.
+
+Distributions: categories and brands are Zipf-skewed (a few big ones, a
+long tail), prices are log-normal around a per-category price level,
+description lengths are log-normal and a few percent of products are
+out of stock. Only bson/pymongo are imported so worker processes start fast.
+"""
+import datetime
+import math
+import random
+import struct
+from multiprocessing.util import Finalize
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+BLOCK_SIZE = 10000
+EPOCH = datetime.datetime(2024, 1, 1)
+CREATED_SPAN = datetime.timedelta(days=730)
+
+DEPARTMENTS = ["Electronics", "Kitchen", "Garden", "Toys", "Books", "Sports", "Outdoor", "Office", "Beauty",
+               "Automotive", "Pet Supplies", "Home Decor", "Tools", "Music", "Baby", "Grocery", "Health",
+               "Jewelry", "Shoes", "Furniture"]
+QUALIFIERS = ["", "Smart ", "Vintage ", "Budget ", "Premium ", "Eco ", "Kids' ", "Professional ", "Travel ", "Seasonal "]
+BRAND_HEADS = ["Nor", "Vel", "Aqu", "Zen", "Kor", "Lum", "Tri", "Ox", "Sol", "Pax",
+               "Ver", "Hal", "Qui", "Bri", "Dyn", "Fal", "Gro", "Mar", "Ori", "Tal"]
+BRAND_TAILS = ["tek", "ora", "ix", "wave", "line", "co", "max", "ium", "era", "forge",
+               "lab", "nest", "ly", "works", "ian", "point", "gen", "vo", "spark", "field"]
+ADJECTIVES = ["compact", "stainless", "cordless", "smart", "vintage", "heavy-duty", "portable", "digital",
+              "ergonomic", "wireless", "foldable", "rechargeable", "waterproof", "classic", "modular", "quiet"]
+NOUNS = ["mixer", "blender", "kettle", "toaster", "grinder", "juicer", "scale", "fryer", "oven", "lamp",
+         "speaker", "router", "monitor", "keyboard", "drill", "sander", "backpack", "tent", "stove", "cooler",
+         "chair", "desk", "shelf", "camera", "headphones", "charger", "vacuum", "heater", "fan", "bottle"]
+WORDS = (ADJECTIVES + NOUNS + [
+    "with", "and", "for", "the", "a", "your", "every", "day", "use", "designed", "built", "durable", "easy",
+    "clean", "fast", "setup", "includes", "warranty", "steel", "aluminium", "battery", "hours", "lightweight",
+    "home", "travel", "office", "family", "gift", "quality", "performance", "energy", "efficient", "safe",
+    "adjustable", "settings", "premium", "finish", "handle", "storage", "compatible", "most", "models",
+])
+OUT_OF_STOCK_RATE = 0.05
+
+
+def make_object_id(moment, index):
+    """A deterministic ObjectId: `moment`'s timestamp followed by `index`."""
+    return ObjectId(struct.pack(">IQ", int(moment.replace(tzinfo=datetime.timezone.utc).timestamp()), index))
+
+
+def make_categories(count, seed):
+    """`count` category documents with zero counters; each carries a `price_level` used by `make_products`."""
+    rng = random.Random(f"{seed}:categories")
+    titles = [f"{qualifier}{department}" for qualifier in QUALIFIERS for department in DEPARTMENTS]
+    categories = []
+    for i in range(count):
+        title = titles[i % len(titles)]
+        if i >= len(titles):
+            title = f"{title} {i // len(titles) + 1}"
+        categories.append({
+            "_id": make_object_id(EPOCH, i),
+            "title": title,
+            "description": f"Synthetic {title.lower()} products.",
+            "product_count": 0,
+            "total_quantity": 0,
+            "deleting": False,
+            "created_at": EPOCH,
+            "updated_at": EPOCH,
+            "price_level": rng.lognormvariate(math.log(40), 0.8),
+        })
+    return categories
+
+
+def make_brands():
+    return [head + tail for head in BRAND_HEADS for tail in BRAND_TAILS]
+
+
+def zipf_cum_weights(count, skew):
+    """Cumulative weights 1/rank**skew, for `Random.choices`; skew 0 is uniform."""
+    total, cumulative = 0.0, []
+    for rank in range(1, count + 1):
+        total += 1 / rank ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+def make_products(seed, block, total, categories, skew=1.0):
+    """The product documents of `block` (indexes block*BLOCK_SIZE up to `total`).
+
+    Returns `(documents, counters)` where counters[i] is the
+    `[product_count, total_quantity]` the block adds to categories[i].
+    """
+    rng = random.Random(f"{seed}:{block}")
+    start = block * BLOCK_SIZE
+    size = min(BLOCK_SIZE, total - start)
+    brands = make_brands()
+    category_indexes = rng.choices(range(len(categories)), cum_weights=zipf_cum_weights(len(categories), skew), k=size)
+    product_brands = rng.choices(brands, cum_weights=zipf_cum_weights(len(brands), 1.1), k=size)
+    counters = [[0, 0] for _ in categories]
+    documents = []
+    for offset in range(size):
+        index = start + offset
+        category_index = category_indexes[offset]
+        category = categories[category_index]
+        brand = product_brands[offset]
+        created_at = EPOCH + CREATED_SPAN * rng.random()
+        quantity = 0 if rng.random() < OUT_OF_STOCK_RATE else min(int(rng.expovariate(1 / 40)) + 1, 1000)
+        price = category["price_level"] * rng.lognormvariate(0, 0.6)
+        words = min(max(int(rng.lognormvariate(math.log(30), 0.6)), 5), 300)
+        documents.append({
+            "_id": make_object_id(created_at, index),
+            "name": f"{brand} {rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()} {rng.randint(100, 9999)}",
+            "description": " ".join(rng.choices(WORDS, k=words)).capitalize() + ".",
+            "category": category["_id"],
+            "category_title": category["title"],
+            "price": max(round(price) - 0.01, 0.99),
+            "brand": brand,
+            "quantity": quantity,
+            "created_at": created_at,
+            "updated_at": created_at + datetime.timedelta(days=90) * rng.random(),
+        })
+        counters[category_index][0] += 1
+        counters[category_index][1] += quantity
+    return documents, counters
+
+
+# Per-process state of the pool workers, set once by `init_worker`
+_worker = {}
+
+
+def init_worker(host, client_options, database, collection, seed, total, categories, skew):
+    """ProcessPoolExecutor initializer: one client per worker process, created after it started
+    and closed when the worker exits."""
+    client = MongoClient(host, **client_options)
+    Finalize(None, client.close, exitpriority=10)
+    _worker.update(
+        collection=client[database][collection],
+        seed=seed, total=total, categories=categories, skew=skew,
+    )
+
+
+def insert_block(block):
+    """Build and insert one block in a pool worker; returns its category counters."""
+    documents, counters = make_products(_worker["seed"], block, _worker["total"], _worker["categories"], _worker["skew"])
+    _worker["collection"].insert_many(documents, ordered=False)
+    return counters
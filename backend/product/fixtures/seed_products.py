@@ -1,8 +1,11 @@
+"""Two hand-written products for a quick manual check against a local test_db.
+
+For load-testing datasets use `manage.py generate_catalog` instead.
+"""
 from mongoengine import connect
 from product.models.ProductModel import Product
 from product.models.CategoryModel import ProductCategory
 
-connect("test_db", host="mongodb://localhost:27017/")
 
 def run():
     Product.objects.delete()
@@ -32,4 +35,6 @@ def run():
     print("Seed data insertion successful")
 
 if __name__ == "__main__":
+    # Connect only when run as a script, so importing this module has no side effects
+    connect("test_db", host="mongodb://localhost:27017/")
     run()
@@ -0,0 +1,29 @@
+"""A thread pool for work that outlives the request that started it.
+
+Jobs record their own progress in Mongo, so any process can report on
+them, but each one runs in the process that accepted it. A job whose
+process exits mid-way stays `running` until its lease runs out (see
+`CategoryRepository.start_delete`), then the next request for the same
+work resumes it.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=get_setting("BACKGROUND_JOB_WORKERS", 2), thread_name_prefix="product-job")
+
+
+def submit(fn, *args, **kwargs):
+    """Run `fn(*args, **kwargs)` on the pool; exceptions are logged rather than lost with the future."""
+    future = executor.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future):
+    exception = future.exception()
+    if exception is not None:
+        logger.error("Background job failed", exc_info=exception)
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from product.cache.ResponseCache import response_cache
+from product.models.CategoryModel import ProductCategory
+from product.models.ProductModel import Product
+
+
+class Command(BaseCommand):
+    help = "Snapshot each category's title onto its products (Product.category_title), in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Products updated per update_many.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the products that are stale.")
+
+    def handle(self, *args, **options):
+        products = Product._get_collection()
+        total = 0
+        for category in ProductCategory._get_collection().find({}, {"title": 1}):
+            stale = {"category": category["_id"], "category_title": {"$ne": category["title"]}}
+            if options["dry_run"]:
+                count = products.count_documents(stale)
+            else:
+                # Re-querying the stale ids each round makes the backfill safe to interrupt and rerun
+                count = 0
+                while True:
+                    ids = [doc["_id"] for doc in products.find(stale, {"_id": 1}).limit(options["batch_size"])]
+                    if not ids:
+                        break
+                    count += products.update_many(
+                        {"_id": {"$in": ids}}, {"$set": {"category_title": category["title"]}}
+                    ).modified_count
+            if count:
+                self.stdout.write(f"  {category['title']}: {count} product(s)")
+            total += count
+
+        if options["dry_run"]:
+            self.stdout.write(f"{total} product(s) to backfill (dry run, nothing written).")
+            return
+        if total:
+            response_cache.bump("products")
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} product(s)."))
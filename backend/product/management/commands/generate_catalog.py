@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from product.cache.ResponseCache import response_cache
+from product.conf import get_setting
+from product.fixtures import catalog
+from product.models.CategoryModel import ProductCategory
+from product.models.JobModel import CategoryDeleteJob
+from product.models.ProductModel import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic catalog of N categories and M products for load testing, "
+        "written with batched insert_many from a pool of worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100000, help="Products to generate (default: %(default)s).")
+        parser.add_argument("--categories", type=int, default=50, help="Categories to generate (default: %(default)s).")
+        parser.add_argument("--seed", type=int, default=42, help="The same seed and sizes give the same catalog.")
+        parser.add_argument("--skew", type=float, default=1.0,
+                            help="Zipf exponent of products per category; 0 spreads them evenly (default: %(default)s).")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Processes building and inserting blocks; 1 runs in this process (default: CPU count).")
+        parser.add_argument("--reset", action="store_true",
+                            help="Drop the products, categories and delete jobs first; indexes are rebuilt after the insert.")
+
+    def handle(self, *args, **options):
+        total, category_count = options["products"], options["categories"]
+        if total < 0 or category_count < 1:
+            raise CommandError("--products must be >= 0 and --categories >= 1.")
+        if options["reset"]:
+            for document in (Product, ProductCategory, CategoryDeleteJob):
+                document.drop_collection()
+        elif Product._get_collection().find_one({}, {"_id": 1}) or ProductCategory._get_collection().find_one({}, {"_id": 1}):
+            raise CommandError("The catalog is not empty; pass --reset to replace it.")
+
+        start = time.perf_counter()
+        categories = catalog.make_categories(category_count, options["seed"])
+        blocks = range((total + catalog.BLOCK_SIZE - 1) // catalog.BLOCK_SIZE)
+        counters = [[0, 0] for _ in categories]
+        for done, block_counters in enumerate(self.insert_blocks(blocks, total, categories, options), start=1):
+            for category_counters, (count, quantity) in zip(counters, block_counters):
+                category_counters[0] += count
+                category_counters[1] += quantity
+            self.stdout.write(f"\r  {min(done * catalog.BLOCK_SIZE, total)}/{total} products", ending="")
+        self.stdout.write("")
+
+        for category, (count, quantity) in zip(categories, counters):
+            del category["price_level"]
+            category["product_count"], category["total_quantity"] = count, quantity
+        ProductCategory._get_collection().insert_many(categories, ordered=False)
+        inserted = time.perf_counter() - start
+
+        # After the insert on a fresh collection: one index build is much cheaper than maintaining them per document
+        for document in (Product, ProductCategory, CategoryDeleteJob):
+            document.ensure_indexes()
+        response_cache.bump("products", "categories")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total} products in {category_count} categories in {elapsed:.1f}s "
+            f"({total / inserted if inserted else 0:,.0f} products/s inserting, {elapsed - inserted:.1f}s building indexes)."
+        ))
+
+    def insert_blocks(self, blocks, total, categories, options):
+        """Insert every block, yielding each block's category counters as it completes."""
+        seed, skew, workers = options["seed"], options["skew"], min(options["workers"], len(blocks))
+        collection = Product._get_collection()
+        if workers <= 1:
+            for block in blocks:
+                documents, counters = catalog.make_products(seed, block, total, categories, skew)
+                if documents:
+                    collection.insert_many(documents, ordered=False)
+                yield counters
+            return
+        # Spawned rather than forked: a forked child would inherit this process's MongoClient
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=catalog.init_worker,
+            initargs=(get_setting("MONGO_CONNECTION_STRING"), get_setting("MONGO_CLIENT_OPTIONS", {}),
+                      collection.database.name, collection.name, seed, total, categories, skew),
+        ) as pool:
+            yield from pool.map(catalog.insert_block, blocks)
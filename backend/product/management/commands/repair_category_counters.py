@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+
+from product.cache.ResponseCache import response_cache
+from product.models.CategoryModel import ProductCategory
+from product.models.ProductModel import Product
+
+
+class Command(BaseCommand):
+    help = "Recompute ProductCategory.product_count and total_quantity from the products and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drift, do not write anything.")
+
+    def handle(self, *args, **options):
+        actual = {
+            row["_id"]: (row["product_count"], row["total_quantity"])
+            for row in Product._get_collection().aggregate([
+                {"$group": {"_id": "$category", "product_count": {"$sum": 1}, "total_quantity": {"$sum": "$quantity"}}},
+            ])
+        }
+
+        fixes = []
+        categories = ProductCategory._get_collection().find({}, {"title": 1, "product_count": 1, "total_quantity": 1})
+        for category in categories:
+            stored = (category.get("product_count", 0), category.get("total_quantity", 0))
+            expected = actual.get(category["_id"], (0, 0))
+            if stored == expected:
+                continue
+            self.stdout.write(
+                f"  drift    {category['title']}: product_count {stored[0]} -> {expected[0]}, "
+                f"total_quantity {stored[1]} -> {expected[1]}"
+            )
+            fixes.append(UpdateOne(
+                {"_id": category["_id"]},
+                {"$set": {"product_count": expected[0], "total_quantity": expected[1]}},
+            ))
+
+        if not fixes:
+            self.stdout.write(self.style.SUCCESS("No drift."))
+        elif options["dry_run"]:
+            self.stdout.write(f"{len(fixes)} categor{'y' if len(fixes) == 1 else 'ies'} drifted (dry run, nothing written).")
+        else:
+            ProductCategory._get_collection().bulk_write(fixes, ordered=False)
+            response_cache.bump("categories")
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(fixes)} categor{'y' if len(fixes) == 1 else 'ies'}."))
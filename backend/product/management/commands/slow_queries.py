@@ -0,0 +1,61 @@
+import json
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the slow Mongo commands recorded by a running server. The log lives in the server "
+        "process, so it is fetched from its GET /debug/slow-queries/ endpoint (only routed with DEBUG_ENDPOINTS on)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/debug/slow-queries/",
+                            help="The server's slow query endpoint (default: %(default)s).")
+        parser.add_argument("--limit", type=int, default=20, help="Newest entries to show (default: %(default)s).")
+        parser.add_argument("--json", action="store_true", help="Print the entries as JSON.")
+        parser.add_argument("--clear", action="store_true", help="Empty the server's log after showing it.")
+
+    def handle(self, *args, **options):
+        url = options["url"]
+        data = self.fetch(Request(f"{url}?limit={options['limit']}"))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(data["entries"], indent=2))
+        elif not data["entries"]:
+            self.stdout.write(f"No commands slower than {data['threshold_ms']} ms.")
+        else:
+            self.stdout.write(
+                f"{len(data['entries'])} newest commands slower than {data['threshold_ms']} ms "
+                f"(the server keeps {data['max_entries']}):"
+            )
+            for entry in data["entries"]:
+                self.write_entry(entry)
+
+        if options["clear"]:
+            self.fetch(Request(url, method="DELETE"))
+            self.stdout.write(self.style.SUCCESS("Cleared."))
+
+    def fetch(self, request):
+        try:
+            with urlopen(request, timeout=10) as response:
+                body = response.read()
+        except (URLError, OSError) as exc:
+            raise CommandError(f"Could not reach {request.full_url}: {exc}")
+        return json.loads(body) if body else None
+
+    def write_entry(self, entry):
+        self.stdout.write(
+            f"\n  {entry['at']}  {entry['duration_ms']:>9.1f} ms  {entry['command']} {entry['collection']}"
+            f"  view={entry['view'] or '-'}  docs={entry['docs_returned'] if entry['docs_returned'] is not None else '-'}"
+        )
+        self.stdout.write(f"    shape: {json.dumps(entry['shape'], default=str)}")
+        plan = entry.get("plan")
+        if isinstance(plan, dict):
+            self.stdout.write(f"    plan:  {plan.get('summary') or plan.get('error')}")
+        elif plan is not None:
+            self.stdout.write(f"    plan:  {plan}")
+        if "error" in entry:
+            self.stdout.write(self.style.ERROR(f"    error: {entry['error']}"))
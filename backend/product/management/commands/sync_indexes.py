@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+
+from product.models.CategoryModel import ProductCategory
+from product.models.ProductModel import Product
+
+DOCUMENTS = (Product, ProductCategory)
+
+
+def index_key(spec):
+    return ", ".join(f"{field}:{direction}" for field, direction in spec)
+
+
+def existing_indexes(collection):
+    """`{name: spec}` of the indexes on the server, a text index's fields read from its weights."""
+    indexes = {}
+    for name, info in collection.index_information().items():
+        key = [(field, direction) for field, direction in info["key"] if field not in ("_fts", "_ftsx")]
+        if "weights" in info:
+            key += [(field, "text") for field in info["weights"]]
+        indexes[name] = key
+    return indexes
+
+
+def index_identity(spec):
+    """What makes two index specs the same index. The server reports a text index's
+    fields in the order of its stored weights, not the declared one, so those are a set."""
+    return (
+        tuple((field, direction) for field, direction in spec if direction != "text"),
+        frozenset(field for field, direction in spec if direction == "text"),
+    )
+
+
+class Command(BaseCommand):
+    help = "Create the indexes declared on the Mongo models and report missing, extra and unused ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report, do not create or drop anything.")
+        parser.add_argument("--drop-extra", action="store_true", help="Drop indexes that are not declared on the model.")
+
+    def handle(self, *args, **options):
+        for document in DOCUMENTS:
+            collection = document._get_collection()
+            self.stdout.write(f"{collection.name}:")
+
+            # Not Document.compare_indexes: it takes a text index's field order from the server's
+            # weights, so a text index declared in another order is reported missing on every run
+            declared = document.list_indexes()
+            existing = existing_indexes(collection)
+            existing_ids = {index_identity(spec) for spec in existing.values()}
+            declared_ids = {index_identity(spec) for spec in declared}
+            missing = [spec for spec in declared if index_identity(spec) not in existing_ids]
+            for spec in missing:
+                self.stdout.write(f"  missing  {index_key(spec)}")
+            if missing and not options["dry_run"]:
+                document.ensure_indexes()
+                self.stdout.write(self.style.SUCCESS(f"  created  {len(missing)} index(es)"))
+
+            for name, spec in existing.items():
+                if name == "_id_" or index_identity(spec) in declared_ids:
+                    continue
+                if options["drop_extra"] and not options["dry_run"]:
+                    collection.drop_index(name)
+                    self.stdout.write(self.style.WARNING(f"  dropped  {name}"))
+                else:
+                    self.stdout.write(f"  extra    {name}")
+
+            for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats["accesses"]["ops"] == 0:
+                    since = stats["accesses"]["since"]
+                    self.stdout.write(f"  unused   {stats['name']} (no accesses since {since:%Y-%m-%d %H:%M})")
@@ -0,0 +1,101 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .conf import get_setting
+from .monitoring.CommandMonitor import track_commands
+from .monitoring.Metrics import registry
+from .monitoring.SlowQueryLog import track_request
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to produce a response, by view.", ["view", "method"],
+)
+requests_total = registry.counter(
+    "http_requests_total", "Responses returned, by view and status code.", ["view", "method", "status"],
+)
+METHODS = frozenset(["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+
+
+class DbCommandMiddleware:
+    """Count the Mongo commands of each request and report them in response headers.
+
+    Adds `X-DB-Commands: <n>` and a `Server-Timing` entry for the time
+    spent in Mongo (`db`) and in the whole request (`app`), which browser
+    dev tools show next to the request. Only commands sent before the
+    response is returned are counted, so a streaming response's body is
+    not included. Disable the headers with `DB_COMMAND_HEADERS = False`.
+    Also attributes slow commands to the request's view in the slow query
+    log. Works under WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with track_commands() as stats, track_request(request):
+            response = self.get_response(request)
+        return self.annotate(response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with track_commands() as stats, track_request(request):
+            response = await self.get_response(request)
+        return self.annotate(response, stats, time.perf_counter() - start)
+
+    @staticmethod
+    def annotate(response, stats, elapsed):
+        if not get_setting("DB_COMMAND_HEADERS", True):
+            return response
+        timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} commands", app;dur={elapsed * 1000:.2f}'
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        response["X-DB-Commands"] = str(stats.count)
+        return response
+
+
+class MetricsMiddleware:
+    """Record each request's latency and status in the `/metrics` registry.
+
+    Requests are labelled by the name of the URL pattern they resolved to
+    rather than by path, so `/products/<id>/` is one series however many
+    products there are; requests that match no pattern share `unmatched`.
+    Works under WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def record(request, response, elapsed):
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.route) if match is not None else "unmatched"
+        method = request.method if request.method in METHODS else "other"
+        request_duration.observe(elapsed, view, method)
+        requests_total.inc(view, method, str(response.status_code))
@@ -6,6 +6,12 @@ import datetime
 class ProductCategory(me.Document):
     title = me.StringField(max_length=100, required=True, unique=True)
     description = me.StringField()
+    # Denormalized from products, kept current with $inc by the repositories
+    # (repair with `manage.py repair_category_counters`)
+    product_count = me.IntField(default=0)
+    total_quantity = me.IntField(default=0)
+    # Set while a background delete removes the products; no new products are accepted
+    deleting = me.BooleanField(default=False)
     created_at = DateTimeField(default=datetime.datetime.now)
     updated_at = DateTimeField(default=datetime.datetime.now)
 
@@ -0,0 +1,23 @@
+import mongoengine as me
+import datetime
+
+
+class CategoryDeleteJob(me.Document):
+    """Progress of a background category delete (see CategoryRepository.run_delete)."""
+    STATUSES = ("pending", "running", "done", "failed")
+
+    # A plain id rather than a reference: the category is gone once the job is done
+    category = me.ObjectIdField(required=True)
+    title = me.StringField(max_length=100, required=True)
+    status = me.StringField(choices=STATUSES, default="pending")
+    total = me.IntField(default=0)
+    deleted = me.IntField(default=0)
+    error = me.StringField()
+    created_at = me.DateTimeField(default=datetime.datetime.now)
+    updated_at = me.DateTimeField(default=datetime.datetime.now)
+    finished_at = me.DateTimeField()
+
+    meta = {'collection': 'category_delete_jobs'}
+
+    def __str__(self):
+        return f"{self.title} ({self.status})"
@@ -7,13 +7,35 @@ class Product(me.Document):
     name = me.StringField(max_length=255, required=True)
     description = me.StringField()
     category = me.ReferenceField(ProductCategory, required=True, reverse_delete_rule=me.CASCADE)
+    # Snapshot of category.title so products render without a category lookup;
+    # CategoryRepository.update fans renames out (backfill: `manage.py backfill_category_titles`)
+    category_title = me.StringField(max_length=100)
     price = me.FloatField(required=True)
     brand = me.StringField(max_length=100, required=True)  # Enforcing brand as required
     quantity = me.IntField(default=0, min_value=0)
     created_at = DateTimeField(default=datetime.datetime.now)
     updated_at = DateTimeField(default=datetime.datetime.now)
 
-    meta = {'collection': 'products'}
+    meta = {
+        'collection': 'products',
+        'indexes': [
+            ('category', 'id'),          # by-category keyset pages
+            ('category', 'created_at'),  # by-category, newest first
+            'brand',
+            # Sorted keyset pages seek on (sort field, _id); also serve range filters on the field
+            ('name', 'id'),
+            ('price', 'id'),
+            ('created_at', 'id'),
+            ('updated_at', 'id'),
+            {
+                # /products/search/: one weighted text index over the searchable fields
+                'fields': ['$name', '$brand', '$description'],
+                'default_language': 'english',
+                'weights': {'name': 10, 'brand': 5, 'description': 1},
+                'name': 'product_text',
+            },
+        ],
+    }
 
     def save(self, *args, **kwargs):
         """Auto-update `updated_at` timestamp on save."""
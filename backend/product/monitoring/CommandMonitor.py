@@ -0,0 +1,118 @@
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+
+from pymongo import monitoring
+
+from .Metrics import FAST_BUCKETS, registry
+
+command_duration = registry.histogram(
+    "mongodb_command_duration_seconds", "Mongo command round trips, as timed by the driver.",
+    ["command", "collection"], buckets=FAST_BUCKETS,
+)
+command_failures = registry.counter(
+    "mongodb_command_failures_total", "Mongo commands that returned an error.", ["command", "collection"],
+)
+
+
+class CommandStats:
+    """The Mongo commands sent inside one `track_commands()` block, and their total duration."""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0  # seconds, summed over the commands that completed
+        self.by_name = Counter()
+
+    def started(self, command_name):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.by_name[command_name] += 1
+            stats = stats.parent
+
+    def finished(self, seconds):
+        stats = self
+        while stats is not None:
+            stats.duration += seconds
+            stats = stats.parent
+
+    def __repr__(self):
+        return f"<CommandStats {self.count} commands in {self.duration * 1000:.2f} ms: {dict(self.by_name)}>"
+
+
+_current = contextvars.ContextVar("db_command_stats", default=None)
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Attributes every command to the `CommandStats` of the `track_commands()` block it runs in.
+
+    The block is found through a context variable, so it follows the
+    request's thread, or its task under ASGI; commands from other threads
+    (background jobs, other requests) are not counted against it. Every
+    command, tracked or not, is also recorded in the `/metrics` histograms
+    by command and collection.
+    """
+
+    def __init__(self):
+        # (connection, request id) -> (command, collection) of the commands in flight;
+        # the completion events don't carry the command document
+        self._in_flight = {}
+
+    def started(self, event):
+        self._in_flight[(event.connection_id, event.request_id)] = (event.command_name, command_collection(event))
+        stats = _current.get()
+        if stats is not None:
+            stats.started(event.command_name)
+
+    def succeeded(self, event):
+        command_duration.observe(event.duration_micros / 1e6, *self._finished(event))
+
+    def failed(self, event):
+        command_failures.inc(*self._finished(event))
+
+    def _finished(self, event):
+        """Credit the duration to the current block; returns the command's metric labels."""
+        stats = _current.get()
+        if stats is not None:
+            stats.finished(event.duration_micros / 1e6)
+        return self._in_flight.pop((event.connection_id, event.request_id), (event.command_name, ""))
+
+
+def command_collection(event):
+    """The collection a command targets: the value of its first key for CRUD commands, `collection` for getMore."""
+    collection = event.command.get(event.command_name)
+    if not isinstance(collection, str):
+        collection = event.command.get("collection")
+    return collection if isinstance(collection, str) else ""
+
+
+command_monitor = CommandMonitor()
+_installed = False
+
+
+def install():
+    """Register `command_monitor` with pymongo; it sees the clients created from then on.
+
+    Registered globally rather than per client so that every client is
+    covered, including the async ones and those tests connect themselves.
+    Safe to call more than once.
+    """
+    global _installed
+    if not _installed:
+        monitoring.register(command_monitor)
+        _installed = True
+
+
+@contextmanager
+def track_commands():
+    """Collect the commands sent in this block into the yielded CommandStats.
+
+    Blocks nest: an inner block's commands also count towards the outer one.
+    """
+    stats = CommandStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
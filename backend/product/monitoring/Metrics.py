@@ -0,0 +1,171 @@
+"""A small in-process metrics registry rendered in the Prometheus text format.
+
+Counters and histograms are updated on the hot path: an update is a dict
+lookup, a bisect into the bucket bounds and a few additions under the
+metric's lock. Values that already live elsewhere (cache and pool
+counters) are read by collectors only when `/metrics` is scraped.
+"""
+import bisect
+import math
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for labelvalues, value in values:
+            yield self.name, dict(zip(self.labelnames, labelvalues)), value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labelvalues -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labelvalues)
+            if counts is None:
+                counts = self._values[labelvalues] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(labelvalues, list(counts)) for labelvalues, counts in self._values.items()]
+        for labelvalues, counts in values:
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_count", labels, cumulative
+            yield f"{self.name}_sum", labels, counts[-1]
+
+
+class Family:
+    """Samples produced by a collector at scrape time."""
+
+    def __init__(self, name, type, documentation, labelnames=()):
+        self.name = name
+        self.type = type
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._samples = []
+
+    def add(self, value, *labelvalues):
+        self._samples.append((self.name, dict(zip(self.labelnames, labelvalues)), value))
+        return self
+
+    def samples(self):
+        return iter(self._samples)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collect):
+        """Add `collect()`, called on every scrape, returning an iterable of Families."""
+        with self._lock:
+            self._collectors.append(collect)
+        return collect
+
+    def render(self):
+        """The text exposition of every metric; collector Families sharing a name are merged."""
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        for collect in collectors:
+            metrics.extend(collect())
+        families = {}
+        for metric in metrics:
+            if metric.name not in families:
+                families[metric.name] = (metric, [])
+            families[metric.name][1].extend(metric.samples())
+        lines = []
+        for name, (metric, samples) in families.items():
+            lines.append(f"# HELP {name} {_escape(metric.documentation, quotes=False)}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(text, quotes=True):
+    text = str(text).replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quotes else text
+
+
+def _format_value(value):
+    if value is None:
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return f"{value:.1f}"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def cache_collector(name, cache):
+    """A collector exposing the `stats()` of one of the in-process caches, labelled `cache=name`."""
+    def collect():
+        stats = cache.stats()
+        return [
+            Family("cache_hits_total", "counter", "Lookups answered from an in-process cache.", ["cache"])
+            .add(stats["hits"], name),
+            Family("cache_misses_total", "counter", "Lookups an in-process cache could not answer.", ["cache"])
+            .add(stats["misses"], name),
+            Family("cache_hit_ratio", "gauge", "Hits over lookups since the process started.", ["cache"])
+            .add(stats["hit_ratio"], name),
+            Family("cache_entries", "gauge", "Entries currently held by an in-process cache.", ["cache"])
+            .add(stats["size"], name),
+        ]
+    return collect
+
+
+registry = Registry()
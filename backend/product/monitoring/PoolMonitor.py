@@ -0,0 +1,128 @@
+import threading
+from collections import Counter
+
+from pymongo.monitoring import ConnectionCheckOutFailedReason, ConnectionPoolListener
+
+from .Metrics import FAST_BUCKETS, Family, registry
+
+checkout_wait = registry.histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time operations waited to check a connection out of the pool.",
+    ["pool"], buckets=FAST_BUCKETS,
+)
+
+
+class PoolMonitor(ConnectionPoolListener):
+    """Connection pool counters of one client, fed by the driver's connection pool events.
+
+    `waiting` is the number of operations currently queued for a
+    connection and `wait_ms` how long checkouts took; a pool whose
+    `checked_out` sits at its max size while `waiting` and the waits grow
+    is starved, and `timeouts` counts checkouts that gave up after
+    `waitQueueTimeoutMS`.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.open = 0
+            self.checked_out = 0
+            self.waiting = 0
+            self.max_waiting = 0
+            self.checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.failures = Counter()
+            self.cleared = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.failures[event.reason] += 1
+
+    def connection_checked_out(self, event):
+        duration = event.duration or 0.0
+        with self._lock:
+            self.waiting -= 1
+            self.checked_out += 1
+            self.checkouts += 1
+            self.total_wait += duration
+            self.max_wait = max(self.max_wait, duration)
+        checkout_wait.observe(duration, self.name)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "checkouts": self.checkouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else None,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "timeouts": self.failures[ConnectionCheckOutFailedReason.TIMEOUT],
+                "failures": dict(self.failures),
+                "cleared": self.cleared,
+            }
+
+
+pool_monitors = {}
+
+
+@registry.register_collector
+def collect_pool_metrics():
+    families = [
+        Family("mongodb_pool_connections", "gauge", "Connections open in the pool.", ["pool"]),
+        Family("mongodb_pool_checked_out", "gauge", "Connections currently checked out.", ["pool"]),
+        Family("mongodb_pool_waiting", "gauge", "Operations currently waiting for a connection.", ["pool"]),
+        Family("mongodb_pool_checkouts_total", "counter", "Connections checked out.", ["pool"]),
+        Family("mongodb_pool_checkout_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.", ["pool"]),
+    ]
+    for name, monitor in list(pool_monitors.items()):
+        stats = monitor.stats()
+        for family, key in zip(families, ("open", "checked_out", "waiting", "checkouts", "timeouts")):
+            family.add(stats[key], name)
+    return families
+
+
+def pool_monitor(name):
+    """The PoolMonitor registered as `name`, created on first use; pass it in a client's `event_listeners`."""
+    if name not in pool_monitors:
+        pool_monitors[name] = PoolMonitor(name)
+    return pool_monitors[name]
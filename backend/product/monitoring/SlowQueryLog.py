@@ -0,0 +1,210 @@
+"""The most recent Mongo commands that took longer than a threshold, with their query shape and plan.
+
+Entries live in a fixed-size ring buffer in this process; read them from
+`GET /debug/slow-queries/` (routed with DEBUG_ENDPOINTS on) or `manage.py slow_queries`.
+"""
+import contextvars
+import random
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from mongoengine.connection import get_connection
+from pymongo import monitoring
+
+from .CommandMonitor import command_collection
+
+# Command fields whose values are user data, reported with the values replaced by "?"
+SHAPE_FIELDS = {
+    "find": ("filter",),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query", "update"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+# Command fields reported as they are
+PLAIN_FIELDS = ("sort", "projection", "key", "hint", "limit", "skip")
+EXPLAINABLE = frozenset(["find", "aggregate", "count", "distinct"])
+# Fields the driver adds to a command that an `explain` wrapping it must not carry
+SESSION_FIELDS = frozenset(["lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"])
+
+_request = contextvars.ContextVar("slow_query_request", default=None)
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Keeps the last `max_entries` commands that ran for at least `threshold_ms`.
+
+    Each entry has the command's shape (its filter or pipeline with the
+    values blanked out, so queries that differ only in their arguments
+    look the same), duration, documents returned and the view whose
+    request sent it. A random `explain_sample_rate` share of the
+    explainable ones (find, aggregate, count, distinct) is re-run through
+    `explain` on the background job pool and the winning plan attached to
+    the entry, whose `plan` is "pending" until then.
+    """
+
+    def __init__(self, threshold_ms=100, max_entries=200, explain_sample_rate=0.0, explain_verbosity="queryPlanner"):
+        self._in_flight = {}
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self.configure(threshold_ms, max_entries, explain_sample_rate, explain_verbosity)
+
+    def configure(self, threshold_ms=100, max_entries=200, explain_sample_rate=0.0, explain_verbosity="queryPlanner"):
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.explain_sample_rate = explain_sample_rate
+            self.explain_verbosity = explain_verbosity
+            self._entries = deque(self._entries, maxlen=max_entries)
+
+    @property
+    def max_entries(self):
+        return self._entries.maxlen
+
+    def started(self, event):
+        if event.command_name != "explain":
+            self._in_flight[(event.connection_id, event.request_id)] = (event.command, event.database_name, _request.get())
+
+    def succeeded(self, event):
+        started = self._in_flight.pop((event.connection_id, event.request_id), None)
+        if started is not None and event.duration_micros >= self.threshold_ms * 1000:
+            self._record(event, *started, docs_returned=_docs_returned(event.reply))
+
+    def failed(self, event):
+        started = self._in_flight.pop((event.connection_id, event.request_id), None)
+        if started is not None and event.duration_micros >= self.threshold_ms * 1000:
+            self._record(event, *started, docs_returned=None, error=str(event.failure.get("errmsg", event.failure)))
+
+    def entries(self, limit=None):
+        """Newest first."""
+        with self._lock:
+            entries = list(self._entries)
+        entries.reverse()
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _record(self, event, command, database, request, docs_returned, error=None):
+        explain = event.command_name in EXPLAINABLE and random.random() < self.explain_sample_rate
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "command": event.command_name,
+            "database": database,
+            "collection": command_collection(event),
+            "duration_ms": round(event.duration_micros / 1000, 3),
+            "docs_returned": docs_returned,
+            "shape": query_shape(event.command_name, command),
+            "view": _view_name(request),
+            "plan": "pending" if explain else None,
+        }
+        if error is not None:
+            entry["error"] = error
+        with self._lock:
+            self._entries.append(entry)
+        if explain:
+            # Imported here: this module is loaded by the settings, before the job pool can read its size
+            from ..jobs import submit
+            submit(self._explain, entry, database, command)
+
+    def _explain(self, entry, database, command):
+        try:
+            result = get_connection().get_database(database).command({
+                "explain": {key: value for key, value in command.items() if key not in SESSION_FIELDS and not key.startswith("$")},
+                "verbosity": self.explain_verbosity,
+            })
+            entry["plan"] = summarize_plan(result)
+        except Exception as exc:
+            entry["plan"] = {"error": str(exc)}
+            raise
+
+
+slow_query_log = SlowQueryLog()
+_installed = False
+
+
+def install(options=None):
+    """Configure `slow_query_log` from a SLOW_QUERY_LOG settings dict and register it with pymongo.
+
+    Like `CommandMonitor.install`, it only sees the clients created after
+    it is called. Safe to call more than once.
+    """
+    global _installed
+    options = options or {}
+    slow_query_log.configure(
+        threshold_ms=options.get("THRESHOLD_MS", 100),
+        max_entries=options.get("MAX_ENTRIES", 200),
+        explain_sample_rate=options.get("EXPLAIN_SAMPLE_RATE", 0.0),
+        explain_verbosity=options.get("EXPLAIN_VERBOSITY", "queryPlanner"),
+    )
+    if not _installed:
+        monitoring.register(slow_query_log)
+        _installed = True
+
+
+@contextmanager
+def track_request(request):
+    """Attribute the slow commands sent in this block to `request`'s view."""
+    token = _request.set(request)
+    try:
+        yield
+    finally:
+        _request.reset(token)
+
+
+def query_shape(command_name, command):
+    shape = {field: _shape(command[field]) for field in SHAPE_FIELDS.get(command_name, ()) if field in command}
+    shape.update((field, command[field]) for field in PLAIN_FIELDS if field in command)
+    return shape
+
+
+def _shape(value):
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (dict, list, tuple)) for item in value):
+            return [_shape(item) for item in value]
+        return ["?"]
+    return "?"
+
+
+def summarize_plan(explain):
+    """The winning plan of an explain result and a one-line summary of its stages, e.g. `LIMIT > FETCH > IXSCAN {'category': 1}`."""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # aggregate: the part of the pipeline run by the query layer is under the first stage's $cursor
+        planner = next((stage["$cursor"].get("queryPlanner") for stage in explain.get("stages", ()) if "$cursor" in stage), None)
+    if planner is None:
+        return {"summary": None, "winning_plan": None}
+    winning = planner.get("winningPlan", {})
+    return {"summary": _summarize_stage(winning.get("queryPlan", winning)), "winning_plan": winning}
+
+
+def _summarize_stage(stage):
+    name = stage.get("stage", "?")
+    if "keyPattern" in stage:
+        name = f"{name} {stage['keyPattern']}"
+    if "inputStage" in stage:
+        return f"{name} > {_summarize_stage(stage['inputStage'])}"
+    if "inputStages" in stage:
+        return f"{name} ({', '.join(_summarize_stage(child) for child in stage['inputStages'])})"
+    return name
+
+
+def _docs_returned(reply):
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", ())))
+    return reply.get("n")
+
+
+def _view_name(request):
+    if request is None:
+        return None
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return request.path
+    return match.url_name or match.route
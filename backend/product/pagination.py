@@ -0,0 +1,162 @@
+"""Keyset (cursor) pagination for the product listings.
+
+Pages are ordered by `_id`, or by a whitelisted `sort` field with `_id` as
+the tie-breaker, and the opaque `next` cursor carries the position of the
+last document of the page, so fetching page N is an index seek rather
+than a skip over the N - 1 pages before it.
+
+A position (`after`) is the last `_id` for `_id` order and a
+`(sort value, _id)` pair otherwise.
+"""
+import base64
+import binascii
+
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from rest_framework.settings import api_settings
+
+MAX_LIMIT = 100
+MAX_OFFSET = 1000
+SORT_FIELDS = ("name", "price", "created_at", "updated_at")
+
+
+def parse_sort(value):
+    """Validate a `?sort=` parameter such as `price` or `-created_at`; None means `_id` order."""
+    if not value:
+        return None
+    if value.lstrip("-") not in SORT_FIELDS or value.startswith("--"):
+        raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)}, optionally prefixed with '-'.")
+    return value
+
+
+def sort_field(sort):
+    return sort.lstrip("-") if sort else None
+
+
+def with_sort_field(fields, sort):
+    """Add the sort field to a `fields` projection, since the next cursor is built from it."""
+    field = sort_field(sort)
+    if fields and field and field not in fields:
+        return [*fields, field]
+    return fields
+
+
+def encode_cursor(last_id, sort=None, value=None):
+    payload = {"id": str(last_id)}
+    if sort:
+        payload.update(sort=sort, value=value)
+    # json_util keeps datetimes (and other BSON values) intact through the round trip
+    return base64.urlsafe_b64encode(json_util.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort=None):
+    """Decode a cursor minted for the same `sort` into a position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = ObjectId(payload["id"])
+        if payload.get("sort") != sort:
+            raise ValueError("Cursor sort mismatch.")
+        return (payload["value"], last_id) if sort else last_id
+    except (binascii.Error, ValueError, TypeError, KeyError, InvalidId):
+        raise ValueError("Invalid cursor.")
+
+
+def parse_page_params(params, sort=None):
+    """Read `limit` and `cursor` from request query params into `(after, limit)`."""
+    limit = params.get("limit") or api_settings.PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer.")
+    if limit < 1:
+        raise ValueError("limit must be positive.")
+    cursor = params.get("cursor")
+    after = decode_cursor(cursor, sort) if cursor else None
+    return after, min(limit, MAX_LIMIT)
+
+
+def sort_keys(sort):
+    """The Mongo sort specification for `sort`, `_id` breaking ties in the same direction."""
+    if not sort:
+        return [("_id", 1)]
+    direction = -1 if sort.startswith("-") else 1
+    return [(sort_field(sort), direction), ("_id", direction)]
+
+
+def keyset_query(after, sort=None):
+    """The raw Mongo condition selecting documents past the position `after` in `sort` order."""
+    if not sort:
+        return {"_id": {"$gt": after}}
+    value, last_id = after
+    op = "$lt" if sort.startswith("-") else "$gt"
+    field = sort_field(sort)
+    return {"$or": [{field: {op: value}}, {field: value, "_id": {op: last_id}}]}
+
+
+def keyset_window(queryset, after=None, limit=None, sort=None):
+    """Restrict `queryset` to the page following `after`, in `sort` order (`_id` by default).
+
+    One extra document is fetched so `paginate` can tell whether another
+    page exists. Without a `limit` the queryset is only ordered, or
+    returned unchanged when there is no `sort` either.
+    """
+    if not sort:
+        if limit is None:
+            return queryset
+        if after is not None:
+            queryset = queryset.filter(id__gt=after)
+        return queryset.order_by("id").limit(limit + 1)
+
+    tie_breaker = "-id" if sort.startswith("-") else "id"
+    queryset = queryset.order_by(sort, tie_breaker)
+    if after is not None:
+        queryset = queryset.filter(__raw__=keyset_query(after, sort))
+    return queryset if limit is None else queryset.limit(limit + 1)
+
+
+def paginate(queryset, limit, sort=None):
+    """Evaluate a `keyset_window` of Documents or raw dicts and return `(items, next_cursor)`."""
+    items = list(queryset)
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    if isinstance(last, dict):
+        last_id, value = last["_id"], last.get(sort_field(sort)) if sort else None
+    else:
+        last_id, value = last.id, getattr(last, sort_field(sort)) if sort else None
+    return items, encode_cursor(last_id, sort, value)
+
+
+def encode_offset_cursor(offset):
+    payload = json_util.dumps({"offset": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def parse_offset_params(params):
+    """Read `limit` and an offset `cursor` into `(offset, limit)`, for orders a keyset cannot seek on.
+
+    Used where the sort key is not a stored field (text relevance), so a
+    page costs a skip; `MAX_OFFSET` bounds how deep that skip can get.
+    """
+    _, limit = parse_page_params({"limit": params.get("limit")})
+    cursor = params.get("cursor")
+    if not cursor:
+        return 0, limit
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json_util.loads(base64.urlsafe_b64decode(padded.encode()))["offset"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(offset, int) or not 0 <= offset <= MAX_OFFSET:
+        raise ValueError("Invalid cursor.")
+    return offset, limit
+
+
+def paginate_offset(items, offset, limit):
+    """Split `limit + 1` fetched items into `(items, next_cursor)`; no cursor past `MAX_OFFSET`."""
+    items = list(items)
+    if len(items) <= limit or offset + limit > MAX_OFFSET:
+        return items[:limit], None
+    return items[:limit], encode_offset_cursor(offset + limit)
@@ -0,0 +1,19 @@
+from ..async_db import get_async_collection
+from ..models.CategoryModel import ProductCategory
+from ..cache.CategoryCache import category_cache
+
+
+class AsyncCategoryRepository:
+    """Read side of CategoryRepository on the async driver."""
+
+    @staticmethod
+    async def get_category_by_title(title):
+        async def load():
+            doc = await get_async_collection(ProductCategory).find_one({"title": title})
+            return ProductCategory._from_son(doc) if doc else None
+
+        return await category_cache.aget_by_title(title, load)
+
+    @staticmethod
+    async def get_all():
+        return await get_async_collection(ProductCategory).find().to_list()
@@ -0,0 +1,83 @@
+from bson import ObjectId
+from bson.errors import InvalidId
+from ..async_db import get_async_collection
+from ..models.ProductModel import Product
+from ..models.CategoryModel import ProductCategory
+from ..cache.CategoryCache import category_cache
+from ..filters import filter_query
+from ..pagination import keyset_query, sort_keys, with_sort_field
+from .AsyncCategoryRepository import AsyncCategoryRepository
+
+
+class AsyncProductRepository:
+    """Read side of ProductRepository on the async driver, returning raw documents.
+
+    Lists are returned materialized, one keyset window at a time: at most
+    `limit + 1` documents in `sort` order (`_id` by default), ready for `paginate`.
+    """
+
+    @staticmethod
+    async def get_product_by_id(product_id, fields=None):
+        try:
+            object_id = ObjectId(product_id)
+        except (InvalidId, TypeError):
+            return None
+        return await get_async_collection(Product).find_one(
+            {"_id": object_id}, AsyncProductRepository._projection(fields)
+        )
+
+    @staticmethod
+    async def get_all(after=None, limit=None, fields=None, filters=None, sort=None):
+        query = {}
+        if filters:
+            category_id = None
+            if filters.get("category"):
+                category = await AsyncCategoryRepository.get_category_by_title(filters["category"])
+                if not category:
+                    return []
+                category_id = category.id
+            query = filter_query(filters, category_id)
+        return await AsyncProductRepository._window(query, after, limit, fields, sort)
+
+    @staticmethod
+    async def get_category_map(products):
+        """Async `ProductRepository.get_category_map`, sharing the same category cache."""
+        category_ids = {p.get("category") for p in products if not p.get("category_title")} - {None}
+        if not category_ids:
+            return {}
+
+        async def load_many(missing):
+            cursor = get_async_collection(ProductCategory).find({"_id": {"$in": missing}})
+            return [ProductCategory._from_son(doc) async for doc in cursor]
+
+        categories = await category_cache.aget_many_by_id(category_ids, load_many)
+        return {category_id: category.title for category_id, category in categories.items()}
+
+    @staticmethod
+    async def get_products_by_category(category_title, after=None, limit=None, fields=None):
+        category = await AsyncCategoryRepository.get_category_by_title(category_title)
+        if not category:
+            raise ValueError("Category not found.")
+        return await AsyncProductRepository._window({"category": category.id}, after, limit, fields)
+
+    @staticmethod
+    async def _window(query, after, limit, fields, sort=None):
+        if after is not None:
+            query = {**query, **keyset_query(after, sort)}
+        projection = AsyncProductRepository._projection(with_sort_field(fields, sort))
+        cursor = get_async_collection(Product).find(query, projection)
+        if sort or limit is not None:
+            cursor = cursor.sort(sort_keys(sort))
+        if limit is not None:
+            cursor = cursor.limit(limit + 1)
+        return await cursor.to_list()
+
+    @staticmethod
+    def _projection(fields):
+        """The `.only(*fields)` equivalent: `_id` is always returned."""
+        if not fields:
+            return None
+        projection = {field: 1 for field in fields if field != "id"} or {"_id": 1}
+        if "category" in fields:
+            projection["category_title"] = 1
+        return projection
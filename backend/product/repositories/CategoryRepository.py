@@ -1,22 +1,112 @@
+import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from ..models.CategoryModel import ProductCategory
+from ..models.JobModel import CategoryDeleteJob
 from ..models.ProductModel import Product
+from ..cache.CategoryCache import category_cache
+from ..cache.ResponseCache import response_cache
+from ..conf import get_setting
+from ..db import read_collection, read_objects
 
 class CategoryRepository:
     @staticmethod
     def create(title, description=None):
-        if ProductCategory.objects.filter(title=title).first():
+        if CategoryRepository.get_category_by_title(title):
             raise ValueError("Category with this title already exists.")
         category = ProductCategory(title=title, description=description)
         category.save()
+        response_cache.bump("categories")
         return category
 
     @staticmethod
     def get_category_by_title(title):
-        return ProductCategory.objects.filter(title=title).first()
+        return category_cache.get_by_title(title, lambda: ProductCategory.objects.filter(title=title).first())
 
     @staticmethod
-    def get_all():
-        return ProductCategory.objects.all()
+    def accepting_products(category_ids):
+        """`{id: title}` of the `category_ids` that exist and are not being deleted.
+
+        Read from Mongo rather than the category cache: a delete or rename
+        made in another process does not invalidate this process's cached
+        copy. A product written into the category after the delete's final
+        cascade would be left pointing at a missing category, and one
+        written after the rename's fan-out would keep the old title, so
+        writers snapshot the title returned here.
+        """
+        category_ids = list(category_ids)
+        if not category_ids:
+            return {}
+        return {
+            category["_id"]: category["title"] for category in ProductCategory._get_collection().find(
+                {"_id": {"$in": category_ids}, "deleting": {"$ne": True}}, {"title": 1},
+            )
+        }
+
+    @staticmethod
+    def current_title(category, title):
+        """`title` if the cached `category` still has it in Mongo and accepts products, else None.
+
+        A category renamed by another process is dropped from the cache.
+        """
+        current = CategoryRepository.accepting_products([category.id]).get(category.id)
+        if current is not None and current != title:
+            category_cache.invalidate(category.id, title)
+        return title if current == title else None
+
+    @staticmethod
+    def get_all(raw=False):
+        categories = read_objects(ProductCategory).all()
+        return categories.as_pymongo() if raw else categories
+
+    @staticmethod
+    def category_stats():
+        """Product count, stock, inventory value and price range per category, titles ascending.
+
+        One aggregation groups the products by category and joins the titles
+        in; categories without products are added with zeroed stats from a
+        projected read of the (small) category collection.
+        """
+        pipeline = [
+            {"$group": {
+                "_id": "$category",
+                "product_count": {"$sum": 1},
+                "total_quantity": {"$sum": "$quantity"},
+                "inventory_value": {"$sum": {"$multiply": ["$price", "$quantity"]}},
+                "min_price": {"$min": "$price"},
+                "avg_price": {"$avg": "$price"},
+                "max_price": {"$max": "$price"},
+            }},
+            {"$lookup": {
+                "from": ProductCategory._get_collection_name(),
+                "localField": "_id",
+                "foreignField": "_id",
+                "as": "category",
+            }},
+            # Drops products whose category no longer exists
+            {"$unwind": "$category"},
+            {"$project": {
+                "title": "$category.title",
+                "product_count": 1,
+                "total_quantity": 1,
+                "inventory_value": 1,
+                "min_price": 1,
+                "avg_price": 1,
+                "max_price": 1,
+            }},
+        ]
+        stats = {}
+        for row in read_collection(Product).aggregate(pipeline):
+            row["inventory_value"] = round(row["inventory_value"], 2)
+            row["avg_price"] = round(row["avg_price"], 2)
+            stats[row["_id"]] = row
+        for category in read_objects(ProductCategory).only("title").as_pymongo():
+            if category["_id"] not in stats:
+                stats[category["_id"]] = {
+                    "_id": category["_id"], "title": category["title"], "product_count": 0, "total_quantity": 0,
+                    "inventory_value": 0, "min_price": None, "avg_price": None, "max_price": None,
+                }
+        return sorted(stats.values(), key=lambda row: row["title"])
 
     @staticmethod
     def get_products_by_category(category):
@@ -25,12 +115,18 @@ class CategoryRepository:
     @staticmethod
     def add_product_to_category(product_id, category_title):
         """Assigns a product to a category."""
-        category = ProductCategory.objects.filter(title=category_title).first()
+        category = CategoryRepository.get_category_by_title(category_title)
         product = Product.objects.filter(id=product_id).first()
-        if not category or not product:
+        if not category or not product or not CategoryRepository.current_title(category, category_title):
             raise ValueError("Invalid product or category.")
+        previous = CategoryRepository.category_ref(product)
         product.category = category
+        product.category_title = category_title
         product.save()
+        response_cache.bump("products")
+        if previous != category.id:
+            quantity = int(product.quantity or 0)
+            CategoryRepository.adjust_counters({previous: (-1, -quantity), category.id: (1, quantity)})
         return product
 
     @staticmethod
@@ -39,15 +135,48 @@ class CategoryRepository:
         product = Product.objects.filter(id=product_id).first()
         if not product:
             raise ValueError("Product not found.")
+        previous = CategoryRepository.category_ref(product)
         product.category = None
+        product.category_title = None
         product.save()
+        response_cache.bump("products")
+        CategoryRepository.adjust_counters({previous: (-1, -int(product.quantity or 0))})
         return product
 
+    @staticmethod
+    def adjust_counters(deltas):
+        """Apply `{category_id: (product_delta, quantity_delta)}` to the denormalized counters.
+
+        Each category gets one atomic `$inc`; several go out as a single
+        unordered `bulk_write`.
+        """
+        updates = [
+            ({"_id": category_id}, {"$inc": {"product_count": products, "total_quantity": quantity}})
+            for category_id, (products, quantity) in deltas.items()
+            if category_id is not None and (products or quantity)
+        ]
+        if not updates:
+            return
+        collection = ProductCategory._get_collection()
+        if len(updates) == 1:
+            collection.update_one(*updates[0])
+        else:
+            collection.bulk_write([UpdateOne(*update) for update in updates], ordered=False)
+        response_cache.bump("categories")
+
+    @staticmethod
+    def category_ref(product):
+        """The category id stored on a product Document, read without dereferencing it."""
+        ref = product._data.get("category")
+        return getattr(ref, "id", ref)
+
     @staticmethod
     def update(title, new_title=None, new_description=None):
         category = ProductCategory.objects.filter(title=title).first()
         if not category:
             raise ValueError("Category not found.")
+        if category.deleting:
+            raise ValueError("Category is being deleted.")
         if new_title and ProductCategory.objects.filter(title=new_title).first():
             raise ValueError("Category with this new title already exists.")
         if new_title:
@@ -55,6 +184,11 @@ class CategoryRepository:
         if new_description is not None:
             category.description = new_description
         category.save()
+        if new_title:
+            # One statement re-snapshots the title on every product of the category
+            Product._get_collection().update_many({"category": category.id}, {"$set": {"category_title": new_title}})
+        category_cache.invalidate(category.id, title)
+        response_cache.bump("categories", "products")
         return category
 
     @staticmethod
@@ -63,4 +197,110 @@ class CategoryRepository:
         if not category:
             raise ValueError("Category not found.")
         category.delete()
+        category_cache.invalidate(category.id, title)
+        response_cache.bump("categories", "products")
         return True
+
+    @staticmethod
+    def start_delete(title):
+        """Mark the category as deleting and record a pending CategoryDeleteJob for it.
+
+        The flag is set with one conditional update, so concurrent requests
+        cannot start two deletes of the same category. If the category is
+        already being deleted by a job that has not advanced for
+        CATEGORY_DELETE_JOB_LEASE seconds, its process died mid-way: that
+        job is returned instead, and `run_delete` re-claims it. Run the
+        returned job with `run_delete`.
+        """
+        category = ProductCategory._get_collection().find_one_and_update(
+            {"title": title, "deleting": {"$ne": True}},
+            {"$set": {"deleting": True}},
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if category is None:
+            existing = ProductCategory.objects.filter(title=title).only("id").first()
+            if not existing:
+                raise ValueError("Category not found.")
+            job = CategoryDeleteJob.objects(
+                category=existing.id, status__in=["pending", "running"], updated_at__lt=CategoryRepository._lease_start(),
+            ).order_by("-created_at").first()
+            if job is None:
+                raise ValueError("Category is already being deleted.")
+            return job
+        category_cache.invalidate(category["_id"], title)
+        response_cache.bump("categories")
+        total = Product._get_collection().count_documents({"category": category["_id"]})
+        job = CategoryDeleteJob(category=category["_id"], title=title, total=total)
+        job.save()
+        return job
+
+    @staticmethod
+    def run_delete(job_id, batch_size=1000):
+        """Delete a job's category: its products in `batch_size` batches, then the category.
+
+        Each batch is one indexed read of ids and quantities and one
+        `delete_many` on those ids. The job's `deleted` count and the
+        category counters advance after every batch, so progress can be
+        polled. A failure clears the `deleting` flag so the delete can be
+        started again (`repair_category_counters` fixes any counter drift).
+        Every batch also renews the job's lease: a `running` job whose
+        `updated_at` is older than the lease is taken over.
+        """
+        jobs = CategoryDeleteJob._get_collection()
+        job = jobs.find_one_and_update(
+            {"_id": job_id, "$or": [
+                {"status": "pending"},
+                {"status": "running", "updated_at": {"$lt": CategoryRepository._lease_start()}},
+            ]},
+            {"$set": {"status": "running", "updated_at": datetime.datetime.now()}},
+        )
+        if job is None:  # unknown, finished, or running in a live process
+            return
+        category_id = job["category"]
+        products = Product._get_collection()
+        try:
+            while True:
+                batch = list(products.find({"category": category_id}, {"quantity": 1}).limit(batch_size))
+                if not batch:
+                    break
+                deleted = products.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}}).deleted_count
+                quantity = sum(int(doc.get("quantity") or 0) for doc in batch)
+                CategoryRepository.adjust_counters({category_id: (-deleted, -quantity)})
+                jobs.update_one(
+                    {"_id": job_id},
+                    {"$inc": {"deleted": deleted}, "$set": {"updated_at": datetime.datetime.now()}},
+                )
+                response_cache.bump("products")
+            # The cascade rule still sweeps up any product added since the last batch
+            ProductCategory.objects(id=category_id).delete()
+        except Exception as e:
+            ProductCategory._get_collection().update_one({"_id": category_id}, {"$set": {"deleting": False}})
+            CategoryRepository._finish_delete(job, "failed", str(e))
+            raise
+        CategoryRepository._finish_delete(job, "done")
+
+    @staticmethod
+    def _lease_start():
+        """Delete jobs last updated before this are no longer being run by anyone."""
+        lease = get_setting("CATEGORY_DELETE_JOB_LEASE", 300)
+        return datetime.datetime.now() - datetime.timedelta(seconds=lease)
+
+    @staticmethod
+    def _finish_delete(job, status, error=None):
+        now = datetime.datetime.now()
+        CategoryDeleteJob._get_collection().update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": status, "error": error, "updated_at": now, "finished_at": now}},
+        )
+        category_cache.invalidate(job["category"], job["title"])
+        response_cache.bump("categories", "products")
+
+    @staticmethod
+    def get_delete_job(job_id):
+        if not ObjectId.is_valid(job_id):
+            raise ValueError("Job not found.")
+        job = CategoryDeleteJob.objects.filter(id=job_id).first()
+        if not job:
+            raise ValueError("Job not found.")
+        return job
@@ -1,67 +1,437 @@
+import datetime
+from collections import defaultdict
+from itertools import islice
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine.errors import ValidationError
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from ..models.ProductModel import Product
 from ..models.CategoryModel import ProductCategory
+from .CategoryRepository import CategoryRepository
+from ..pagination import keyset_window, with_sort_field
+from ..filters import filter_query
+from ..db import read_collection, read_objects
+from ..cache.CategoryCache import category_cache
+from ..cache.ResponseCache import response_cache
+
+class InsufficientStockError(ValueError):
+    """Raised when a stock change would take a product's quantity below zero."""
+
 
 class ProductRepository:
+    UPDATABLE_FIELDS = ("name", "description", "price", "brand", "quantity")
+
     @staticmethod
     def create(name, description, category_title, price, brand, quantity=0):
-        category = ProductCategory.objects.filter(title=category_title).first()
-        if not category:
+        category = ProductRepository._category_by_title(category_title)
+        if not category or not CategoryRepository.current_title(category, category_title):
             raise ValueError("Category not found.")
         product = Product(
             name=name,
             description=description,
             category=category,
+            category_title=category_title,
             price=price,
             brand=brand,
             quantity=quantity
         )
         product.save()
+        response_cache.bump("products")
+        CategoryRepository.adjust_counters({category.id: (1, int(product.quantity or 0))})
+        return product
+
+    @staticmethod
+    def bulk_create(rows, batch_size=1000):
+        """Insert `(row_number, row)` pairs with one `insert_many(ordered=False)` per batch.
+
+        Invalid rows are skipped and reported instead of failing the whole
+        import. Category titles are resolved once per batch for titles not
+        seen in earlier batches.
+        """
+        report = {"inserted": 0, "errors": []}
+        category_ids = {}
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                if report["inserted"]:
+                    response_cache.bump("products")
+                return report
+            titles = {row.get("category_title") for _, row in batch} - set(category_ids)
+            category_ids.update(ProductRepository._category_ids(titles))
+
+            docs, row_numbers = [], []
+            for row_number, row in batch:
+                try:
+                    docs.append(ProductRepository._product_from_row(row, category_ids).to_mongo())
+                    row_numbers.append(row_number)
+                except (ValueError, ValidationError) as e:
+                    report["errors"].append({"row": row_number, "error": str(e)})
+            if not docs:
+                continue
+            failed = set()
+            try:
+                result = Product._get_collection().insert_many(docs, ordered=False)
+                report["inserted"] += len(result.inserted_ids)
+            except BulkWriteError as e:
+                report["inserted"] += e.details["nInserted"]
+                for error in e.details["writeErrors"]:
+                    failed.add(error["index"])
+                    report["errors"].append({"row": row_numbers[error["index"]], "error": error["errmsg"]})
+            deltas = defaultdict(lambda: (0, 0))
+            for index, doc in enumerate(docs):
+                if index not in failed:
+                    products, quantity = deltas[doc["category"]]
+                    deltas[doc["category"]] = (products + 1, quantity + doc.get("quantity", 0))
+            CategoryRepository.adjust_counters(deltas)
+
+    @staticmethod
+    def _product_from_row(row, category_ids):
+        category_id = category_ids.get(row.get("category_title"))
+        if not category_id:
+            raise ValueError("Category not found.")
+        try:
+            price = float(row.get("price"))
+            quantity = int(row.get("quantity") or 0)
+        except (TypeError, ValueError):
+            raise ValueError("price must be a number and quantity an integer.")
+        product = Product(
+            name=row.get("name"),
+            description=row.get("description"),
+            category=category_id,
+            category_title=row.get("category_title"),
+            price=price,
+            brand=row.get("brand"),
+            quantity=quantity
+        )
+        product.validate()
         return product
 
     @staticmethod
-    def get_product_by_id(product_id):
-        return Product.objects.filter(id=product_id).first()
+    def bulk_update(items, batch_size=1000):
+        """Apply `{"id", "changes"}` items as one `bulk_write` of `$set` updates per batch."""
+        report = {"matched": 0, "modified": 0, "failures": []}
+        items = iter(items)
+        collection = Product._get_collection()
+        while True:
+            batch = list(islice(items, batch_size))
+            if not batch:
+                if report["modified"]:
+                    response_cache.bump("products")
+                return report
+            category_ids = ProductRepository._category_ids(
+                item["changes"].get("category_title")
+                for item in batch
+                if isinstance(item, dict) and isinstance(item.get("changes"), dict)
+            )
+
+            operations, ids, updates = [], [], []
+            for item in batch:
+                product_id = item.get("id") if isinstance(item, dict) else None
+                try:
+                    if not isinstance(item, dict):
+                        raise ValueError("Each item must be an object with id and changes.")
+                    object_id = ProductRepository._object_id(product_id)
+                    changes = item.get("changes")
+                    if not isinstance(changes, dict) or not changes:
+                        raise ValueError("changes must be a non-empty object.")
+                    update = ProductRepository._build_set(changes, category_ids)
+                except ValueError as e:
+                    report["failures"].append({"id": product_id, "error": str(e)})
+                    continue
+                operations.append(UpdateOne({"_id": object_id}, {"$set": update}))
+                ids.append(object_id)
+                updates.append(update)
+            if not operations:
+                continue
+
+            # Counters need the old category and quantity of the products whose ones change
+            counted = [i for i, update in zip(ids, updates) if "category" in update or "quantity" in update]
+            before = {doc["_id"]: doc for doc in collection.find({"_id": {"$in": counted}}, {"category": 1, "quantity": 1})} if counted else {}
+            failed = set()
+            try:
+                result = collection.bulk_write(operations, ordered=False)
+                matched, modified = result.matched_count, result.modified_count
+            except BulkWriteError as e:
+                matched, modified = e.details["nMatched"], e.details["nModified"]
+                for error in e.details["writeErrors"]:
+                    failed.add(error["index"])
+                    report["failures"].append({"id": str(ids[error["index"]]), "error": error["errmsg"]})
+            deltas = defaultdict(lambda: (0, 0))
+            for index, (object_id, update) in enumerate(zip(ids, updates)):
+                if index not in failed and object_id in before:
+                    ProductRepository._count_change(deltas, before[object_id], update)
+            CategoryRepository.adjust_counters(deltas)
+            report["matched"] += matched
+            report["modified"] += modified
+            if matched < len(ids):
+                found = {doc["_id"] for doc in collection.find({"_id": {"$in": ids}}, {"_id": 1})}
+                report["failures"].extend({"id": str(i), "error": "Product not found."} for i in ids if i not in found)
+
+    @staticmethod
+    def reserve_stock(product_id, quantity):
+        """Take `quantity` units out of stock; returns the new quantity."""
+        return ProductRepository.adjust_stock(product_id, -ProductRepository._positive(quantity))
+
+    @staticmethod
+    def release_stock(product_id, quantity):
+        """Put `quantity` previously reserved units back into stock; returns the new quantity."""
+        return ProductRepository.adjust_stock(product_id, ProductRepository._positive(quantity))
+
+    @staticmethod
+    def adjust_stock(product_id, delta):
+        """Atomically add `delta` to a product's quantity and return the new quantity.
+
+        The change is a single conditional `$inc`, so concurrent callers can
+        never take the quantity below zero or lose each other's updates.
+        """
+        if isinstance(delta, bool) or not isinstance(delta, int):
+            raise ValueError("delta must be an integer.")
+        object_id = ProductRepository._object_id(product_id)
+        query = {"_id": object_id}
+        if delta < 0:
+            query["quantity"] = {"$gte": -delta}
+        collection = Product._get_collection()
+        product = collection.find_one_and_update(
+            query,
+            {"$inc": {"quantity": delta}, "$set": {"updated_at": datetime.datetime.now()}},
+            projection={"quantity": 1, "category": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if product is None:
+            # Only the failure path pays for a second round trip to tell the two cases apart
+            if collection.count_documents({"_id": object_id}, limit=1):
+                raise InsufficientStockError("Insufficient stock.")
+            raise ValueError("Product not found.")
+        response_cache.bump("products")
+        CategoryRepository.adjust_counters({product.get("category"): (0, delta)})
+        return product["quantity"]
+
+    @staticmethod
+    def _count_change(deltas, before, update):
+        """Add the category counter changes of applying `$set: update` to raw document `before`."""
+        old_category, old_quantity = before.get("category"), before.get("quantity") or 0
+        new_category, new_quantity = update.get("category", old_category), update.get("quantity", old_quantity) or 0
+        if new_category == old_category and new_quantity == old_quantity:
+            return
+        products, quantity = deltas[old_category]
+        deltas[old_category] = (products - 1, quantity - old_quantity)
+        products, quantity = deltas[new_category]
+        deltas[new_category] = (products + 1, quantity + new_quantity)
+
+    @staticmethod
+    def _positive(quantity):
+        if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+            raise ValueError("quantity must be a positive integer.")
+        return quantity
+
+    @staticmethod
+    def _object_id(product_id):
+        try:
+            return ObjectId(product_id)
+        except (InvalidId, TypeError):
+            raise ValueError("Invalid product id.")
+
+    @staticmethod
+    def _category_by_title(title):
+        return category_cache.get_by_title(title, lambda: ProductCategory.objects.filter(title=title).first())
+
+    @staticmethod
+    def _category_ids(titles):
+        """Map category titles to ids from the category cache, with one `$in` query for the misses.
+
+        Categories being deleted, and cached titles another process renamed,
+        are left out (checked in Mongo, see `CategoryRepository.accepting_products`),
+        so the titles snapshotted on products are current.
+        """
+        titles = {title for title in titles if isinstance(title, str)}
+        if not titles:
+            return {}
+        categories = category_cache.get_many_by_title(titles, lambda missing: ProductCategory.objects(title__in=missing))
+        current = CategoryRepository.accepting_products(category.id for category in categories.values())
+        category_ids = {}
+        for title, category in categories.items():
+            if current.get(category.id) == title:
+                category_ids[title] = category.id
+            elif category.id in current:  # renamed since it was cached
+                category_cache.invalidate(category.id, title)
+        return category_ids
+
+    @staticmethod
+    def _build_set(changes, category_ids):
+        """Validate `changes` against the Product fields and return a raw `$set` document.
+
+        `category_title` is translated to the category id through
+        `category_ids`; `updated_at` is always refreshed.
+        """
+        update = {}
+        for name, value in changes.items():
+            if name == "category_title":
+                category_id = category_ids.get(value)
+                if not category_id:
+                    raise ValueError("Category not found.")
+                update[Product._fields["category"].db_field] = category_id
+                update[Product._fields["category_title"].db_field] = value
+                continue
+            if name not in ProductRepository.UPDATABLE_FIELDS:
+                raise ValueError(f"Unknown field: {name}.")
+            field = Product._fields[name]
+            value = field.to_python(value)
+            if field.required and value in (None, ""):
+                raise ValueError(f"{name} is required.")
+            if value is not None:
+                try:
+                    field.validate(value)
+                except ValidationError as e:
+                    raise ValueError(f"{name}: {e.message}")
+            update[field.db_field] = field.to_mongo(value) if value is not None else None
+        update[Product._fields["updated_at"].db_field] = datetime.datetime.now()
+        return update
+
+    @staticmethod
+    def get_product_by_id(product_id, fields=None, raw=False):
+        queryset = ProductRepository._read(Product.objects.filter(id=product_id).no_dereference(), fields, raw)
+        return queryset.first()
+
+    @staticmethod
+    def get_all(after=None, limit=None, fields=None, raw=False, filters=None, sort=None):
+        """One keyset page of products matching `filters` (see `product.filters`), in `sort` order."""
+        queryset = ProductRepository._filter(read_objects(Product).all().no_dereference(), filters)
+        queryset = ProductRepository._read(queryset, with_sort_field(fields, sort), raw)
+        return keyset_window(queryset, after, limit, sort)
+
+    @staticmethod
+    def search(text, offset=0, limit=20, fields=None, filters=None):
+        """Raw products matching a `$text` search plus `filters`, best matches first.
+
+        Returns up to `limit + 1` documents starting at `offset`, for
+        `paginate_offset`: relevance is not a stored field a keyset could
+        seek on.
+        """
+        query = ProductRepository._filter_query(filters)
+        if query is None:
+            return []
+        projection = {field: 1 for field in ProductRepository._stored_fields(fields) if field != "id"} if fields else {}
+        projection["score"] = {"$meta": "textScore"}
+        cursor = read_collection(Product).find({"$text": {"$search": text}, **query}, projection)
+        cursor = cursor.sort([("score", {"$meta": "textScore"}), ("_id", 1)]).skip(offset).limit(limit + 1)
+        return list(cursor)
+
+    @staticmethod
+    def _stored_fields(fields):
+        """The stored fields behind the `fields` of a response: `category` renders from its title snapshot."""
+        return [*fields, "category_title"] if "category" in fields and "category_title" not in fields else fields
+
+    @staticmethod
+    def _filter(queryset, filters):
+        query = ProductRepository._filter_query(filters)
+        if query is None:
+            return queryset.none()
+        return queryset.filter(__raw__=query) if query else queryset
+
+    @staticmethod
+    def _filter_query(filters):
+        """The raw query for `filters`, or None when they cannot match (an unknown category)."""
+        if not filters:
+            return {}
+        category_id = None
+        if filters.get("category"):
+            category = ProductRepository._category_by_title(filters["category"])
+            if not category:
+                return None
+            category_id = category.id
+        return filter_query(filters, category_id)
 
     @staticmethod
-    def get_all():
-        return Product.objects.all()
+    def export(fields=None, batch_size=1000):
+        """Iterate every product as a raw document, in `_id` order, `batch_size` per round trip.
+
+        The queryset does not cache what it has yielded, so memory stays at
+        one cursor batch however large the catalog is.
+        """
+        queryset = ProductRepository._read(read_objects(Product).all().no_dereference(), fields, raw=True)
+        return queryset.order_by("id").batch_size(batch_size).no_cache()
+
+    @staticmethod
+    def get_category_map(products):
+        """Fetch `{category_id: title}` for the categories referenced by `products`.
+
+        Only products without a `category_title` snapshot need one, so once
+        titles are backfilled this is free. Categories come from the category
+        cache, with at most one `$in` query for the misses. Works on raw
+        documents and on Documents loaded with `no_dereference()`, where
+        `product.category` yields the stored reference instead of a query.
+        """
+        category_ids = {
+            p.get("category") if isinstance(p, dict) else getattr(p.category, "id", None)
+            for p in products
+            if not isinstance(p.get("category_title") if isinstance(p, dict) else p.category_title, str)
+        } - {None}
+        if not category_ids:
+            return {}
+        categories = category_cache.get_many_by_id(category_ids, lambda missing: ProductCategory.objects(id__in=missing))
+        return {category_id: category.title for category_id, category in categories.items()}
 
     @staticmethod
-    def get_products_by_category(category_title):
-        category = ProductCategory.objects.filter(title=category_title).first()
+    def get_products_by_category(category_title, after=None, limit=None, fields=None, raw=False):
+        category = ProductRepository._category_by_title(category_title)
         if not category:
             raise ValueError("Category not found.")
-        return Product.objects.filter(category=category)
+        queryset = ProductRepository._read(read_objects(Product).filter(category=category), fields, raw)
+        return keyset_window(queryset, after, limit)
+
+    @staticmethod
+    def _read(queryset, fields=None, raw=False):
+        """Apply a `fields` projection and, for the read-only fast path, skip Document hydration."""
+        if fields:
+            queryset = queryset.only(*ProductRepository._stored_fields(fields))
+        if raw:
+            queryset = queryset.as_pymongo()
+        return queryset
 
     @staticmethod
     def update(product_id, name=None, description=None, category_title=None, price=None, brand=None, quantity=None):
-        product = Product.objects.filter(id=product_id).first()
-        if not product:
-            raise ValueError("Product not found.")
+        """Apply the given changes with one `find_one_and_update` and return the updated product.
 
-        if name:
-            product.name = name
-        if description:
-            product.description = description
-        if category_title:
-            category = ProductCategory.objects.filter(title=category_title).first()
-            if not category:
-                raise ValueError("Category not found.")
-            product.category = category
+        Only the changed fields and `updated_at` are sent, as a single `$set`.
+        """
+        changes = {key: value for key, value in (("name", name), ("description", description), ("brand", brand)) if value}
         if price is not None:
-            product.price = price
-        if brand:
-            product.brand = brand
+            changes["price"] = price
         if quantity is not None:
-            product.quantity = quantity
-        
-        product.save()
-        return product
+            changes["quantity"] = quantity
+        if category_title:
+            changes["category_title"] = category_title
+        update = ProductRepository._build_set(changes, ProductRepository._category_ids([category_title]))
+
+        try:
+            object_id = ProductRepository._object_id(product_id)
+        except ValueError:
+            raise ValueError("Product not found.")
+        # The pre-image tells the category counters what changed; the update is a plain $set
+        before = Product._get_collection().find_one_and_update(
+            {"_id": object_id}, {"$set": update}, return_document=ReturnDocument.BEFORE
+        )
+        if before is None:
+            raise ValueError("Product not found.")
+        response_cache.bump("products")
+        deltas = defaultdict(lambda: (0, 0))
+        ProductRepository._count_change(deltas, before, update)
+        CategoryRepository.adjust_counters(deltas)
+        return Product._from_son({**before, **update})
 
     @staticmethod
     def delete(product_id):
-        product = Product.objects.filter(id=product_id).first()
-        if not product:
+        """Delete a product with one `find_one_and_delete` and take it off its category's counters.
+
+        Of two concurrent deletes of the same product only one gets the
+        document back, so the counters are decremented once.
+        """
+        object_id = ProductRepository._object_id(product_id)
+        product = Product._get_collection().find_one_and_delete({"_id": object_id}, projection={"category": 1, "quantity": 1})
+        if product is None:
             raise ValueError("Product not found.")
-        product.delete()
+        response_cache.bump("products")
+        CategoryRepository.adjust_counters({product.get("category"): (-1, -int(product.get("quantity") or 0))})
         return True
@@ -2,7 +2,103 @@
 from rest_framework import serializers
 from .models.ProductModel import Product
 from .models.CategoryModel import ProductCategory
-from bson import ObjectId
+from .services.ProductService import ProductService
+from bson import ObjectId, DBRef
+import datetime
+
+
+PRODUCT_FIELDS = ("id", "name", "description", "brand", "category", "price", "quantity", "created_at", "updated_at")
+
+
+def parse_fields(value, default):
+    """Parse a `?fields=` parameter into a list of product fields, or return `default`."""
+    if not value:
+        return list(default)
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in PRODUCT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}.")
+    return list(dict.fromkeys(fields))
+
+
+def to_json_value(value):
+    """Convert a BSON value from a raw (`as_pymongo`) document into a JSON-friendly one."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, DBRef):
+        return str(value.id)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def category_ref_id(product):
+    """Return the stored category id of a Document or raw product without dereferencing it."""
+    if isinstance(product, dict):
+        return product.get("category")
+    ref = product.category
+    return ref.id if ref is not None else None
+
+
+def category_title(product, category_map):
+    """The product's snapshotted category title, else its entry in a prefetched `{id: title}` map."""
+    title = product.get("category_title") if isinstance(product, dict) else getattr(product, "category_title", None)
+    if isinstance(title, str):
+        return title
+    return category_map.get(category_ref_id(product))
+
+
+def product_to_dict(product, fields, category_map=None):
+    """Render the requested `fields` of a product loaded with a matching projection."""
+    data = {}
+    for field in fields:
+        if field == "id":
+            data["id"] = str(product.id)
+        elif field == "category":
+            data["category"] = category_title(product, category_map or {})
+        else:
+            data[field] = getattr(product, field)
+    return data
+
+
+def raw_product_to_dict(doc, fields, category_map=None):
+    """Render a raw product document straight to the response shape, without hydration."""
+    data = {}
+    for field in fields:
+        if field == "id":
+            data["id"] = str(doc["_id"])
+        elif field == "category":
+            data["category"] = category_title(doc, category_map or {})
+        else:
+            data[field] = to_json_value(doc.get(field))
+    return data
+
+
+def raw_category_to_dict(doc):
+    return {
+        "id": str(doc["_id"]),
+        "title": doc.get("title"),
+        "description": doc.get("description"),
+        "product_count": doc.get("product_count", 0),
+        "total_quantity": doc.get("total_quantity", 0),
+        "deleting": doc.get("deleting", False),
+    }
+
+
+def delete_job_to_dict(job):
+    return {
+        "id": str(job.id),
+        "category": job.title,
+        "status": job.status,
+        "total": job.total,
+        "deleted": job.deleted,
+        # Products added while the job runs can take `deleted` past `total`
+        "progress": min(1.0, round(job.deleted / job.total, 4)) if job.total else float(job.status == "done"),
+        "error": job.error,
+        "created_at": to_json_value(job.created_at),
+        "finished_at": to_json_value(job.finished_at),
+    }
+
 
 class ProductCategorySerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
@@ -81,13 +177,19 @@ class ProductSerializer(serializers.Serializer):
         return instance
 
     def to_representation(self, instance):
+        # Pass {"category_map": ProductService.get_category_map(products)} in the
+        # serializer context to resolve every category with one query.
+        category_map = self.context.get("category_map")
+        if category_map is None:
+            category_map = ProductService.get_category_map([instance])
+        title = category_title(instance, category_map)
 
         data = {
             "id": str(instance.id),
             "name": instance.name,
             "description": instance.description,
             "brand": instance.brand,
-            "category": [cat.title for cat in instance.category if cat] if instance.category else [],
+            "category": [title] if title else [],
             "price": float(instance.price),
             "quantity": int(instance.quantity),
         }
@@ -0,0 +1,10 @@
+from ..repositories.AsyncCategoryRepository import AsyncCategoryRepository
+
+class AsyncProductCategoryService:
+    @staticmethod
+    async def get_category(title):
+        return await AsyncCategoryRepository.get_category_by_title(title)
+
+    @staticmethod
+    async def list_categories():
+        return await AsyncCategoryRepository.get_all()
@@ -0,0 +1,18 @@
+from ..repositories.AsyncProductRepository import AsyncProductRepository
+
+class AsyncProductService:
+    @staticmethod
+    async def get_product(product_id, fields=None):
+        return await AsyncProductRepository.get_product_by_id(product_id, fields)
+
+    @staticmethod
+    async def list_products(after=None, limit=None, fields=None, filters=None, sort=None):
+        return await AsyncProductRepository.get_all(after, limit, fields, filters, sort)
+
+    @staticmethod
+    async def get_category_map(products):
+        return await AsyncProductRepository.get_category_map(products)
+
+    @staticmethod
+    async def get_products_by_category(category_title, after=None, limit=None, fields=None):
+        return await AsyncProductRepository.get_products_by_category(category_title, after, limit, fields)
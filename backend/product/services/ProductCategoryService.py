@@ -1,3 +1,5 @@
+from .. import jobs
+from ..conf import get_setting
 from ..repositories.CategoryRepository import CategoryRepository
 
 class ProductCategoryService:
@@ -10,8 +12,12 @@ class ProductCategoryService:
         return CategoryRepository.get_category_by_title(title)
 
     @staticmethod
-    def list_categories():
-        return CategoryRepository.get_all()
+    def list_categories(raw=False):
+        return CategoryRepository.get_all(raw)
+
+    @staticmethod
+    def get_category_stats():
+        return CategoryRepository.category_stats()
 
     @staticmethod
     def get_products_by_category(title):
@@ -35,3 +41,14 @@ class ProductCategoryService:
     @staticmethod
     def delete_category(title):
         return CategoryRepository.delete(title)
+
+    @staticmethod
+    def delete_category_in_background(title):
+        """Start deleting a category and its products on the job pool; returns the job to poll."""
+        job = CategoryRepository.start_delete(title)
+        jobs.submit(CategoryRepository.run_delete, job.id, get_setting("CATEGORY_DELETE_BATCH_SIZE", 1000))
+        return job
+
+    @staticmethod
+    def get_delete_job(job_id):
+        return CategoryRepository.get_delete_job(job_id)
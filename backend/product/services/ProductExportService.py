@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from ..serializers import raw_product_to_dict
+from .ProductService import ProductService
+
+
+class ProductExportService:
+    @staticmethod
+    def export_products(fields, fmt="ndjson", batch_size=1000):
+        """Yield the whole catalog as NDJSON or CSV text, one chunk per cursor batch.
+
+        Category titles are resolved per batch through the category cache,
+        so neither the products nor a dereferenced copy of them pile up.
+        """
+        # A generator, not iter(): a no-cache queryset rewinds itself every time it is iterated afresh
+        products = (product for product in ProductService.export_products(fields, batch_size))
+        if fmt == "csv":
+            yield ProductExportService._csv_chunk([], fields, header=True)
+        while True:
+            batch = list(islice(products, batch_size))
+            if not batch:
+                return
+            categories = ProductService.get_category_map(batch) if "category" in fields else {}
+            rows = [raw_product_to_dict(p, fields, categories) for p in batch]
+            if fmt == "csv":
+                yield ProductExportService._csv_chunk(rows, fields)
+            else:
+                yield "".join(json.dumps(row) + "\n" for row in rows)
+
+    @staticmethod
+    def _csv_chunk(rows, fields, header=False):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
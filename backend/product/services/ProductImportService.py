@@ -0,0 +1,48 @@
+import csv
+import json
+
+from ..repositories.ProductRepository import ProductRepository
+
+
+class ProductImportService:
+    @staticmethod
+    def import_products(lines, fmt="ndjson", batch_size=1000):
+        """Stream NDJSON or CSV `lines` (bytes) into the product collection.
+
+        Rows are parsed lazily, so the upload is never held in memory.
+        Rows that fail to parse are reported next to the ones the
+        repository rejects.
+        """
+        parse_errors = []
+        if fmt == "csv":
+            rows = ProductImportService._parse_csv(lines, parse_errors)
+        else:
+            rows = ProductImportService._parse_ndjson(lines, parse_errors)
+        report = ProductRepository.bulk_create(rows, batch_size)
+        report["errors"] = sorted(parse_errors + report["errors"], key=lambda e: e["row"])
+        return report
+
+    @staticmethod
+    def _parse_ndjson(lines, errors):
+        for row_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                errors.append({"row": row_number, "error": "Invalid JSON."})
+                continue
+            if not isinstance(row, dict):
+                errors.append({"row": row_number, "error": "Each line must be a JSON object."})
+                continue
+            yield row_number, row
+
+    @staticmethod
+    def _parse_csv(lines, errors):
+        try:
+            reader = csv.DictReader(line.decode("utf-8") for line in lines)
+            # Row 1 is the header, so data rows are numbered from 2 like in a spreadsheet
+            for row_number, row in enumerate(reader, start=2):
+                yield row_number, row
+        except (UnicodeDecodeError, csv.Error) as e:
+            errors.append({"row": reader.line_num, "error": f"Unreadable CSV: {e}"})
@@ -6,21 +6,49 @@ class ProductService:
         return ProductRepository.create(name, description, category_title, price, brand, quantity)
 
     @staticmethod
-    def get_product(product_id):
-        return ProductRepository.get_product_by_id(product_id)
+    def get_product(product_id, fields=None, raw=False):
+        return ProductRepository.get_product_by_id(product_id, fields, raw)
 
     @staticmethod
-    def list_products():
-        return ProductRepository.get_all()
+    def list_products(after=None, limit=None, fields=None, raw=False, filters=None, sort=None):
+        return ProductRepository.get_all(after, limit, fields, raw, filters, sort)
 
     @staticmethod
-    def get_products_by_category(category_title):
-        return ProductRepository.get_products_by_category(category_title)
+    def search_products(text, offset=0, limit=20, fields=None, filters=None):
+        return ProductRepository.search(text, offset, limit, fields, filters)
+
+    @staticmethod
+    def export_products(fields=None, batch_size=1000):
+        return ProductRepository.export(fields, batch_size)
+
+    @staticmethod
+    def get_category_map(products):
+        return ProductRepository.get_category_map(products)
+
+    @staticmethod
+    def get_products_by_category(category_title, after=None, limit=None, fields=None, raw=False):
+        return ProductRepository.get_products_by_category(category_title, after, limit, fields, raw)
 
     @staticmethod
     def update_product(product_id, **kwargs):
         return ProductRepository.update(product_id, **kwargs)
 
+    @staticmethod
+    def bulk_update_products(items, batch_size=1000):
+        return ProductRepository.bulk_update(items, batch_size)
+
+    @staticmethod
+    def reserve_stock(product_id, quantity):
+        return ProductRepository.reserve_stock(product_id, quantity)
+
+    @staticmethod
+    def release_stock(product_id, quantity):
+        return ProductRepository.release_stock(product_id, quantity)
+
+    @staticmethod
+    def adjust_stock(product_id, delta):
+        return ProductRepository.adjust_stock(product_id, delta)
+
     @staticmethod
     def delete_product(product_id):
         return ProductRepository.delete(product_id)
@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+
+from product.monitoring.CommandMonitor import install, track_commands
+
+# Clients connected by the tests from here on report their commands
+install()
+
+
+class DbCommandAssertionsMixin:
+    """unittest assertions on the Mongo commands a block of code sends."""
+
+    @contextmanager
+    def assertMaxDbCommands(self, n):
+        """Fail if the block sends more than `n` commands; yields their CommandStats.
+
+            with self.assertMaxDbCommands(2) as commands:
+                client.get("/products/")
+        """
+        with track_commands() as stats:
+            yield stats
+        if stats.count > n:
+            self.fail(f"{stats.count} database commands sent, expected at most {n}: {dict(stats.by_name)}")
@@ -0,0 +1,8 @@
+from product.cache.CategoryCache import category_cache
+
+
+def accept_cached_categories(category_ids):
+    """Stand-in for `CategoryRepository.accepting_products` in tests without Mongo:
+    every category is accepted under the title it was cached with."""
+    cached = category_cache.get_many_by_id(category_ids, lambda missing: [])
+    return {category_id: category.title for category_id, category in cached.items()}
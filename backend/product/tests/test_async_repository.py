@@ -0,0 +1,104 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from product import async_db
+from product.cache.CategoryCache import category_cache
+from product.repositories.AsyncProductRepository import AsyncProductRepository
+from product.repositories.AsyncCategoryRepository import AsyncCategoryRepository
+
+
+def make_cursor(docs):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=docs)
+    cursor.__aiter__.return_value = iter(docs)
+    return cursor
+
+
+class TestAsyncProductRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch("product.repositories.AsyncProductRepository.get_async_collection")
+        self.mock_collection = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    async def test_get_product_by_id_projects_fields(self):
+        product_id = ObjectId()
+        self.mock_collection.find_one = AsyncMock(return_value={"_id": product_id, "name": "Laptop"})
+
+        product = await AsyncProductRepository.get_product_by_id(str(product_id), ["id", "name"])
+
+        self.assertEqual(product["name"], "Laptop")
+        self.mock_collection.find_one.assert_awaited_once_with({"_id": product_id}, {"name": 1})
+
+    async def test_get_product_by_invalid_id_skips_query(self):
+        self.mock_collection.find_one = AsyncMock()
+        self.assertIsNone(await AsyncProductRepository.get_product_by_id("not-an-id"))
+        self.mock_collection.find_one.assert_not_awaited()
+
+    async def test_get_all_reads_one_keyset_window(self):
+        after = ObjectId()
+        cursor = make_cursor([{"_id": ObjectId()}])
+        self.mock_collection.find.return_value = cursor
+
+        await AsyncProductRepository.get_all(after=after, limit=10, fields=["id", "price"])
+
+        self.mock_collection.find.assert_called_once_with({"_id": {"$gt": after}}, {"price": 1})
+        cursor.sort.assert_called_once_with([("_id", 1)])
+        cursor.limit.assert_called_once_with(11)
+
+    @patch("product.repositories.AsyncProductRepository.AsyncCategoryRepository.get_category_by_title", new_callable=AsyncMock)
+    async def test_get_products_by_unknown_category(self, mock_get_category):
+        mock_get_category.return_value = None
+        with self.assertRaises(ValueError):
+            await AsyncProductRepository.get_products_by_category("Unknown")
+        self.mock_collection.find.assert_not_called()
+
+    async def test_get_category_map_loads_misses_once(self):
+        category_id = ObjectId()
+        self.mock_collection.find.return_value = make_cursor([{"_id": category_id, "title": "Electronics"}])
+        products = [{"category": category_id}, {"category": category_id}]
+
+        self.assertEqual(await AsyncProductRepository.get_category_map(products), {category_id: "Electronics"})
+        self.assertEqual(await AsyncProductRepository.get_category_map(products), {category_id: "Electronics"})
+
+        self.mock_collection.find.assert_called_once_with({"_id": {"$in": [category_id]}})
+
+
+class TestAsyncCategoryRepository(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        category_cache.clear()
+
+    @patch("product.repositories.AsyncCategoryRepository.get_async_collection")
+    async def test_get_category_by_title_is_cached(self, mock_get_collection):
+        collection = mock_get_collection.return_value
+        collection.find_one = AsyncMock(return_value={"_id": ObjectId(), "title": "Electronics"})
+
+        first = await AsyncCategoryRepository.get_category_by_title("Electronics")
+        second = await AsyncCategoryRepository.get_category_by_title("Electronics")
+
+        self.assertEqual(first.title, "Electronics")
+        self.assertIs(first, second)
+        collection.find_one.assert_awaited_once_with({"title": "Electronics"})
+
+
+class TestAsyncClients(unittest.TestCase):
+    @patch("product.async_db.AsyncMongoClient")
+    def test_one_client_per_loop_closed_with_the_loop(self, mock_client_class):
+        mock_client_class.return_value.close = AsyncMock()
+
+        async def request():
+            self.assertIs(async_db.get_async_db(), async_db.get_async_db())
+
+        for _ in range(3):
+            asyncio.run(request())
+
+        self.assertEqual(mock_client_class.call_count, 3)
+        self.assertEqual(mock_client_class.return_value.close.await_count, 3)
+        self.assertEqual(len(async_db._clients), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
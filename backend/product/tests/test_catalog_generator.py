@@ -0,0 +1,48 @@
+import unittest
+from collections import Counter
+from product.fixtures.catalog import BLOCK_SIZE, make_categories, make_products
+
+
+class TestCatalogGenerator(unittest.TestCase):
+    def setUp(self):
+        self.categories = make_categories(5, seed=7)
+
+    def test_same_seed_same_catalog(self):
+        first, _ = make_products(7, 1, BLOCK_SIZE + 50, self.categories)
+        second, _ = make_products(7, 1, BLOCK_SIZE + 50, make_categories(5, seed=7))
+        other, _ = make_products(8, 1, BLOCK_SIZE + 50, self.categories)
+
+        self.assertEqual(len(first), 50)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_ids_are_unique_across_blocks(self):
+        ids = set()
+        for block in range(2):
+            documents, _ = make_products(7, block, BLOCK_SIZE + 50, self.categories)
+            ids.update(document["_id"] for document in documents)
+        self.assertEqual(len(ids), BLOCK_SIZE + 50)
+
+    def test_counters_match_the_documents(self):
+        documents, counters = make_products(7, 0, 2000, self.categories)
+
+        for category, (count, quantity) in zip(self.categories, counters):
+            products = [document for document in documents if document["category"] == category["_id"]]
+            self.assertEqual(count, len(products))
+            self.assertEqual(quantity, sum(document["quantity"] for document in products))
+            self.assertTrue(all(document["category_title"] == category["title"] for document in products))
+
+    def test_categories_are_skewed(self):
+        documents, _ = make_products(7, 0, 5000, self.categories, skew=1.0)
+        sizes = Counter(document["category_title"] for document in documents).most_common()
+
+        self.assertEqual(sizes[0][0], self.categories[0]["title"])
+        self.assertGreater(sizes[0][1], 3 * sizes[-1][1])
+
+    def test_titles_stay_unique_past_the_vocabulary(self):
+        titles = [category["title"] for category in make_categories(450, seed=1)]
+        self.assertEqual(len(set(titles)), 450)
+
+
+if __name__ == "__main__":
+    unittest.main()
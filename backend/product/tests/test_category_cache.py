@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from mongoengine import signals
+from product.cache.CategoryCache import CategoryCache, category_cache
+from product.models.CategoryModel import ProductCategory
+from product.repositories.CategoryRepository import CategoryRepository
+
+
+def make_category(category_id, title):
+    return MagicMock(id=category_id, title=title, deleting=False)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCategoryCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = CategoryCache(max_size=2, ttl=10, clock=self.clock)
+        self.electronics = make_category("c1", "Electronics")
+
+    def test_get_by_title_loads_once(self):
+        load = MagicMock(return_value=self.electronics)
+
+        self.assertEqual(self.cache.get_by_title("Electronics", load), self.electronics)
+        self.assertEqual(self.cache.get_by_title("Electronics", load), self.electronics)
+
+        load.assert_called_once()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_misses_are_not_cached(self):
+        load = MagicMock(return_value=None)
+        self.assertIsNone(self.cache.get_by_title("Unknown", load))
+        self.assertIsNone(self.cache.get_by_title("Unknown", load))
+        self.assertEqual(load.call_count, 2)
+
+    def test_entries_expire_after_ttl(self):
+        load = MagicMock(return_value=self.electronics)
+        self.cache.get_by_title("Electronics", load)
+        self.clock.now = 11
+        self.cache.get_by_title("Electronics", load)
+        self.assertEqual(load.call_count, 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        kitchen, garden = make_category("c2", "Kitchen"), make_category("c3", "Garden")
+        for category in (self.electronics, kitchen):
+            self.cache.put(category)
+        self.cache.get_many_by_id(["c1"], MagicMock())
+        self.cache.put(garden)
+
+        load_many = MagicMock(return_value=[kitchen])
+        result = self.cache.get_many_by_id(["c1", "c2", "c3"], load_many)
+
+        load_many.assert_called_once_with(["c2"])
+        self.assertEqual(result, {"c1": self.electronics, "c2": kitchen, "c3": garden})
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+    def test_get_many_by_title_loads_only_misses(self):
+        kitchen = make_category("c2", "Kitchen")
+        self.cache.put(self.electronics)
+        load_many = MagicMock(return_value=[kitchen])
+
+        result = self.cache.get_many_by_title(["Electronics", "Kitchen", "Unknown"], load_many)
+
+        load_many.assert_called_once_with(["Kitchen", "Unknown"])
+        self.assertEqual(result, {"Electronics": self.electronics, "Kitchen": kitchen})
+
+    def test_invalidate_by_id_and_title(self):
+        self.cache.put(self.electronics)
+        self.cache.invalidate(title="Electronics")
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+        self.cache.put(self.electronics)
+        self.cache.invalidate("c1")
+        load = MagicMock(return_value=None)
+        self.assertIsNone(self.cache.get_by_title("Electronics", load))
+        load.assert_called_once()
+
+
+class TestCategoryRepositoryInvalidation(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+
+    @patch("product.models.CategoryModel.ProductCategory.objects")
+    def test_update_and_delete_invalidate_cache(self, mock_category_objects):
+        category = make_category("c1", "Electronics")
+        mock_category_objects.filter.return_value.first.return_value = category
+        misses = category_cache.misses
+        CategoryRepository.get_category_by_title("Electronics")
+        CategoryRepository.update("Electronics", new_description="Gadgets")
+        CategoryRepository.get_category_by_title("Electronics")
+        self.assertEqual(category_cache.misses - misses, 2)
+
+        CategoryRepository.delete("Electronics")
+        self.assertEqual(category_cache.stats()["size"], 0)
+
+
+class TestCategorySignals(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        self.category = make_category("c1", "Electronics")
+        category_cache.put(self.category)
+
+    def test_save_invalidates(self):
+        signals.post_save.send(ProductCategory, document=self.category, created=False)
+        self.assertEqual(category_cache.stats()["size"], 0)
+
+    def test_delete_invalidates(self):
+        signals.post_delete.send(ProductCategory, document=self.category)
+        self.assertEqual(category_cache.stats()["size"], 0)
+
+    def test_other_documents_are_ignored(self):
+        signals.post_save.send(object, document=self.category, created=False)
+        self.assertEqual(category_cache.stats()["size"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from product.cache.CategoryCache import category_cache
+from product.repositories.CategoryRepository import CategoryRepository
+from product.tests.fakes import accept_cached_categories
+from product.repositories.ProductRepository import ProductRepository
+
+
+class TestAdjustCounters(unittest.TestCase):
+    @patch("product.repositories.CategoryRepository.ProductCategory._get_collection")
+    def test_single_category_is_one_update(self, mock_get_collection):
+        category_id = ObjectId()
+        CategoryRepository.adjust_counters({category_id: (1, 5), None: (1, 1), ObjectId(): (0, 0)})
+
+        mock_get_collection.return_value.update_one.assert_called_once_with(
+            {"_id": category_id}, {"$inc": {"product_count": 1, "total_quantity": 5}}
+        )
+        mock_get_collection.return_value.bulk_write.assert_not_called()
+
+    @patch("product.repositories.CategoryRepository.ProductCategory._get_collection")
+    def test_many_categories_are_one_bulk_write(self, mock_get_collection):
+        CategoryRepository.adjust_counters({ObjectId(): (-1, -5), ObjectId(): (1, 5)})
+
+        operations = mock_get_collection.return_value.bulk_write.call_args.args[0]
+        self.assertEqual(len(operations), 2)
+        self.assertEqual(operations[0]._doc, {"$inc": {"product_count": -1, "total_quantity": -5}})
+
+    @patch("product.repositories.CategoryRepository.ProductCategory._get_collection")
+    def test_nothing_to_apply(self, mock_get_collection):
+        CategoryRepository.adjust_counters({})
+        mock_get_collection.assert_not_called()
+
+
+class TestCounterMaintenance(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "accepting_products", side_effect=accept_cached_categories)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("product.repositories.ProductRepository.Product._get_collection")
+        self.mock_collection = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = patch("product.repositories.ProductRepository.ProductCategory")
+        self.mock_category_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.old_category, self.new_category = ObjectId(), ObjectId()
+        self.mock_category_model.objects.return_value = [MagicMock(id=self.new_category, title="Kitchen", deleting=False)]
+
+    def test_update_moving_category(self):
+        product_id = ObjectId()
+        self.mock_collection.find_one_and_update.return_value = {
+            "_id": product_id, "name": "Mixer", "category": self.old_category, "quantity": 4,
+        }
+
+        product = ProductRepository.update(str(product_id), category_title="Kitchen", quantity=6)
+
+        self.assertEqual(product.quantity, 6)
+        self.mock_adjust_counters.assert_called_once_with({self.old_category: (-1, -4), self.new_category: (1, 6)})
+
+    def test_update_without_counted_change(self):
+        product_id = ObjectId()
+        self.mock_collection.find_one_and_update.return_value = {"_id": product_id, "category": self.old_category, "quantity": 4}
+
+        ProductRepository.update(str(product_id), name="Mixer")
+
+        self.mock_adjust_counters.assert_called_once_with({})
+
+    def test_bulk_update_counts_from_pre_image(self):
+        moved, restocked, renamed = ObjectId(), ObjectId(), ObjectId()
+        self.mock_collection.find.return_value = [
+            {"_id": moved, "category": self.old_category, "quantity": 2},
+            {"_id": restocked, "category": self.old_category, "quantity": 1},
+        ]
+        self.mock_collection.bulk_write.return_value = MagicMock(matched_count=3, modified_count=3)
+
+        ProductRepository.bulk_update([
+            {"id": str(moved), "changes": {"category_title": "Kitchen"}},
+            {"id": str(restocked), "changes": {"quantity": 10}},
+            {"id": str(renamed), "changes": {"name": "Whisk"}},
+        ])
+
+        self.mock_collection.find.assert_called_once_with({"_id": {"$in": [moved, restocked]}}, {"category": 1, "quantity": 1})
+        self.mock_adjust_counters.assert_called_once_with({self.old_category: (-1, 7), self.new_category: (1, 2)})
+
+    def test_bulk_create_counts_only_inserted_rows(self):
+        self.mock_category_model.objects.return_value = [MagicMock(id=self.new_category, title="Kitchen", deleting=False)]
+        self.mock_collection.insert_many.side_effect = BulkWriteError({
+            "nInserted": 1, "writeErrors": [{"index": 1, "errmsg": "duplicate key"}],
+        })
+        rows = [(1, {"name": "A", "category_title": "Kitchen", "price": 1, "brand": "B", "quantity": 3}),
+                (2, {"name": "B", "category_title": "Kitchen", "price": 1, "brand": "B", "quantity": 5})]
+
+        ProductRepository.bulk_create(rows)
+
+        self.mock_adjust_counters.assert_called_once_with({self.new_category: (1, 3)})
+
+    def test_adjust_stock_moves_total_quantity(self):
+        product_id = ObjectId()
+        self.mock_collection.find_one_and_update.return_value = {"_id": product_id, "quantity": 7, "category": self.old_category}
+
+        ProductRepository.adjust_stock(str(product_id), -3)
+
+        self.mock_adjust_counters.assert_called_once_with({self.old_category: (0, -3)})
+
+    def test_delete_decrements(self):
+        self.mock_collection.find_one_and_delete.return_value = {"_id": ObjectId(), "category": self.old_category, "quantity": 4}
+
+        ProductRepository.delete(str(ObjectId()))
+
+        self.mock_adjust_counters.assert_called_once_with({self.old_category: (-1, -4)})
+
+    @patch("product.models.ProductModel.Product.objects")
+    @patch("product.models.CategoryModel.ProductCategory.objects")
+    def test_add_product_to_category_moves_counts(self, mock_category_objects, mock_product_objects):
+        mock_category_objects.filter.return_value.first.return_value = MagicMock(id=self.new_category, title="Kitchen", deleting=False)
+        product = MagicMock(quantity=2, _data={"category": self.old_category})
+        mock_product_objects.filter.return_value.first.return_value = product
+
+        CategoryRepository.add_product_to_category("123", "Kitchen")
+
+        self.mock_adjust_counters.assert_called_once_with({self.old_category: (-1, -2), self.new_category: (1, 2)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import datetime
+import unittest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from product.cache.CategoryCache import category_cache
+from product.repositories.CategoryRepository import CategoryRepository
+from product.repositories.ProductRepository import ProductRepository
+from product.serializers import delete_job_to_dict
+
+
+class TestStartDelete(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("product.repositories.CategoryRepository.ProductCategory")
+        self.mock_category_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.categories = self.mock_category_model._get_collection.return_value
+
+    @patch("product.repositories.CategoryRepository.CategoryDeleteJob")
+    @patch("product.repositories.CategoryRepository.Product._get_collection")
+    def test_marks_category_and_records_job(self, mock_get_collection, mock_job_class):
+        category_id = ObjectId()
+        self.categories.find_one_and_update.return_value = {"_id": category_id}
+        mock_get_collection.return_value.count_documents.return_value = 120000
+
+        job = CategoryRepository.start_delete("Electronics")
+
+        args = self.categories.find_one_and_update.call_args.args
+        self.assertEqual(args, ({"title": "Electronics", "deleting": {"$ne": True}}, {"$set": {"deleting": True}}))
+        mock_job_class.assert_called_once_with(category=category_id, title="Electronics", total=120000)
+        job.save.assert_called_once()
+
+    @patch("product.repositories.CategoryRepository.CategoryDeleteJob")
+    def test_already_deleting(self, mock_job_class):
+        self.categories.find_one_and_update.return_value = None
+        self.mock_category_model.objects.filter.return_value.only.return_value.first.return_value = MagicMock()
+        mock_job_class.objects.return_value.order_by.return_value.first.return_value = None
+
+        with self.assertRaises(ValueError) as context:
+            CategoryRepository.start_delete("Electronics")
+        self.assertEqual(str(context.exception), "Category is already being deleted.")
+
+    @patch("product.repositories.CategoryRepository.CategoryDeleteJob")
+    def test_resumes_a_job_whose_lease_ran_out(self, mock_job_class):
+        category = MagicMock(id=ObjectId())
+        self.categories.find_one_and_update.return_value = None
+        self.mock_category_model.objects.filter.return_value.only.return_value.first.return_value = category
+        stale_job = mock_job_class.objects.return_value.order_by.return_value.first.return_value
+
+        with patch("product.repositories.CategoryRepository.get_setting", return_value=300):
+            job = CategoryRepository.start_delete("Electronics")
+
+        self.assertIs(job, stale_job)
+        query = mock_job_class.objects.call_args.kwargs
+        self.assertEqual(query["category"], category.id)
+        self.assertEqual(query["status__in"], ["pending", "running"])
+        lease_age = datetime.datetime.now() - query["updated_at__lt"]
+        self.assertAlmostEqual(lease_age.total_seconds(), 300, delta=5)
+        mock_job_class.assert_not_called()  # no second job for the same category
+
+    def test_not_found(self):
+        self.categories.find_one_and_update.return_value = None
+        self.mock_category_model.objects.filter.return_value.only.return_value.first.return_value = None
+
+        with self.assertRaises(ValueError) as context:
+            CategoryRepository.start_delete("Missing")
+        self.assertEqual(str(context.exception), "Category not found.")
+
+
+class TestRunDelete(unittest.TestCase):
+    def setUp(self):
+        self.job_id, self.category_id = ObjectId(), ObjectId()
+        patcher = patch("product.repositories.CategoryRepository.CategoryDeleteJob._get_collection")
+        self.jobs = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.jobs.find_one_and_update.return_value = {"_id": self.job_id, "category": self.category_id, "title": "Old"}
+        patcher = patch("product.repositories.CategoryRepository.Product._get_collection")
+        self.products = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = patch("product.repositories.CategoryRepository.ProductCategory")
+        self.mock_category_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_deletes_in_batches_then_the_category(self):
+        batches = [[{"_id": ObjectId(), "quantity": 2} for _ in range(2)], [{"_id": ObjectId(), "quantity": 5}], []]
+        self.products.find.return_value.limit.side_effect = batches
+        self.products.delete_many.side_effect = [MagicMock(deleted_count=2), MagicMock(deleted_count=1)]
+
+        CategoryRepository.run_delete(self.job_id, batch_size=2)
+
+        self.products.find.return_value.limit.assert_called_with(2)
+        self.assertEqual(self.products.delete_many.call_count, 2)
+        self.assertEqual(
+            self.products.delete_many.call_args.args[0], {"_id": {"$in": [batches[1][0]["_id"]]}}
+        )
+        self.assertEqual(
+            [c.args[0] for c in self.mock_adjust_counters.call_args_list],
+            [{self.category_id: (-2, -4)}, {self.category_id: (-1, -5)}],
+        )
+        self.assertEqual([c.args[1]["$inc"] for c in self.jobs.update_one.call_args_list[:2]], [{"deleted": 2}, {"deleted": 1}])
+        self.mock_category_model.objects.assert_called_once_with(id=self.category_id)
+        self.mock_category_model.objects.return_value.delete.assert_called_once()
+        self.assertEqual(self.jobs.update_one.call_args.args[1]["$set"]["status"], "done")
+
+    def test_failure_marks_job_and_clears_flag(self):
+        self.products.find.return_value.limit.side_effect = RuntimeError("connection lost")
+
+        with self.assertRaises(RuntimeError):
+            CategoryRepository.run_delete(self.job_id)
+
+        self.mock_category_model._get_collection.return_value.update_one.assert_called_once_with(
+            {"_id": self.category_id}, {"$set": {"deleting": False}}
+        )
+        self.assertEqual(self.jobs.update_one.call_args.args[1]["$set"]["status"], "failed")
+        self.assertEqual(self.jobs.update_one.call_args.args[1]["$set"]["error"], "connection lost")
+
+    def test_claims_pending_or_stale_running_jobs(self):
+        self.products.find.return_value.limit.return_value = []
+
+        CategoryRepository.run_delete(self.job_id)
+
+        query = self.jobs.find_one_and_update.call_args.args[0]
+        self.assertEqual(query["_id"], self.job_id)
+        pending, stale = query["$or"]
+        self.assertEqual(pending, {"status": "pending"})
+        self.assertEqual(stale["status"], "running")
+        self.assertLess(stale["updated_at"]["$lt"], datetime.datetime.now())
+
+    def test_job_already_taken(self):
+        self.jobs.find_one_and_update.return_value = None
+
+        CategoryRepository.run_delete(self.job_id)
+
+        self.products.find.assert_not_called()
+
+
+class TestAcceptingProducts(unittest.TestCase):
+    @patch("product.repositories.CategoryRepository.ProductCategory._get_collection")
+    def test_reads_the_flag_from_mongo(self, mock_get_collection):
+        category_id = ObjectId()
+        mock_get_collection.return_value.find.return_value = [{"_id": category_id, "title": "Kitchen"}]
+
+        self.assertEqual(CategoryRepository.accepting_products([category_id]), {category_id: "Kitchen"})
+        mock_get_collection.return_value.find.assert_called_once_with(
+            {"_id": {"$in": [category_id]}, "deleting": {"$ne": True}}, {"title": 1},
+        )
+
+    @patch.object(CategoryRepository, "accepting_products", return_value={})
+    @patch("product.models.CategoryModel.ProductCategory.objects")
+    def test_create_ignores_a_stale_cached_flag(self, mock_category_objects, mock_accepting_products):
+        # Cached before another process started deleting the category
+        category_cache.clear()
+        mock_category_objects.filter.return_value.first.return_value = MagicMock(id=ObjectId(), title="Old", deleting=False)
+
+        with self.assertRaises(ValueError):
+            ProductRepository.create("Mixer", "500W", "Old", 10.0, "Acme")
+
+    @patch("product.models.CategoryModel.ProductCategory.objects")
+    def test_create_rejects_a_title_renamed_by_another_process(self, mock_category_objects):
+        category_cache.clear()
+        category_id = ObjectId()
+        mock_category_objects.filter.return_value.first.return_value = MagicMock(id=category_id, title="Old", deleting=False)
+
+        with patch.object(CategoryRepository, "accepting_products", return_value={category_id: "New"}):
+            with self.assertRaises(ValueError):
+                ProductRepository.create("Mixer", "500W", "Old", 10.0, "Acme")
+        self.assertEqual(category_cache.stats()["size"], 0)  # the stale entry is dropped
+
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    def test_imports_skip_a_title_renamed_by_another_process(self, mock_category_model):
+        category_cache.clear()
+        kept, renamed = ObjectId(), ObjectId()
+        mock_category_model.objects.return_value = [MagicMock(id=kept, title="Kitchen"), MagicMock(id=renamed, title="Old")]
+
+        with patch.object(CategoryRepository, "accepting_products", return_value={kept: "Kitchen", renamed: "New"}):
+            self.assertEqual(ProductRepository._category_ids(["Kitchen", "Old"]), {"Kitchen": kept})
+
+
+class TestDeleteJobToDict(unittest.TestCase):
+    def test_progress(self):
+        job = MagicMock(id=ObjectId(), title="Old", status="running", total=4, deleted=1, error=None,
+                        created_at=None, finished_at=None)
+        self.assertEqual(delete_job_to_dict(job)["progress"], 0.25)
+        job.deleted = 6
+        self.assertEqual(delete_job_to_dict(job)["progress"], 1.0)
+        job.total, job.status = 0, "done"
+        self.assertEqual(delete_job_to_dict(job)["progress"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
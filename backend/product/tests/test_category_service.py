@@ -1,8 +1,19 @@
 import unittest
+from product.cache.CategoryCache import category_cache
 from unittest.mock import patch, MagicMock
 from product.repositories.CategoryRepository import CategoryRepository
+from product.tests.fakes import accept_cached_categories
 
 class TestCategoryRepository(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "accepting_products", side_effect=accept_cached_categories)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
 
     @patch("product.repositories.CategoryRepository.ProductCategory")
     def test_create_category_success(self, mock_product_category):
@@ -59,7 +70,7 @@ class TestCategoryRepository(unittest.TestCase):
     @patch("product.models.ProductModel.Product.objects")
     @patch("product.models.CategoryModel.ProductCategory.objects")
     def test_add_product_to_category_success(self, mock_category_objects, mock_product_objects):
-        mock_category = MagicMock()
+        mock_category = MagicMock(title="Electronics", deleting=False)
         mock_product = MagicMock()
         mock_category_objects.filter.return_value.first.return_value = mock_category
         mock_product_objects.filter.return_value.first.return_value = mock_product
@@ -98,8 +109,9 @@ class TestCategoryRepository(unittest.TestCase):
         self.assertEqual(str(context.exception), "Product not found.")
 
     @patch("product.models.CategoryModel.ProductCategory.objects")
-    def test_update_category_success(self, mock_category_objects):
-        mock_category = MagicMock()
+    @patch("product.repositories.CategoryRepository.Product._get_collection")
+    def test_update_category_success(self, mock_get_collection, mock_category_objects):
+        mock_category = MagicMock(deleting=False)
         mock_category_objects.filter.side_effect = [
             MagicMock(first=MagicMock(return_value=mock_category)),  # Existing category
             MagicMock(first=MagicMock(return_value=None))            # No conflict with new title
@@ -110,6 +122,9 @@ class TestCategoryRepository(unittest.TestCase):
         self.assertEqual(mock_category.title, "Gadgets")
         self.assertEqual(mock_category.description, "All gadgets")
         mock_category.save.assert_called_once()
+        mock_get_collection.return_value.update_many.assert_called_once_with(
+            {"category": mock_category.id}, {"$set": {"category_title": "Gadgets"}}
+        )
 
     @patch("product.models.CategoryModel.ProductCategory.objects")
     def test_update_category_not_found(self, mock_category_objects):
@@ -121,7 +136,7 @@ class TestCategoryRepository(unittest.TestCase):
 
     @patch("product.models.CategoryModel.ProductCategory.objects")
     def test_update_category_duplicate_title(self, mock_category_objects):
-        mock_category = MagicMock()
+        mock_category = MagicMock(deleting=False)
         mock_category_objects.filter.side_effect = [
             MagicMock(first=MagicMock(return_value=mock_category)),  # existing category
             MagicMock(first=MagicMock(return_value=MagicMock()))     # new title exists
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+from bson import ObjectId
+from product.repositories.CategoryRepository import CategoryRepository
+
+
+class TestCategoryStats(unittest.TestCase):
+    @patch("product.repositories.CategoryRepository.ProductCategory")
+    @patch("product.repositories.CategoryRepository.Product")
+    def test_category_stats_runs_one_aggregation(self, mock_product, mock_category_model):
+        electronics, books, empty = ObjectId(), ObjectId(), ObjectId()
+        mock_category_model._get_collection_name.return_value = "product_categories"
+        mock_product._get_collection.return_value.aggregate.return_value = [
+            {"_id": electronics, "title": "Electronics", "product_count": 2, "total_quantity": 3,
+             "inventory_value": 2999.997, "min_price": 999.99, "avg_price": 1499.996, "max_price": 2000.0},
+            {"_id": books, "title": "Books", "product_count": 1, "total_quantity": 10,
+             "inventory_value": 150.0, "min_price": 15.0, "avg_price": 15.0, "max_price": 15.0},
+        ]
+        mock_category_model.objects.only.return_value.as_pymongo.return_value = [
+            {"_id": electronics, "title": "Electronics"}, {"_id": books, "title": "Books"}, {"_id": empty, "title": "Garden"},
+        ]
+
+        stats = CategoryRepository.category_stats()
+
+        self.assertEqual([row["title"] for row in stats], ["Books", "Electronics", "Garden"])
+        self.assertEqual(stats[1]["inventory_value"], 3000.0)
+        self.assertEqual(stats[1]["avg_price"], 1500.0)
+        self.assertEqual(stats[2]["product_count"], 0)
+        self.assertIsNone(stats[2]["avg_price"])
+
+        mock_product._get_collection.return_value.aggregate.assert_called_once()
+        pipeline = mock_product._get_collection.return_value.aggregate.call_args[0][0]
+        self.assertEqual([next(iter(stage)) for stage in pipeline], ["$group", "$lookup", "$unwind", "$project"])
+        self.assertEqual(pipeline[1]["$lookup"]["from"], "product_categories")
+
+
+if __name__ == "__main__":
+    unittest.main()
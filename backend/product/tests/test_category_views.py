@@ -0,0 +1,56 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+from bson import ObjectId
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from django.test import RequestFactory  # noqa: E402
+from product.services.AsyncProductService import AsyncProductService  # noqa: E402
+from product.services.ProductService import ProductService  # noqa: E402
+from product.views.AsyncCategoryViews import AsyncProductsByCategoryView  # noqa: E402
+from product.views.CategoryViews import ProductsByCategoryView  # noqa: E402
+
+
+class TestProductsByCategoryView(unittest.TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        category_id = ObjectId()
+        # One product from before the title snapshot, one with it
+        self.products = [
+            {"_id": ObjectId(), "name": "Kettle", "category": category_id},
+            {"_id": ObjectId(), "name": "Toaster", "category": category_id, "category_title": "Kitchen"},
+        ]
+
+    def test_category_comes_from_the_requested_category(self):
+        request = self.factory.get("/categories/Kitchen/products/", {"fields": "name,category", "limit": "10"})
+        with patch.object(ProductService, "get_products_by_category", return_value=self.products):
+            response = ProductsByCategoryView.as_view()(request, category_title="Kitchen")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["results"], [
+            {"name": "Kettle", "category": "Kitchen"},
+            {"name": "Toaster", "category": "Kitchen"},
+        ])
+
+    def test_async_category_comes_from_the_requested_category(self):
+        request = self.factory.get("/async/categories/Kitchen/products/", {"fields": "name,category", "limit": "10"})
+        with patch.object(AsyncProductService, "get_products_by_category", return_value=self.products):
+            response = asyncio.run(AsyncProductsByCategoryView.as_view()(request, category_title="Kitchen"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["category"] for row in json.loads(response.content)["results"]], ["Kitchen", "Kitchen"])
+
+    def test_unknown_category_is_a_404(self):
+        request = self.factory.get("/categories/Nope/products/", {"limit": "10"})
+        with patch.object(ProductService, "get_products_by_category", side_effect=ValueError("Category not found.")):
+            response = ProductsByCategoryView.as_view()(request, category_title="Nope")
+
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
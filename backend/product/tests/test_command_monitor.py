@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from product.middleware import DbCommandMiddleware
+from product.monitoring.CommandMonitor import command_monitor, track_commands
+from product.tests.assertions import DbCommandAssertionsMixin
+
+
+def send(command_name, micros=1000):
+    command_monitor.started(MagicMock(command_name=command_name))
+    command_monitor.succeeded(MagicMock(command_name=command_name, duration_micros=micros))
+
+
+class TestCommandMonitor(DbCommandAssertionsMixin, unittest.TestCase):
+    def test_counts_only_inside_the_block(self):
+        send("find")
+        with track_commands() as stats:
+            send("find", 1500)
+            send("getMore", 500)
+        send("find")
+
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.by_name, {"find": 1, "getMore": 1})
+        self.assertAlmostEqual(stats.duration, 0.002)
+
+    def test_nested_blocks_count_towards_the_outer_one(self):
+        with track_commands() as outer:
+            send("find")
+            with track_commands() as inner:
+                send("aggregate")
+
+        self.assertEqual((outer.count, inner.count), (2, 1))
+
+    def test_assert_max_db_commands(self):
+        with self.assertMaxDbCommands(2) as stats:
+            send("find")
+            send("find")
+        self.assertEqual(stats.count, 2)
+
+        with self.assertRaises(AssertionError) as context:
+            with self.assertMaxDbCommands(1):
+                send("find")
+                send("find")
+        self.assertIn("2 database commands sent, expected at most 1", str(context.exception))
+
+
+class TestDbCommandMiddleware(unittest.TestCase):
+    def view(self, request):
+        send("find", 2000)
+        send("find", 1000)
+        return {"Server-Timing": 'cache;desc="miss"'}
+
+    def test_sync_headers(self):
+        response = DbCommandMiddleware(self.view)(MagicMock())
+
+        self.assertEqual(response["X-DB-Commands"], "2")
+        self.assertTrue(response["Server-Timing"].startswith('cache;desc="miss", db;dur=3.00;desc="2 commands", app;dur='))
+
+    def test_async_headers(self):
+        async def view(request):
+            return self.view(request)
+
+        middleware = DbCommandMiddleware(view)
+        response = asyncio.run(middleware(MagicMock()))
+
+        self.assertEqual(response["X-DB-Commands"], "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import datetime
+import unittest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from product.cache.CategoryCache import category_cache
+from product.filters import filter_query, parse_product_filters
+from product.repositories.ProductRepository import ProductRepository
+
+
+class TestProductFilters(unittest.TestCase):
+    def test_parse_product_filters(self):
+        filters = parse_product_filters({
+            "price_min": "10", "price_max": "99.5", "brand": "Acme, Globex", "in_stock": "true",
+            "category": "Electronics", "created_after": "2025-01-31",
+        })
+        self.assertEqual(filters, {
+            "price_min": 10.0, "price_max": 99.5, "brand": ["Acme", "Globex"], "in_stock": True,
+            "category": "Electronics", "created_after": datetime.datetime(2025, 1, 31),
+        })
+        self.assertEqual(parse_product_filters({"limit": "10"}), {})
+
+    def test_invalid_filters(self):
+        for params in [{"price_min": "cheap"}, {"in_stock": "maybe"}, {"created_after": "last week"}]:
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                parse_product_filters(params)
+
+    def test_filter_query(self):
+        category_id = ObjectId()
+        filters = parse_product_filters({"price_min": "10", "brand": "Acme", "in_stock": "0", "category": "Electronics"})
+        self.assertEqual(filter_query(filters, category_id), {
+            "price": {"$gte": 10.0}, "brand": "Acme", "quantity": {"$lte": 0}, "category": category_id,
+        })
+        self.assertEqual(filter_query({"brand": ["Acme", "Globex"]}), {"brand": {"$in": ["Acme", "Globex"]}})
+
+
+class TestProductRepositoryFiltering(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    @patch("product.repositories.ProductRepository.Product")
+    def test_get_all_pushes_filters_and_sort_into_one_query(self, mock_product, mock_category_model):
+        category_id = ObjectId()
+        mock_category_model.objects.filter.return_value.first.return_value = MagicMock(id=category_id, title="Electronics")
+        queryset = mock_product.objects.all.return_value.no_dereference.return_value
+        filtered = queryset.filter.return_value
+
+        ProductRepository.get_all(limit=10, fields=["name"], raw=True,
+                                  filters={"category": "Electronics", "price_max": 50.0}, sort="-price")
+
+        queryset.filter.assert_called_once_with(__raw__={"price": {"$lte": 50.0}, "category": category_id})
+        filtered.only.assert_called_once_with("name", "price")
+        filtered.only.return_value.as_pymongo.return_value.order_by.assert_called_once_with("-price", "-id")
+
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    @patch("product.repositories.ProductRepository.Product")
+    def test_unknown_category_matches_nothing(self, mock_product, mock_category_model):
+        mock_category_model.objects.filter.return_value.first.return_value = None
+        queryset = mock_product.objects.all.return_value.no_dereference.return_value
+
+        ProductRepository.get_all(limit=10, filters={"category": "Unknown"})
+
+        queryset.none.assert_called_once()
+        queryset.filter.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
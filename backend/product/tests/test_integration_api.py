@@ -1,8 +1,14 @@
+import io
 import unittest
+from django.core.management import call_command
 from mongoengine import connect, disconnect
 from product.models.ProductModel import Product
 from product.models.CategoryModel import ProductCategory
 from product.services.ProductService import ProductService
+from product.services.ProductCategoryService import ProductCategoryService
+from product.serializers import category_title
+from product.tests.assertions import DbCommandAssertionsMixin
+from product.cache.CategoryCache import category_cache
 
 class IntegrationTestProductService(unittest.TestCase):
     @classmethod
@@ -16,6 +22,7 @@ class IntegrationTestProductService(unittest.TestCase):
     def setUp(self):
         Product.objects.delete()
         ProductCategory.objects.delete()
+        category_cache.clear()
 
         self.category = ProductCategory(title="Electronics").save()
 
@@ -37,3 +44,114 @@ class IntegrationTestProductService(unittest.TestCase):
         with self.assertRaises(ValueError):
             ProductService.get_products_by_category("Unknown")
 
+
+class IntegrationTestCategoryResolution(DbCommandAssertionsMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connect('test_db', host='localhost', port=27017)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Product.objects.delete()
+        ProductCategory.objects.delete()
+        category_cache.clear()
+
+        self.categories = [ProductCategory(title=f"Category {i}").save() for i in range(5)]
+
+    def seed(self, count):
+        for i in range(count):
+            Product(name=f"Product {i}", category=self.categories[i % 5], price=10, brand="Brand").save()
+
+    def list_with_titles(self):
+        category_cache.clear()  # measure the cold path, not categories cached by the previous call
+        products = list(ProductService.list_products())
+        categories = ProductService.get_category_map(products)
+        return [category_title(p, categories) for p in products]
+
+    def test_list_command_count_is_independent_of_size(self):
+        self.seed(10)
+        with self.assertMaxDbCommands(2) as small:
+            titles = self.list_with_titles()
+        self.assertEqual(len(titles), 10)
+        self.assertNotIn(None, titles)
+
+        self.seed(190)
+        # The product cursor needs one getMore past its first batch of 101
+        with self.assertMaxDbCommands(3) as large:
+            titles = self.list_with_titles()
+        self.assertEqual(len(titles), 200)
+        self.assertNotIn(None, titles)
+        # One find for the products, one `$in` find for their categories.
+        self.assertEqual(small.by_name["find"], 2)
+        self.assertEqual(large.by_name["find"], 2)
+
+
+class IntegrationTestCategoryStats(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connect('test_db', host='localhost', port=27017)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Product.objects.delete()
+        ProductCategory.objects.delete()
+        category_cache.clear()
+        electronics = ProductCategory(title="Electronics").save()
+        ProductCategory(title="Garden").save()
+        Product(name="Laptop", category=electronics, price=2000, brand="A", quantity=2).save()
+        Product(name="Mouse", category=electronics, price=25.5, brand="B", quantity=10).save()
+
+    def test_category_stats(self):
+        stats = {row["title"]: row for row in ProductCategoryService.get_category_stats()}
+
+        self.assertEqual(stats["Electronics"]["product_count"], 2)
+        self.assertEqual(stats["Electronics"]["total_quantity"], 12)
+        self.assertEqual(stats["Electronics"]["inventory_value"], 4255.0)
+        self.assertEqual(stats["Electronics"]["min_price"], 25.5)
+        self.assertEqual(stats["Electronics"]["avg_price"], 1012.75)
+        self.assertEqual(stats["Electronics"]["max_price"], 2000)
+        self.assertEqual(stats["Garden"]["product_count"], 0)
+
+
+class IntegrationTestCategoryCounters(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connect('test_db', host='localhost', port=27017)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Product.objects.delete()
+        ProductCategory.objects.delete()
+        category_cache.clear()
+        ProductCategory(title="Electronics").save()
+        ProductCategory(title="Books").save()
+
+    def counters(self, title):
+        category = ProductCategory.objects.get(title=title)
+        return category.product_count, category.total_quantity
+
+    def test_counters_follow_every_write(self):
+        laptop = ProductService.create_product("Laptop", "", "Electronics", 2000, "A", 5)
+        mouse = ProductService.create_product("Mouse", "", "Electronics", 20, "B", 10)
+        self.assertEqual(self.counters("Electronics"), (2, 15))
+
+        ProductService.reserve_stock(str(laptop.id), 2)
+        ProductService.update_product(str(mouse.id), category_title="Books", quantity=4)
+        self.assertEqual(self.counters("Electronics"), (1, 3))
+        self.assertEqual(self.counters("Books"), (1, 4))
+
+        ProductService.delete_product(str(laptop.id))
+        self.assertEqual(self.counters("Electronics"), (0, 0))
+
+        out = io.StringIO()
+        call_command("repair_category_counters", "--dry-run", stdout=out)
+        self.assertIn("No drift.", out.getvalue())
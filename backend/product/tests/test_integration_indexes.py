@@ -0,0 +1,94 @@
+import unittest
+from mongoengine import connect, disconnect
+from product.models.ProductModel import Product
+from product.models.CategoryModel import ProductCategory
+from product.repositories.ProductRepository import ProductRepository
+from product.cache.CategoryCache import category_cache
+
+
+def plan_stages(plan):
+    """Yield every stage name in an explain() query plan tree."""
+    yield plan["stage"]
+    for child in plan.get("inputStages", []) + [plan[key] for key in ("inputStage", "queryPlan") if key in plan]:
+        yield from plan_stages(child)
+
+
+class IntegrationTestRepositoryIndexes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connect('test_db', host='localhost', port=27017)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Product.objects.delete()
+        ProductCategory.objects.delete()
+        category_cache.clear()
+        Product.ensure_indexes()
+        ProductCategory.ensure_indexes()
+
+        self.category = ProductCategory(title="Electronics").save()
+        self.products = [
+            Product(name=f"Product {i}", category=self.category, price=10 + i, brand="Brand").save()
+            for i in range(20)
+        ]
+
+    def assertNoCollscan(self, queryset):
+        stages = list(plan_stages(queryset.explain()["queryPlanner"]["winningPlan"]))
+        self.assertNotIn("COLLSCAN", stages)
+
+    def test_repository_queries_use_indexes(self):
+        after = self.products[4].id
+        queries = [
+            ProductRepository.get_all(limit=5),
+            ProductRepository.get_all(after=after, limit=5, raw=True),
+            ProductRepository.get_products_by_category("Electronics", limit=5),
+            ProductRepository.get_products_by_category("Electronics", after=after, limit=5, raw=True),
+            ProductRepository.get_all(limit=5, filters={"price_min": 15.0, "price_max": 25.0}),
+            ProductRepository.get_all(limit=5, filters={"brand": ["Brand"]}, raw=True),
+            ProductRepository.get_all(limit=5, sort="-price"),
+            ProductRepository.get_all(after=(14.0, after), limit=5, sort="-price", raw=True),
+            ProductRepository.get_all(limit=5, sort="created_at", filters={"category": "Electronics"}),
+            Product.objects.filter(id=after),
+            ProductCategory.objects.filter(title="Electronics"),
+            ProductCategory.objects(id__in=[self.category.id]),
+        ]
+        for queryset in queries:
+            with self.subTest(query=queryset._query):
+                self.assertNoCollscan(queryset)
+
+
+class IntegrationTestProductSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connect('test_db', host='localhost', port=27017)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Product.objects.delete()
+        ProductCategory.objects.delete()
+        category_cache.clear()
+        Product.ensure_indexes()
+        category = ProductCategory(title="Kitchen").save()
+        Product(name="Stand Mixer", description="Tilt-head.", category=category, price=300, brand="KitchenAid").save()
+        Product(name="Blender", description="Works as a mixer for smoothies.", category=category, price=80, brand="Oster").save()
+        Product(name="Toaster", description="Two slots.", category=category, price=40, brand="Mixerly").save()
+
+    def test_name_matches_rank_first(self):
+        results = ProductRepository.search("mixer", fields=["name"])
+        self.assertEqual([p["name"] for p in results], ["Stand Mixer", "Blender"])
+
+    def test_search_combines_with_filters(self):
+        results = ProductRepository.search("mixer", fields=["name"], filters={"price_max": 100.0})
+        self.assertEqual([p["name"] for p in results], ["Blender"])
+
+    def test_search_uses_text_index(self):
+        cursor = Product._get_collection().find({"$text": {"$search": "mixer"}})
+        stages = list(plan_stages(cursor.explain()["queryPlanner"]["winningPlan"]))
+        self.assertIn("TEXT_MATCH", stages)
+        self.assertNotIn("COLLSCAN", stages)
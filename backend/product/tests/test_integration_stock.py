@@ -0,0 +1,69 @@
+import threading
+import unittest
+from mongoengine import connect, disconnect
+from product.models.ProductModel import Product
+from product.models.CategoryModel import ProductCategory
+from product.repositories.ProductRepository import InsufficientStockError
+from product.services.ProductService import ProductService
+from product.cache.CategoryCache import category_cache
+
+
+class IntegrationTestConcurrentStock(unittest.TestCase):
+    THREADS = 16
+    ATTEMPTS_PER_THREAD = 50
+    STOCK = 500
+
+    @classmethod
+    def setUpClass(cls):
+        connect('test_db', host='localhost', port=27017, maxPoolSize=cls.THREADS)
+
+    @classmethod
+    def tearDownClass(cls):
+        disconnect()
+
+    def setUp(self):
+        Product.objects.delete()
+        ProductCategory.objects.delete()
+        category_cache.clear()
+        category = ProductCategory(title="Electronics").save()
+        self.product = Product(name="Phone", category=category, price=100, brand="BrandX", quantity=self.STOCK).save()
+
+    def test_concurrent_reservations_never_oversell(self):
+        reserved, rejected = [], []
+        start_gate = threading.Barrier(self.THREADS)
+
+        def worker():
+            start_gate.wait()
+            for _ in range(self.ATTEMPTS_PER_THREAD):
+                try:
+                    ProductService.reserve_stock(str(self.product.id), 1)
+                    reserved.append(1)
+                except InsufficientStockError:
+                    rejected.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        attempts = self.THREADS * self.ATTEMPTS_PER_THREAD
+        self.assertEqual(len(reserved), self.STOCK)
+        self.assertEqual(len(rejected), attempts - self.STOCK)
+        self.product.reload()
+        self.assertEqual(self.product.quantity, 0)
+
+    def test_concurrent_reserve_and_release_keep_quantity_consistent(self):
+        def worker():
+            for _ in range(self.ATTEMPTS_PER_THREAD):
+                ProductService.reserve_stock(str(self.product.id), 1)
+                ProductService.release_stock(str(self.product.id), 1)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.product.reload()
+        self.assertEqual(self.product.quantity, self.STOCK)
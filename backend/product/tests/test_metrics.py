@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from product.middleware import MetricsMiddleware, request_duration, requests_total
+from product.monitoring.CommandMonitor import command_duration, command_monitor
+from product.monitoring.Metrics import Family, Registry, cache_collector
+
+
+def sample(metric, name, **labels):
+    return next((value for sample_name, sample_labels, value in metric.samples()
+                 if sample_name == name and sample_labels == labels), None)
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_exposition(self):
+        counter = self.registry.counter("jobs_total", "Jobs run.", ["status"])
+        counter.inc("done")
+        counter.inc("done", amount=2)
+
+        self.assertEqual(self.registry.render(), (
+            "# HELP jobs_total Jobs run.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{status="done"} 3\n'
+        ))
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        lines = self.registry.render().splitlines()[2:]
+        self.assertEqual(lines, [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1.0"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_count 4",
+            "latency_seconds_sum 3.65",
+        ])
+
+    def test_label_values_are_escaped(self):
+        self.registry.counter("hits_total", "Hits.", ["path"]).inc('a"b\\c\nd')
+
+        self.assertIn('hits_total{path="a\\"b\\\\c\\nd"} 1', self.registry.render())
+
+    def test_collector_families_with_one_name_are_merged(self):
+        self.registry.register_collector(cache_collector("one", MagicMock(stats=lambda: {"hits": 1, "misses": 0, "hit_ratio": 1.0, "size": 1})))
+        self.registry.register_collector(cache_collector("two", MagicMock(stats=lambda: {"hits": 0, "misses": 0, "hit_ratio": None, "size": 0})))
+
+        text = self.registry.render()
+        self.assertEqual(text.count("# TYPE cache_hits_total counter"), 1)
+        self.assertIn('cache_hits_total{cache="one"} 1\ncache_hits_total{cache="two"} 0\n', text)
+        self.assertIn('cache_hit_ratio{cache="two"} NaN', text)
+
+    def test_duplicate_names_are_rejected(self):
+        self.registry.counter("jobs_total", "Jobs run.")
+        with self.assertRaises(ValueError):
+            self.registry.histogram("jobs_total", "Jobs run.")
+
+    def test_family_chaining(self):
+        family = Family("up", "gauge", "Up.", ["pool"]).add(1, "default").add(0, "readonly")
+        self.assertEqual(list(family.samples()), [("up", {"pool": "default"}, 1), ("up", {"pool": "readonly"}, 0)])
+
+
+class TestCommandMetrics(unittest.TestCase):
+    def run_command(self, command, request_id, micros=1000):
+        name = next(iter(command))
+        command_monitor.started(MagicMock(command_name=name, command=command, connection_id=("h", 1), request_id=request_id))
+        command_monitor.succeeded(MagicMock(command_name=name, duration_micros=micros, connection_id=("h", 1), request_id=request_id))
+
+    def test_labels_by_command_and_collection(self):
+        before = sample(command_duration, "mongodb_command_duration_seconds_count", command="getMore", collection="metrics_test") or 0
+
+        self.run_command({"find": "metrics_test"}, 1)
+        self.run_command({"getMore": 123, "collection": "metrics_test"}, 2)
+
+        self.assertEqual(sample(command_duration, "mongodb_command_duration_seconds_count", command="find", collection="metrics_test"), 1)
+        self.assertEqual(sample(command_duration, "mongodb_command_duration_seconds_count", command="getMore", collection="metrics_test"), before + 1)
+        self.assertNotIn((("h", 1), 1), command_monitor._in_flight)
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+    def request(self, url_name, method="GET"):
+        return MagicMock(method=method, resolver_match=MagicMock(url_name=url_name, route="unused"))
+
+    def test_sync_records_latency_and_status(self):
+        middleware = MetricsMiddleware(lambda request: MagicMock(status_code=404))
+        middleware(self.request("metrics-sync-test"))
+
+        self.assertEqual(sample(requests_total, "http_requests_total", view="metrics-sync-test", method="GET", status="404"), 1)
+        self.assertEqual(sample(request_duration, "http_request_duration_seconds_count", view="metrics-sync-test", method="GET"), 1)
+
+    def test_async_and_unknown_methods(self):
+        async def view(request):
+            return MagicMock(status_code=200)
+
+        asyncio.run(MetricsMiddleware(view)(self.request("metrics-async-test", method="BREW")))
+
+        self.assertEqual(sample(requests_total, "http_requests_total", view="metrics-async-test", method="other", status="200"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
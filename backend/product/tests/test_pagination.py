@@ -0,0 +1,122 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+from bson import ObjectId
+from product.pagination import (
+    decode_cursor, encode_cursor, keyset_query, keyset_window, paginate, parse_page_params, parse_sort,
+    with_sort_field, MAX_LIMIT,
+)
+
+
+class TestPagination(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        last_id = ObjectId()
+        self.assertEqual(decode_cursor(encode_cursor(last_id)), last_id)
+
+    def test_invalid_cursor(self):
+        for cursor in ["not-a-cursor", encode_cursor("123")]:
+            with self.assertRaises(ValueError) as context:
+                decode_cursor(cursor)
+            self.assertEqual(str(context.exception), "Invalid cursor.")
+
+    def test_parse_page_params(self):
+        last_id = ObjectId()
+        after, limit = parse_page_params({"limit": "10", "cursor": encode_cursor(last_id)})
+        self.assertEqual(after, last_id)
+        self.assertEqual(limit, 10)
+
+        _, limit = parse_page_params({"limit": str(MAX_LIMIT * 10)})
+        self.assertEqual(limit, MAX_LIMIT)
+
+        with self.assertRaises(ValueError):
+            parse_page_params({"limit": "0"})
+        with self.assertRaises(ValueError):
+            parse_page_params({"limit": "ten"})
+
+    def test_keyset_window_seeks_past_cursor(self):
+        queryset = MagicMock()
+        after = ObjectId()
+
+        result = keyset_window(queryset, after, 5)
+
+        queryset.filter.assert_called_once_with(id__gt=after)
+        queryset.filter.return_value.order_by.assert_called_once_with("id")
+        queryset.filter.return_value.order_by.return_value.limit.assert_called_once_with(6)
+        self.assertEqual(result, queryset.filter.return_value.order_by.return_value.limit.return_value)
+
+    def test_keyset_window_without_limit_is_unbounded(self):
+        queryset = MagicMock()
+        self.assertEqual(keyset_window(queryset), queryset)
+        queryset.filter.assert_not_called()
+
+    def test_paginate(self):
+        items = [MagicMock(id=ObjectId()) for _ in range(4)]
+
+        page, next_cursor = paginate(items, 3)
+        self.assertEqual(page, items[:3])
+        self.assertEqual(decode_cursor(next_cursor), items[2].id)
+
+        page, next_cursor = paginate(items[:3], 3)
+        self.assertEqual(page, items[:3])
+        self.assertIsNone(next_cursor)
+
+
+
+class TestSortedPagination(unittest.TestCase):
+    def test_parse_sort(self):
+        self.assertIsNone(parse_sort(None))
+        self.assertEqual(parse_sort("-price"), "-price")
+        for value in ["quantity", "--price", "description"]:
+            with self.assertRaises(ValueError):
+                parse_sort(value)
+
+    def test_sorted_cursor_round_trip_keeps_value_type(self):
+        last_id = ObjectId()
+        created_at = datetime.datetime(2025, 3, 1, 12, 30, 15, 123000)
+        cursor = encode_cursor(last_id, "-created_at", created_at)
+
+        value, decoded_id = decode_cursor(cursor, "-created_at")
+
+        self.assertEqual(decoded_id, last_id)
+        self.assertEqual(value.replace(tzinfo=None), created_at)
+
+    def test_cursor_is_bound_to_its_sort(self):
+        sorted_cursor = encode_cursor(ObjectId(), "price", 10.0)
+        for cursor, sort in [(sorted_cursor, None), (sorted_cursor, "-price"), (encode_cursor(ObjectId()), "price")]:
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor, sort)
+
+    def test_keyset_query(self):
+        last_id = ObjectId()
+        self.assertEqual(keyset_query(last_id), {"_id": {"$gt": last_id}})
+        self.assertEqual(
+            keyset_query((10.0, last_id), "-price"),
+            {"$or": [{"price": {"$lt": 10.0}}, {"price": 10.0, "_id": {"$lt": last_id}}]},
+        )
+
+    def test_keyset_window_orders_by_sort_then_id(self):
+        queryset = MagicMock()
+        after = (10.0, ObjectId())
+
+        keyset_window(queryset, after, 5, "-price")
+
+        queryset.order_by.assert_called_once_with("-price", "-id")
+        ordered = queryset.order_by.return_value
+        ordered.filter.assert_called_once_with(__raw__=keyset_query(after, "-price"))
+        ordered.filter.return_value.limit.assert_called_once_with(6)
+
+    def test_paginate_encodes_sort_value(self):
+        items = [{"_id": ObjectId(), "price": float(i)} for i in range(3)]
+
+        _, next_cursor = paginate(items, 2, "price")
+
+        self.assertEqual(decode_cursor(next_cursor, "price"), (1.0, items[1]["_id"]))
+
+    def test_with_sort_field(self):
+        self.assertEqual(with_sort_field(["id", "name"], "-price"), ["id", "name", "price"])
+        self.assertEqual(with_sort_field(["price"], "price"), ["price"])
+        self.assertIsNone(with_sort_field(None, "price"))
+
+
+if __name__ == "__main__":
+    unittest.main()
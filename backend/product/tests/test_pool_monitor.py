@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutFailedReason,
+    ConnectionCheckOutStartedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+)
+from product.db import read_collection, read_objects
+from product.monitoring.PoolMonitor import PoolMonitor, pool_monitor
+
+ADDRESS = ("localhost", 27017)
+
+
+class TestPoolMonitor(unittest.TestCase):
+    def test_counts_checkouts_and_waits(self):
+        monitor = PoolMonitor("test")
+        monitor.connection_created(ConnectionCreatedEvent(ADDRESS, 1))
+        monitor.connection_created(ConnectionCreatedEvent(ADDRESS, 2))
+        for _ in range(3):
+            monitor.connection_check_out_started(ConnectionCheckOutStartedEvent(ADDRESS))
+        monitor.connection_checked_out(ConnectionCheckedOutEvent(ADDRESS, 1, 0.002))
+        monitor.connection_checked_out(ConnectionCheckedOutEvent(ADDRESS, 2, 0.010))
+
+        stats = monitor.stats()
+        self.assertEqual((stats["open"], stats["checked_out"], stats["waiting"], stats["max_waiting"]), (2, 2, 1, 3))
+        self.assertEqual(stats["avg_wait_ms"], 6.0)
+        self.assertEqual(stats["max_wait_ms"], 10.0)
+
+        monitor.connection_check_out_failed(
+            ConnectionCheckOutFailedEvent(ADDRESS, ConnectionCheckOutFailedReason.TIMEOUT, 1.0)
+        )
+        monitor.connection_checked_in(ConnectionCheckedInEvent(ADDRESS, 1))
+        monitor.connection_closed(ConnectionClosedEvent(ADDRESS, 1, "idle"))
+
+        stats = monitor.stats()
+        self.assertEqual((stats["open"], stats["checked_out"], stats["waiting"]), (1, 1, 0))
+        self.assertEqual(stats["timeouts"], 1)
+
+    def test_reset(self):
+        monitor = PoolMonitor("test")
+        monitor.connection_check_out_started(ConnectionCheckOutStartedEvent(ADDRESS))
+        monitor.reset()
+        self.assertEqual(monitor.stats()["max_waiting"], 0)
+
+    def test_registry_returns_one_monitor_per_name(self):
+        self.assertIs(pool_monitor("default"), pool_monitor("default"))
+        self.assertIsNot(pool_monitor("default"), pool_monitor("readonly"))
+
+
+class TestReadRouting(unittest.TestCase):
+    def test_default_alias_reads_through_the_document(self):
+        document = MagicMock()
+        self.assertIs(read_objects(document), document.objects)
+        self.assertIs(read_collection(document), document._get_collection.return_value)
+
+    @patch("product.db.get_db")
+    @patch("product.db.get_setting", return_value="readonly")
+    def test_read_alias_binds_its_collection(self, mock_get_setting, mock_get_db):
+        document = MagicMock()
+        document._get_collection_name.return_value = "products"
+
+        collection = read_collection(document)
+
+        mock_get_db.assert_called_once_with("readonly")
+        self.assertIs(collection, mock_get_db.return_value["products"])
+        document._get_collection.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from product.cache.CategoryCache import category_cache
+from product.repositories.ProductRepository import ProductRepository
+from product.services.ProductExportService import ProductExportService
+
+
+class TestProductExportService(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        self.category_id = ObjectId()
+        self.products = [{"_id": ObjectId(), "name": f"Product {i}", "category": self.category_id} for i in range(5)]
+
+        patcher = patch("product.services.ProductService.ProductRepository.export")
+        self.mock_export = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_export.return_value = self.products
+
+        patcher = patch("product.repositories.ProductRepository.ProductCategory")
+        self.mock_category_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_category_model.objects.return_value = [MagicMock(id=self.category_id, title="Electronics")]
+
+    def test_ndjson_is_chunked_per_batch(self):
+        chunks = list(ProductExportService.export_products(["id", "name", "category"], "ndjson", batch_size=2))
+
+        self.assertEqual(len(chunks), 3)
+        rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        self.assertEqual([row["name"] for row in rows], [f"Product {i}" for i in range(5)])
+        self.assertEqual(rows[0], {"id": str(self.products[0]["_id"]), "name": "Product 0", "category": "Electronics"})
+        self.mock_export.assert_called_once_with(["id", "name", "category"], 2)
+        # Categories come from the cache after the first batch
+        self.mock_category_model.objects.assert_called_once()
+
+    def test_csv_starts_with_a_header(self):
+        chunks = list(ProductExportService.export_products(["name", "category"], "csv", batch_size=10))
+
+        self.assertEqual(chunks[0], "name,category\r\n")
+        self.assertEqual(chunks[1].splitlines()[0], "Product 0,Electronics")
+        self.assertEqual(len(chunks[1].splitlines()), 5)
+
+    def test_empty_catalog(self):
+        self.mock_export.return_value = []
+        self.assertEqual(list(ProductExportService.export_products(["name"], "ndjson")), [])
+        self.assertEqual(list(ProductExportService.export_products(["name"], "csv")), ["name\r\n"])
+
+    def test_category_map_is_skipped_without_category_field(self):
+        list(ProductExportService.export_products(["name"], "ndjson"))
+        self.mock_category_model.objects.assert_not_called()
+
+
+class TestProductRepositoryExport(unittest.TestCase):
+    @patch("product.repositories.ProductRepository.Product")
+    def test_export_streams_without_caching(self, mock_product):
+        queryset = mock_product.objects.all.return_value.no_dereference.return_value
+        queryset.only.return_value = queryset
+        queryset.as_pymongo.return_value = queryset
+        queryset.order_by.return_value = queryset
+        queryset.batch_size.return_value = queryset
+
+        result = ProductRepository.export(["name"], batch_size=500)
+
+        queryset.only.assert_called_once_with("name")
+        queryset.batch_size.assert_called_once_with(500)
+        self.assertEqual(result, queryset.no_cache.return_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
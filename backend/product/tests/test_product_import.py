@@ -0,0 +1,89 @@
+import json
+import unittest
+from product.cache.CategoryCache import category_cache
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from product.services.ProductImportService import ProductImportService
+from product.repositories.CategoryRepository import CategoryRepository
+from product.tests.fakes import accept_cached_categories
+
+
+def ndjson(*rows):
+    return [json.dumps(row).encode() + b"\n" for row in rows]
+
+
+class TestProductImportService(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "accepting_products", side_effect=accept_cached_categories)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.category_id = ObjectId()
+        patcher = patch("product.repositories.ProductRepository.ProductCategory")
+        self.mock_category_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_category_model.objects.return_value = [MagicMock(id=self.category_id, title="Electronics", deleting=False)]
+
+        patcher = patch("product.repositories.ProductRepository.Product._get_collection")
+        self.mock_collection = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.mock_collection.insert_many.side_effect = lambda docs, ordered: MagicMock(inserted_ids=[ObjectId() for _ in docs])
+
+    def row(self, **overrides):
+        row = {"name": "Phone", "category_title": "Electronics", "price": 100, "brand": "BrandX", "quantity": 1}
+        row.update(overrides)
+        return row
+
+    def test_import_ndjson_in_batches(self):
+        lines = ndjson(*[self.row(name=f"Phone {i}") for i in range(5)])
+
+        report = ProductImportService.import_products(lines, "ndjson", batch_size=2)
+
+        self.assertEqual(report, {"inserted": 5, "errors": []})
+        self.assertEqual(self.mock_collection.insert_many.call_count, 3)
+        for call in self.mock_collection.insert_many.call_args_list:
+            self.assertFalse(call.kwargs["ordered"])
+        # Titles are resolved once, not per batch
+        self.mock_category_model.objects.assert_called_once_with(title__in=["Electronics"])
+
+    def test_import_reports_invalid_rows(self):
+        lines = ndjson(self.row(), self.row(category_title="Unknown"))
+        lines.insert(1, b"{broken\n")
+        lines += ndjson(self.row(price="free"), self.row(brand=None))
+
+        report = ProductImportService.import_products(lines, "ndjson")
+
+        self.assertEqual(report["inserted"], 1)
+        self.assertEqual([e["row"] for e in report["errors"]], [2, 3, 4, 5])
+        self.assertEqual(report["errors"][0]["error"], "Invalid JSON.")
+        self.assertEqual(report["errors"][1]["error"], "Category not found.")
+        self.assertIn("brand", report["errors"][3]["error"])
+
+    def test_import_csv(self):
+        lines = [b"name,category_title,price,brand,quantity\n", b"Phone,Electronics,99.5,BrandX,3\n"]
+
+        report = ProductImportService.import_products(lines, "csv")
+
+        self.assertEqual(report, {"inserted": 1, "errors": []})
+        doc = self.mock_collection.insert_many.call_args.args[0][0]
+        self.assertEqual(doc["price"], 99.5)
+        self.assertEqual(doc["quantity"], 3)
+        self.assertEqual(doc["category"], self.category_id)
+
+    def test_import_reports_write_errors_by_row(self):
+        self.mock_collection.insert_many.side_effect = BulkWriteError({
+            "nInserted": 1,
+            "writeErrors": [{"index": 1, "errmsg": "duplicate key"}],
+        })
+
+        report = ProductImportService.import_products(ndjson(self.row(), self.row()), "ndjson")
+
+        self.assertEqual(report, {"inserted": 1, "errors": [{"row": 2, "error": "duplicate key"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+from bson import ObjectId
+from product.cache.CategoryCache import category_cache
+from product.pagination import MAX_OFFSET, encode_offset_cursor, paginate_offset, parse_offset_params
+from product.repositories.ProductRepository import ProductRepository
+
+
+class TestProductSearch(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch("product.repositories.ProductRepository.Product._get_collection")
+        self.mock_collection = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.cursor = self.mock_collection.find.return_value
+        self.cursor.sort.return_value = self.cursor
+        self.cursor.skip.return_value = self.cursor
+        self.cursor.limit.return_value = self.cursor
+        self.cursor.__iter__.return_value = iter([{"_id": ObjectId(), "name": "Stand mixer"}])
+
+    def test_search_sorts_by_text_score(self):
+        results = ProductRepository.search("mixer", offset=20, limit=10, fields=["id", "name"],
+                                           filters={"price_max": 100.0})
+
+        self.assertEqual(results[0]["name"], "Stand mixer")
+        self.mock_collection.find.assert_called_once_with(
+            {"$text": {"$search": "mixer"}, "price": {"$lte": 100.0}},
+            {"name": 1, "score": {"$meta": "textScore"}},
+        )
+        self.cursor.sort.assert_called_once_with([("score", {"$meta": "textScore"}), ("_id", 1)])
+        self.cursor.skip.assert_called_once_with(20)
+        self.cursor.limit.assert_called_once_with(11)
+
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    def test_search_in_unknown_category_skips_query(self, mock_category_model):
+        mock_category_model.objects.filter.return_value.first.return_value = None
+
+        self.assertEqual(ProductRepository.search("mixer", filters={"category": "Unknown"}), [])
+        self.mock_collection.find.assert_not_called()
+
+
+class TestOffsetPagination(unittest.TestCase):
+    def test_parse_offset_params(self):
+        self.assertEqual(parse_offset_params({"limit": "20"}), (0, 20))
+        self.assertEqual(parse_offset_params({"limit": "5", "cursor": encode_offset_cursor(40)}), (40, 5))
+        for cursor in ["nope", encode_offset_cursor(-1), encode_offset_cursor(MAX_OFFSET + 1)]:
+            with self.assertRaises(ValueError):
+                parse_offset_params({"limit": "20", "cursor": cursor})
+
+    def test_paginate_offset(self):
+        items, next_cursor = paginate_offset(range(11), 0, 10)
+        self.assertEqual(items, list(range(10)))
+        self.assertEqual(parse_offset_params({"limit": "10", "cursor": next_cursor})[0], 10)
+
+        self.assertIsNone(paginate_offset(range(5), 0, 10)[1])
+        self.assertIsNone(paginate_offset(range(11), MAX_OFFSET - 5, 10)[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
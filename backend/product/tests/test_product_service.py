@@ -1,13 +1,29 @@
 import unittest
+from product.cache.CategoryCache import category_cache
 from unittest.mock import patch, MagicMock
 from product.services.ProductService import ProductService
+from product.repositories.ProductRepository import InsufficientStockError
+from product.repositories.CategoryRepository import CategoryRepository
+from product.tests.fakes import accept_cached_categories
 from mongoengine.errors import ValidationError
+from bson import ObjectId
+from pymongo import ReturnDocument
+import datetime
 
 class TestProductService(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "accepting_products", side_effect=accept_cached_categories)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     # Test case for creating a product with a brand
     @patch("product.models.CategoryModel.ProductCategory.objects")
     def test_create_product_with_brand(self, mock_category_objects):
-        mock_category = MagicMock()
+        mock_category = MagicMock(title="Electronics", deleting=False)
         mock_category_objects.filter.return_value.first.return_value = mock_category
 
         with patch("product.repositories.ProductRepository.Product") as mock_product_class:
@@ -27,6 +43,7 @@ class TestProductService(unittest.TestCase):
                 name="Phone",
                 description="A smart phone",
                 category=mock_category,
+                category_title="Electronics",
                 price=1000,
                 brand="BrandX",
                 quantity=10,
@@ -35,7 +52,7 @@ class TestProductService(unittest.TestCase):
 
     @patch("product.models.CategoryModel.ProductCategory.objects") 
     def test_create_product_without_brand_should_fail(self, mock_category_objects):
-        mock_category = MagicMock()
+        mock_category = MagicMock(title="Electronics", deleting=False)
         mock_category_objects.filter.return_value.first.return_value = mock_category
         with patch("product.repositories.ProductRepository.Product") as mock_product_class:
             mock_product_instance = MagicMock()
@@ -72,7 +89,7 @@ class TestProductService(unittest.TestCase):
     def test_get_product_by_id(self, mock_product_objects):
         mock_product = MagicMock()
         mock_product.id = "238329"
-        mock_product_objects.filter.return_value.first.return_value = mock_product
+        mock_product_objects.filter.return_value.no_dereference.return_value.first.return_value = mock_product
 
         result = ProductService.get_product("238329")
         self.assertEqual(result.id, "238329")
@@ -82,13 +99,46 @@ class TestProductService(unittest.TestCase):
     def test_list_products(self, mock_product_model):
         mock_product_1 = MagicMock()
         mock_product_2 = MagicMock()
-        mock_product_model.objects.all.return_value = [mock_product_1, mock_product_2]
+        mock_product_model.objects.all.return_value.no_dereference.return_value = [mock_product_1, mock_product_2]
 
         products = ProductService.list_products()
 
         mock_product_model.objects.all.assert_called_once()
         self.assertEqual(products, [mock_product_1, mock_product_2])
 
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    def test_get_category_map_uses_single_query(self, mock_category_model):
+        categories = [MagicMock(id=f"cat{i}", title=f"Category {i}") for i in range(3)]
+        products = [MagicMock(category=MagicMock(id=f"cat{i % 3}"), category_title=None) for i in range(50)]
+        products += [{"_id": i, "category": f"cat{i % 3}"} for i in range(50)]
+        mock_category_model.objects.return_value = categories
+
+        result = ProductService.get_category_map(products)
+
+        mock_category_model.objects.assert_called_once()
+        _, kwargs = mock_category_model.objects.call_args
+        self.assertCountEqual(kwargs["id__in"], ["cat0", "cat1", "cat2"])
+        self.assertEqual(result, {c.id: c.title for c in categories})
+
+        # A second page referencing the same categories is served from the category cache
+        self.assertEqual(ProductService.get_category_map(products), result)
+        mock_category_model.objects.assert_called_once()
+
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    def test_get_category_map_skips_snapshotted_products(self, mock_category_model):
+        products = [
+            MagicMock(category=MagicMock(id="cat1"), category_title="Electronics"),
+            {"_id": 1, "category": "cat1", "category_title": "Electronics"},
+        ]
+
+        self.assertEqual(ProductService.get_category_map(products), {})
+        mock_category_model.objects.assert_not_called()
+
+    @patch("product.repositories.ProductRepository.ProductCategory")
+    def test_get_category_map_without_products_skips_query(self, mock_category_model):
+        self.assertEqual(ProductService.get_category_map([]), {})
+        mock_category_model.objects.assert_not_called()
+
     @patch("product.repositories.ProductRepository.Product")
     @patch("product.repositories.ProductRepository.ProductCategory")
     def test_get_products_by_category(self, mock_category_class, mock_product_class):
@@ -119,16 +169,18 @@ class TestProductService(unittest.TestCase):
         mock_category_class.objects.filter.assert_called_once_with(title=category_title)
 
     @patch("product.repositories.ProductRepository.ProductCategory")
-    @patch("product.repositories.ProductRepository.Product")
-    def test_update_product_success(self, mock_product_model, mock_category_model):
-        mock_product = MagicMock()
-        mock_product_model.objects.filter.return_value.first.return_value = mock_product
-
-        mock_category = MagicMock()
-        mock_category_model.objects.filter.return_value.first.return_value = mock_category
+    @patch("product.repositories.ProductRepository.Product._get_collection")
+    def test_update_product_success(self, mock_get_collection, mock_category_model):
+        product_id, category_id = ObjectId(), ObjectId()
+        mock_collection = mock_get_collection.return_value
+        mock_collection.find_one_and_update.return_value = {
+            "_id": product_id, "name": "Updated Name", "category": category_id,
+            "price": 999.0, "brand": "Updated Brand", "quantity": 50,
+        }
+        mock_category_model.objects.return_value = [MagicMock(id=category_id, title="Updated Category", deleting=False)]
 
         result = ProductService.update_product(
-            product_id="123",
+            product_id=str(product_id),
             name="Updated Name",
             description="Updated Description",
             category_title="Updated Category",
@@ -136,56 +188,210 @@ class TestProductService(unittest.TestCase):
             brand="Updated Brand",
             quantity=50
         )
-        self.assertEqual(result, mock_product)
-        self.assertEqual(mock_product.name, "Updated Name")
-        self.assertEqual(mock_product.description, "Updated Description")
-        self.assertEqual(mock_product.category, mock_category)
-        self.assertEqual(mock_product.price, 999)
-        self.assertEqual(mock_product.brand, "Updated Brand")
-        self.assertEqual(mock_product.quantity, 50)
-        mock_product.save.assert_called_once()
 
-    @patch("product.repositories.ProductRepository.Product")
-    def test_update_product_not_found(self, mock_product_model):
-        mock_product_model.objects.filter.return_value.first.return_value = None
+        mock_collection.find_one_and_update.assert_called_once()
+        query, update = mock_collection.find_one_and_update.call_args.args
+        self.assertEqual(query, {"_id": product_id})
+        changes = update["$set"]
+        self.assertIsInstance(changes.pop("updated_at"), datetime.datetime)
+        self.assertEqual(changes, {
+            "name": "Updated Name",
+            "description": "Updated Description",
+            "category": category_id,
+            "category_title": "Updated Category",
+            "price": 999.0,
+            "brand": "Updated Brand",
+            "quantity": 50,
+        })
+        self.assertEqual(mock_collection.find_one_and_update.call_args.kwargs["return_document"], ReturnDocument.BEFORE)
+        self.assertEqual(result.id, product_id)
+        self.assertEqual(result.name, "Updated Name")
+        mock_collection.find_one.assert_not_called()
+
+    @patch("product.repositories.ProductRepository.Product._get_collection")
+    def test_update_product_sets_only_changed_fields(self, mock_get_collection):
+        product_id = ObjectId()
+        mock_collection = mock_get_collection.return_value
+        mock_collection.find_one_and_update.return_value = {"_id": product_id, "name": "Phone", "quantity": 0}
+
+        ProductService.update_product(product_id=str(product_id), quantity=0)
+
+        _, update = mock_collection.find_one_and_update.call_args.args
+        self.assertEqual(set(update["$set"]), {"quantity", "updated_at"})
+
+    @patch("product.repositories.ProductRepository.Product._get_collection")
+    def test_update_product_not_found(self, mock_get_collection):
+        mock_get_collection.return_value.find_one_and_update.return_value = None
 
         with self.assertRaises(ValueError) as context:
-            ProductService.update_product(product_id="999")
+            ProductService.update_product(product_id=str(ObjectId()))
+        self.assertEqual(str(context.exception), "Product not found.")
 
+        with self.assertRaises(ValueError) as context:
+            ProductService.update_product(product_id="999")
         self.assertEqual(str(context.exception), "Product not found.")
 
     @patch("product.repositories.ProductRepository.ProductCategory")
-    @patch("product.repositories.ProductRepository.Product")
-    def test_update_product_category_not_found(self, mock_product_model, mock_category_model):
-        mock_product = MagicMock()
-        mock_product_model.objects.filter.return_value.first.return_value = mock_product
-
-        mock_category_model.objects.filter.return_value.first.return_value = None
+    @patch("product.repositories.ProductRepository.Product._get_collection")
+    def test_update_product_category_not_found(self, mock_get_collection, mock_category_model):
+        mock_category_model.objects.return_value = []
 
         with self.assertRaises(ValueError) as context:
-            ProductService.update_product(product_id="123", category_title="Nonexistent Category")
+            ProductService.update_product(product_id=str(ObjectId()), category_title="Nonexistent Category")
 
         self.assertEqual(str(context.exception), "Category not found.")
+        mock_get_collection.return_value.find_one_and_update.assert_not_called()
 
-    @patch("product.models.ProductModel.Product.objects")
-    def test_delete_product_success(self, mock_product_objects):
-        mock_product = MagicMock()
-        mock_product_objects.filter.return_value.first.return_value = mock_product
+    @patch("product.repositories.ProductRepository.Product._get_collection")
+    def test_delete_product_success(self, mock_get_collection):
+        product_id, category_id = ObjectId(), ObjectId()
+        mock_get_collection.return_value.find_one_and_delete.return_value = {"_id": product_id, "category": category_id, "quantity": 3}
 
-        result = ProductService.delete_product("123")
+        result = ProductService.delete_product(str(product_id))
 
-        mock_product_objects.filter.assert_called_once_with(id="123")
-        mock_product.delete.assert_called_once()
+        mock_get_collection.return_value.find_one_and_delete.assert_called_once_with(
+            {"_id": product_id}, projection={"category": 1, "quantity": 1},
+        )
+        self.mock_adjust_counters.assert_called_once_with({category_id: (-1, -3)})
         self.assertTrue(result)
 
-    @patch("product.models.ProductModel.Product.objects")
-    def test_delete_product_not_found(self, mock_product_objects):
-        mock_product_objects.filter.return_value.first.return_value = None
+    @patch("product.repositories.ProductRepository.Product._get_collection")
+    def test_delete_product_not_found(self, mock_get_collection):
+        # Also what the loser of two concurrent deletes sees: the counters are left alone
+        mock_get_collection.return_value.find_one_and_delete.return_value = None
 
+        with self.assertRaises(ValueError) as context:
+            ProductService.delete_product(str(ObjectId()))
+
+        self.assertEqual(str(context.exception), "Product not found.")
+        self.mock_adjust_counters.assert_not_called()
+
+    def test_delete_product_invalid_id(self):
         with self.assertRaises(ValueError) as context:
             ProductService.delete_product("123")
+        self.assertEqual(str(context.exception), "Invalid product id.")
+
+
+class TestProductBulkUpdate(unittest.TestCase):
+    def setUp(self):
+        category_cache.clear()
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "accepting_products", side_effect=accept_cached_categories)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("product.repositories.ProductRepository.Product._get_collection")
+        self.mock_collection = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = patch("product.repositories.ProductRepository.ProductCategory")
+        self.mock_category_model = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bulk_update_sends_one_bulk_write_per_batch(self):
+        ids = [ObjectId() for _ in range(3)]
+        self.mock_collection.bulk_write.side_effect = [
+            MagicMock(matched_count=2, modified_count=2),
+            MagicMock(matched_count=1, modified_count=0),
+        ]
+
+        report = ProductService.bulk_update_products(
+            [{"id": str(i), "changes": {"price": 10, "quantity": 5}} for i in ids], batch_size=2
+        )
 
-        mock_product_objects.filter.assert_called_once_with(id="123")
+        self.assertEqual(report, {"matched": 3, "modified": 2, "failures": []})
+        self.assertEqual(self.mock_collection.bulk_write.call_count, 2)
+        operations = self.mock_collection.bulk_write.call_args_list[0].args[0]
+        self.assertEqual(operations[0]._filter, {"_id": ids[0]})
+        update = operations[0]._doc["$set"]
+        self.assertEqual((update["price"], update["quantity"]), (10.0, 5))
+        self.assertIn("updated_at", update)
+        self.mock_category_model.objects.assert_not_called()
+
+    def test_bulk_update_reports_failures_per_id(self):
+        category_id, found, missing = ObjectId(), ObjectId(), ObjectId()
+        self.mock_category_model.objects.return_value = [MagicMock(id=category_id, title="Kitchen", deleting=False)]
+        self.mock_collection.bulk_write.return_value = MagicMock(matched_count=1, modified_count=1)
+        self.mock_collection.find.return_value = [{"_id": found}]
+
+        report = ProductService.bulk_update_products([
+            {"id": str(found), "changes": {"category_title": "Kitchen"}},
+            {"id": str(missing), "changes": {"name": "Mixer"}},
+            {"id": "not-an-id", "changes": {"price": 1}},
+            {"id": str(found), "changes": {"price": "free"}},
+            {"id": str(found), "changes": {"category_title": "Unknown"}},
+            {"id": str(found), "changes": {"owner": "me"}},
+        ])
+
+        self.assertEqual((report["matched"], report["modified"]), (1, 1))
+        errors = [(f["id"], f["error"]) for f in report["failures"]]
+        self.assertIn(("not-an-id", "Invalid product id."), errors)
+        self.assertIn((str(found), "Category not found."), errors)
+        self.assertIn((str(found), "Unknown field: owner."), errors)
+        self.assertIn((str(missing), "Product not found."), errors)
+        self.assertTrue(any(e.startswith("price:") for _, e in errors))
+        operations = self.mock_collection.bulk_write.call_args.args[0]
+        self.assertEqual(operations[0]._doc["$set"]["category"], category_id)
+
+
+class TestProductStock(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(CategoryRepository, "accepting_products", side_effect=accept_cached_categories)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("product.repositories.ProductRepository.Product._get_collection")
+        self.mock_collection = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.product_id = ObjectId()
+
+    def test_reserve_stock_is_a_single_conditional_inc(self):
+        self.mock_collection.find_one_and_update.return_value = {"_id": self.product_id, "quantity": 7}
+
+        result = ProductService.reserve_stock(str(self.product_id), 3)
+
+        self.assertEqual(result, 7)
+        query, update = self.mock_collection.find_one_and_update.call_args.args
+        self.assertEqual(query, {"_id": self.product_id, "quantity": {"$gte": 3}})
+        self.assertEqual(update["$inc"], {"quantity": -3})
+        self.mock_collection.find_one.assert_not_called()
+        self.mock_collection.count_documents.assert_not_called()
+
+    def test_release_stock_has_no_quantity_condition(self):
+        self.mock_collection.find_one_and_update.return_value = {"_id": self.product_id, "quantity": 5}
+
+        self.assertEqual(ProductService.release_stock(str(self.product_id), 2), 5)
+        query, update = self.mock_collection.find_one_and_update.call_args.args
+        self.assertEqual(query, {"_id": self.product_id})
+        self.assertEqual(update["$inc"], {"quantity": 2})
+
+    def test_reserve_stock_insufficient(self):
+        self.mock_collection.find_one_and_update.return_value = None
+        self.mock_collection.count_documents.return_value = 1
+
+        with self.assertRaises(InsufficientStockError) as context:
+            ProductService.reserve_stock(str(self.product_id), 3)
+        self.assertEqual(str(context.exception), "Insufficient stock.")
+
+    def test_reserve_stock_product_not_found(self):
+        self.mock_collection.find_one_and_update.return_value = None
+        self.mock_collection.count_documents.return_value = 0
+
+        with self.assertRaises(ValueError) as context:
+            ProductService.reserve_stock(str(self.product_id), 3)
+        self.assertNotIsInstance(context.exception, InsufficientStockError)
         self.assertEqual(str(context.exception), "Product not found.")
+
+    def test_stock_changes_validate_quantity(self):
+        for quantity in (0, -1, "2", 1.5, True, None):
+            with self.assertRaises(ValueError):
+                ProductService.reserve_stock(str(self.product_id), quantity)
+        with self.assertRaises(ValueError):
+            ProductService.adjust_stock(str(self.product_id), "1")
+        self.mock_collection.find_one_and_update.assert_not_called()
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
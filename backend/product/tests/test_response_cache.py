@@ -0,0 +1,230 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs
+from django.conf import settings
+
+if not settings.configured:
+    # RequestFactory, HttpResponse and DRF's renderers only need Django's default settings
+    settings.configure()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from product.cache.ResponseCache import ResponseCache, cache_response, response_cache  # noqa: E402
+from product.repositories.CategoryRepository import CategoryRepository  # noqa: E402
+from product.repositories.ProductRepository import ProductRepository  # noqa: E402
+
+
+def make_request(path="/products/", query="", accept="application/json"):
+    request = MagicMock(path=path, META={"HTTP_ACCEPT": accept})
+    request.GET.lists.return_value = parse_qs(query).items()
+    return request
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingView:
+    """A view returning `response()`, counting how often it actually runs."""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        return self.response()
+
+
+def drf_response(data, status=200):
+    response = Response(data, status=status)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = "application/json"
+    response.renderer_context = {}
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_entries=2, ttl=60, clock=self.clock)
+
+    def test_etag_is_stable_for_the_same_request(self):
+        first = self.cache.etag(make_request(query="limit=2&fields=name"), ("products",))
+        second = self.cache.etag(make_request(query="fields=name&limit=2"), ("products",))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('"') and first.endswith('"'))
+
+    def test_etag_varies_with_query_and_accept(self):
+        base = self.cache.etag(make_request(query="limit=2"), ("products",))
+        self.assertNotEqual(base, self.cache.etag(make_request(query="limit=3"), ("products",)))
+        self.assertNotEqual(base, self.cache.etag(make_request(query="limit=2", accept="text/html"), ("products",)))
+
+    def test_bump_changes_etag_of_dependent_views_only(self):
+        request = make_request()
+        products = self.cache.etag(request, ("products", "categories"))
+        categories = self.cache.etag(request, ("categories",))
+
+        self.cache.bump("products")
+
+        self.assertNotEqual(products, self.cache.etag(request, ("products", "categories")))
+        self.assertEqual(categories, self.cache.etag(request, ("categories",)))
+
+    def test_etag_changes_once_the_ttl_passes(self):
+        request = make_request()
+        first = self.cache.etag(request, ("products",))
+        self.clock.now = 59
+        self.assertEqual(first, self.cache.etag(request, ("products",)))
+        self.clock.now = 60
+        self.assertNotEqual(first, self.cache.etag(request, ("products",)))
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get('"a"'))
+        self.cache.put('"a"', b"[]", "application/json")
+        self.assertEqual(self.cache.get('"a"'), (b"[]", "application/json"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put('"a"', b"a", "application/json")
+        self.cache.put('"b"', b"b", "application/json")
+        self.cache.get('"a"')
+        self.cache.put('"c"', b"c", "application/json")
+
+        self.assertIsNone(self.cache.get('"b"'))
+        self.assertIsNotNone(self.cache.get('"a"'))
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+
+class TestResponseCacheInvalidation(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(CategoryRepository, "adjust_counters")
+        self.mock_adjust_counters = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("product.repositories.ProductRepository.response_cache")
+    @patch("product.repositories.ProductRepository.Product")
+    def test_delete_bumps_products(self, mock_product, mock_cache):
+        mock_product._get_collection.return_value.find_one_and_delete.return_value = {"category": "c1", "quantity": 1}
+
+        ProductRepository.delete("66ccaa1b2f5e4a7d9c8b0001")
+
+        mock_cache.bump.assert_called_once_with("products")
+
+    @patch("product.repositories.ProductRepository.response_cache")
+    @patch("product.repositories.ProductRepository.Product")
+    def test_failed_delete_does_not_bump(self, mock_product, mock_cache):
+        mock_product._get_collection.return_value.find_one_and_delete.return_value = None
+
+        with self.assertRaises(ValueError):
+            ProductRepository.delete("66ccaa1b2f5e4a7d9c8b0001")
+
+        mock_cache.bump.assert_not_called()
+
+    @patch("product.repositories.ProductRepository.response_cache")
+    @patch("product.repositories.ProductRepository.Product")
+    def test_adjust_stock_bumps_products(self, mock_product, mock_cache):
+        mock_product._get_collection.return_value.find_one_and_update.return_value = {"quantity": 4, "category": "c1"}
+
+        ProductRepository.adjust_stock("66ccaa1b2f5e4a7d9c8b0001", -1)
+
+        mock_cache.bump.assert_called_once_with("products")
+
+    @patch("product.repositories.CategoryRepository.response_cache")
+    @patch("product.repositories.CategoryRepository.ProductCategory")
+    def test_category_create_bumps_categories(self, mock_category, mock_cache):
+        with patch.object(CategoryRepository, "get_category_by_title", return_value=None):
+            CategoryRepository.create("Garden")
+
+        mock_cache.bump.assert_called_once_with("categories")
+
+
+class TestCacheResponse(unittest.TestCase):
+    def setUp(self):
+        response_cache.clear()
+        patcher = patch.object(response_cache, "_clock", return_value=0)  # no TTL window boundary mid-test
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+        self.view = CountingView(lambda: drf_response({"results": [1, 2]}))
+        self.cached = cache_response("products")(self.view)
+
+    def test_second_get_is_served_from_the_cache(self):
+        first = self.cached(self.factory.get("/products/", {"limit": "5"}))
+        second = self.cached(self.factory.get("/products/", {"limit": "5"}))
+
+        self.assertEqual(self.view.calls, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.content, b'{"results":[1,2]}')
+        self.assertEqual(second["Content-Type"], "application/json")
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_query_parameters_are_part_of_the_key(self):
+        self.cached(self.factory.get("/products/", {"limit": "5"}))
+        self.cached(self.factory.get("/products/", {"limit": "6"}))
+
+        self.assertEqual(self.view.calls, 2)
+
+    def test_matching_if_none_match_is_a_304_without_the_view(self):
+        etag = self.cached(self.factory.get("/products/"))["ETag"]
+
+        response = self.cached(self.factory.get("/products/", HTTP_IF_NONE_MATCH=etag))
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.view.calls, 1)
+
+    def test_a_write_changes_the_etag(self):
+        etag = self.cached(self.factory.get("/products/"))["ETag"]
+        response_cache.bump("products")
+
+        response = self.cached(self.factory.get("/products/", HTTP_IF_NONE_MATCH=etag))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.view.calls, 2)
+
+    def test_only_200_responses_are_stored(self):
+        view = CountingView(lambda: drf_response({"error": "Category not found."}, status=404))
+        cached = cache_response("products")(view)
+
+        responses = [cached(self.factory.get("/categories/x/products/")) for _ in range(2)]
+
+        self.assertEqual(view.calls, 2)
+        self.assertEqual([response.status_code for response in responses], [404, 404])
+        self.assertNotIn("ETag", responses[0])
+
+    def test_writes_are_not_cached(self):
+        view = CountingView(lambda: HttpResponse("created", status=200))
+        cached = cache_response("products")(view)
+
+        for _ in range(2):
+            response = cached(self.factory.post("/products/"))
+
+        self.assertEqual(view.calls, 2)
+        self.assertNotIn("ETag", response)
+
+    def test_async_view(self):
+        calls = []
+
+        async def view(request):
+            calls.append(request)
+            return HttpResponse(b"[]", content_type="application/json")
+
+        cached = cache_response("products")(view)
+        first = asyncio.run(cached(self.factory.get("/async/products/")))
+        second = asyncio.run(cached(self.factory.get("/async/products/")))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.content, b"[]")
+        self.assertEqual(second["ETag"], first["ETag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
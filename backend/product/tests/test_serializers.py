@@ -0,0 +1,65 @@
+import unittest
+import datetime
+from unittest.mock import MagicMock
+from bson import ObjectId
+from product.serializers import parse_fields, product_to_dict, raw_product_to_dict, to_json_value
+
+
+class TestSparseFieldsets(unittest.TestCase):
+    def test_parse_fields_defaults(self):
+        self.assertEqual(parse_fields(None, ("id", "name")), ["id", "name"])
+        self.assertEqual(parse_fields("", ("id", "name")), ["id", "name"])
+
+    def test_parse_fields_dedupes_and_keeps_order(self):
+        self.assertEqual(parse_fields("price, id,price", ("id",)), ["price", "id"])
+
+    def test_parse_fields_rejects_unknown(self):
+        with self.assertRaises(ValueError) as context:
+            parse_fields("id,secret", ("id",))
+        self.assertEqual(str(context.exception), "Unknown field(s): secret.")
+
+    def test_product_to_dict_renders_only_requested_fields(self):
+        product = MagicMock(id="p1", price=10.0, category=MagicMock(id="cat1"))
+
+        data = product_to_dict(product, ["id", "price", "category"], {"cat1": "Electronics"})
+
+        self.assertEqual(data, {"id": "p1", "price": 10.0, "category": "Electronics"})
+
+    def test_category_prefers_title_snapshot(self):
+        product = MagicMock(id="p1", category=MagicMock(id="cat1"), category_title="Audio")
+        doc = {"_id": "p2", "category": "cat1", "category_title": "Audio"}
+
+        self.assertEqual(product_to_dict(product, ["category"], {"cat1": "Electronics"}), {"category": "Audio"})
+        self.assertEqual(raw_product_to_dict(doc, ["category"], {}), {"category": "Audio"})
+
+
+class TestRawDocuments(unittest.TestCase):
+    def test_to_json_value(self):
+        oid = ObjectId()
+        when = datetime.datetime(2025, 1, 2, 3, 4, 5)
+        self.assertEqual(to_json_value(oid), str(oid))
+        self.assertEqual(to_json_value(when), "2025-01-02T03:04:05")
+        self.assertEqual(to_json_value(9.5), 9.5)
+
+    def test_raw_product_to_dict(self):
+        product_id, category_id = ObjectId(), ObjectId()
+        doc = {
+            "_id": product_id,
+            "name": "Mixer",
+            "category": category_id,
+            "created_at": datetime.datetime(2025, 1, 2),
+        }
+
+        data = raw_product_to_dict(doc, ["id", "name", "category", "created_at", "brand"], {category_id: "Kitchen"})
+
+        self.assertEqual(data, {
+            "id": str(product_id),
+            "name": "Mixer",
+            "category": "Kitchen",
+            "created_at": "2025-01-02T00:00:00",
+            "brand": None,
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
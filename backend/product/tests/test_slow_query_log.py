@@ -0,0 +1,103 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+from product.management.commands.slow_queries import Command
+from product.monitoring.SlowQueryLog import SlowQueryLog, query_shape, summarize_plan, track_request
+
+
+def run(log, command, millis, reply=None, request_id=1):
+    name = next(iter(command))
+    log.started(MagicMock(command_name=name, command=command, database_name="db", connection_id=("h", 1), request_id=request_id))
+    log.succeeded(MagicMock(command_name=name, command=command, duration_micros=millis * 1000,
+                            reply=reply or {"cursor": {"firstBatch": [{}, {}]}}, connection_id=("h", 1), request_id=request_id))
+
+
+class TestSlowQueryLog(unittest.TestCase):
+    def setUp(self):
+        self.log = SlowQueryLog(threshold_ms=50, max_entries=2)
+
+    def test_records_only_commands_over_the_threshold(self):
+        run(self.log, {"find": "product", "filter": {"brand": "Acme"}}, 10)
+        run(self.log, {"find": "product", "filter": {"brand": "Acme"}, "sort": {"_id": 1}, "limit": 50}, 80)
+
+        [entry] = self.log.entries()
+        self.assertEqual(entry["collection"], "product")
+        self.assertEqual(entry["duration_ms"], 80)
+        self.assertEqual(entry["docs_returned"], 2)
+        self.assertEqual(entry["shape"], {"filter": {"brand": "?"}, "sort": {"_id": 1}, "limit": 50})
+        self.assertIsNone(entry["view"])
+        self.assertIsNone(entry["plan"])
+        self.assertEqual(self.log._in_flight, {})
+
+    def test_ring_buffer_keeps_the_newest_entries(self):
+        for request_id, collection in enumerate(["a", "b", "c"]):
+            run(self.log, {"count": collection, "query": {}}, 60, reply={"n": 5}, request_id=request_id)
+
+        self.assertEqual([entry["collection"] for entry in self.log.entries()], ["c", "b"])
+        self.assertEqual(self.log.entries(1)[0]["docs_returned"], 5)
+
+        self.log.clear()
+        self.assertEqual(self.log.entries(), [])
+
+    def test_entries_name_the_originating_view(self):
+        request = MagicMock(resolver_match=MagicMock(url_name="products-by-category"))
+        with track_request(request):
+            run(self.log, {"find": "product", "filter": {}}, 60)
+
+        self.assertEqual(self.log.entries()[0]["view"], "products-by-category")
+
+    @patch("product.monitoring.SlowQueryLog.get_connection")
+    @patch("product.jobs.submit", side_effect=lambda fn, *args: fn(*args))
+    def test_sampled_reads_are_explained(self, mock_submit, mock_get_connection):
+        command = mock_get_connection.return_value.get_database.return_value.command
+        command.return_value = {"queryPlanner": {"winningPlan": {
+            "stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "keyPattern": {"category": 1}}},
+        }}}
+        self.log.configure(threshold_ms=50, explain_sample_rate=1.0)
+
+        run(self.log, {"find": "product", "filter": {"category": "x"}, "lsid": {"id": 1}, "$db": "db"}, 60)
+
+        explained = command.call_args[0][0]
+        self.assertEqual(explained["explain"], {"find": "product", "filter": {"category": "x"}})
+        self.assertEqual(self.log.entries()[0]["plan"]["summary"], "LIMIT > FETCH > IXSCAN {'category': 1}")
+
+    def test_query_shape_blanks_values(self):
+        shape = query_shape("aggregate", {"aggregate": "product", "pipeline": [
+            {"$match": {"category": {"$in": ["a", "b", "c"]}, "$or": [{"price": {"$gte": 5}}]}},
+            {"$limit": 10},
+        ]})
+
+        self.assertEqual(shape, {"pipeline": [
+            {"$match": {"category": {"$in": ["?"]}, "$or": [{"price": {"$gte": "?"}}]}},
+            {"$limit": "?"},
+        ]})
+
+    def test_summarize_aggregate_plan(self):
+        plan = summarize_plan({"stages": [
+            {"$cursor": {"queryPlanner": {"winningPlan": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}}}},
+            {"$group": {}},
+        ]})
+        self.assertEqual(plan["summary"], "OR (IXSCAN, COLLSCAN)")
+
+
+class TestSlowQueriesCommand(unittest.TestCase):
+    @patch("product.management.commands.slow_queries.urlopen")
+    def test_prints_entries_from_the_server(self, mock_urlopen):
+        body = {"threshold_ms": 100, "max_entries": 200, "entries": [{
+            "at": "2026-01-01T00:00:00+00:00", "command": "find", "collection": "product", "duration_ms": 250.0,
+            "docs_returned": 50, "shape": {"filter": {"category": "?"}}, "view": "products-by-category",
+            "plan": {"summary": "COLLSCAN"},
+        }]}
+        mock_urlopen.return_value.__enter__.return_value.read.return_value = json.dumps(body).encode()
+        out = io.StringIO()
+
+        Command(stdout=out).handle(url="http://server/debug/slow-queries/", limit=5, json=False, clear=False)
+
+        self.assertEqual(mock_urlopen.call_args[0][0].full_url, "http://server/debug/slow-queries/?limit=5")
+        self.assertIn("250.0 ms  find product  view=products-by-category  docs=50", out.getvalue())
+        self.assertIn("plan:  COLLSCAN", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from product.management.commands.sync_indexes import Command, index_identity
+from product.models.ProductModel import Product
+
+
+def server_index_information():
+    """Product's indexes as a mongod reports them: the text index as _fts/_ftsx, weights alphabetical."""
+    information = {"_id_": {"key": [("_id", 1)]}}
+    for spec in Product.list_indexes():
+        if spec[0][1] == "text":
+            information["product_text"] = {
+                "key": [("_fts", "text"), ("_ftsx", 1)],
+                "weights": {"brand": 5, "description": 1, "name": 10},
+            }
+        elif spec != [("_id", 1)]:
+            information["_".join(f"{field}_{direction}" for field, direction in spec)] = {"key": spec}
+    return information
+
+
+class TestSyncIndexes(unittest.TestCase):
+    def setUp(self):
+        self.collection = MagicMock()
+        self.collection.name = "products"
+        self.collection.index_information.return_value = server_index_information()
+        self.collection.aggregate.return_value = []
+        self.document = MagicMock(list_indexes=Product.list_indexes, _get_collection=lambda: self.collection)
+
+    def run_command(self, **options):
+        out = StringIO()
+        with patch("product.management.commands.sync_indexes.DOCUMENTS", (self.document,)):
+            Command(stdout=out).handle(**{"dry_run": False, "drop_extra": False, **options})
+        return out.getvalue()
+
+    def test_text_index_in_server_order_is_not_missing(self):
+        output = self.run_command()
+
+        self.assertNotIn("missing", output)
+        self.assertNotIn("extra", output)
+        self.document.ensure_indexes.assert_not_called()
+
+    def test_missing_and_extra_indexes(self):
+        information = self.collection.index_information.return_value
+        del information["brand_1"]
+        information["legacy"] = {"key": [("sku", 1)]}
+
+        output = self.run_command(drop_extra=True)
+
+        self.assertIn("missing  brand:1", output)
+        self.document.ensure_indexes.assert_called_once()
+        self.collection.drop_index.assert_called_once_with("legacy")
+
+    def test_text_fields_are_compared_as_a_set(self):
+        declared = [("name", "text"), ("brand", "text")]
+        self.assertEqual(index_identity(declared), index_identity([("brand", "text"), ("name", "text")]))
+        self.assertNotEqual(index_identity(declared), index_identity([("name", "text")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,52 @@
 from django.urls import path
-from .views.ProductViews import ProductListView, ProductCreateView, ProductDetailView, ProductsByCategoryView
-from .views.CategoryViews import CategoryListView, CategoryCreateView, ProductsByCategoryView, AddProductToCategoryView
+from .views.ProductViews import ProductListView, ProductSearchView, ProductCreateView, ProductImportView, ProductExportView, ProductBulkUpdateView, ProductDetailView, ProductStockView, ProductsByCategoryView
+from .views.CategoryViews import CategoryListView, CategoryStatsView, CategoryCreateView, CategoryDetailView, CategoryDeleteJobView, ProductsByCategoryView, AddProductToCategoryView
+from .views.AsyncProductViews import AsyncProductListView, AsyncProductDetailView
+from .views.AsyncCategoryViews import AsyncCategoryListView, AsyncProductsByCategoryView
+from .views.DebugViews import CacheStatsView, PoolStatsView, SlowQueryLogView, MetricsView
+from .cache.ResponseCache import cache_response
+from .conf import get_setting
 from .web_views import product_list_view
 
 urlpatterns = [
     path('', product_list_view, name='product-list-view'),
     # Product Routes
-    path('products/', ProductListView.as_view(), name='product-list'),
+    path('products/', cache_response('products', 'categories')(ProductListView.as_view()), name='product-list'),
+    path('products/search/', cache_response('products', 'categories')(ProductSearchView.as_view()), name='product-search'),
     path('products/create/', ProductCreateView.as_view(), name='product-create'),
+    path('products/import/', ProductImportView.as_view(), name='product-import'),
+    path('products/export/', ProductExportView.as_view(), name='product-export'),
+    path('products/bulk-update/', ProductBulkUpdateView.as_view(), name='product-bulk-update'),
     path('products/<str:product_id>/', ProductDetailView.as_view(), name='product-detail'),
-    path('categories/<str:category_title>/products/', ProductsByCategoryView.as_view(), name='products-by-category'),
+    path('products/<str:product_id>/stock/reserve/', ProductStockView.as_view(stock_action='reserve'), name='product-stock-reserve'),
+    path('products/<str:product_id>/stock/release/', ProductStockView.as_view(stock_action='release'), name='product-stock-release'),
+    path('products/<str:product_id>/stock/adjust/', ProductStockView.as_view(stock_action='adjust'), name='product-stock-adjust'),
+    path('categories/<str:category_title>/products/', cache_response('products', 'categories')(ProductsByCategoryView.as_view()), name='products-by-category'),
 
     # Category Routes
-    path('categories/', CategoryListView.as_view(), name='category-list'),
+    path('categories/', cache_response('categories')(CategoryListView.as_view()), name='category-list'),
+    path('categories/stats/', cache_response('products', 'categories')(CategoryStatsView.as_view()), name='category-stats'),
     path('categories/create/', CategoryCreateView.as_view(), name='category-create'),
     path('categories/<str:title>/products/', ProductsByCategoryView.as_view(), name='products-by-category'),
     path('categories/add-product/', AddProductToCategoryView.as_view(), name='add-product-to-category'),
+    path('categories/delete-jobs/<str:job_id>/', CategoryDeleteJobView.as_view(), name='category-delete-job'),
+    path('categories/<str:title>/', CategoryDetailView.as_view(), name='category-detail'),
+
+    # Async Routes (non-blocking reads for ASGI deployments)
+    path('async/products/', cache_response('products', 'categories')(AsyncProductListView.as_view()), name='async-product-list'),
+    path('async/products/<str:product_id>/', AsyncProductDetailView.as_view(), name='async-product-detail'),
+    path('async/categories/', cache_response('categories')(AsyncCategoryListView.as_view()), name='async-category-list'),
+    path('async/categories/<str:category_title>/products/', cache_response('products', 'categories')(AsyncProductsByCategoryView.as_view()), name='async-products-by-category'),
+
+    # Prometheus scrape target
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
+
+# Debug Routes: cache, pool and slow query internals (the slow query log can be emptied),
+# unauthenticated, so only routed with DEBUG_ENDPOINTS on
+if get_setting("DEBUG_ENDPOINTS", False):
+    urlpatterns += [
+        path('debug/caches/', CacheStatsView.as_view(), name='debug-caches'),
+        path('debug/pools/', PoolStatsView.as_view(), name='debug-pools'),
+        path('debug/slow-queries/', SlowQueryLogView.as_view(), name='debug-slow-queries'),
+    ]
@@ -0,0 +1,32 @@
+from django.http import JsonResponse
+from django.views import View
+from ..services.AsyncProductCategoryService import AsyncProductCategoryService
+from ..services.AsyncProductService import AsyncProductService
+from ..pagination import parse_page_params, paginate
+from ..serializers import parse_fields, raw_product_to_dict, raw_category_to_dict
+from .CategoryViews import ProductsByCategoryView
+
+class AsyncCategoryListView(View):
+    """Async twin of CategoryListView."""
+    async def get(self, request):
+        categories = await AsyncProductCategoryService.list_categories()
+        return JsonResponse([raw_category_to_dict(cat) for cat in categories], safe=False)
+
+class AsyncProductsByCategoryView(View):
+    """Async twin of ProductsByCategoryView."""
+    default_fields = ProductsByCategoryView.default_fields
+
+    async def get(self, request, category_title):
+        try:
+            after, limit = parse_page_params(request.GET)
+            fields = parse_fields(request.GET.get("fields"), self.default_fields)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        try:
+            products = await AsyncProductService.get_products_by_category(category_title, after, limit, fields)
+        except ValueError:
+            return JsonResponse({"error": "Category not found"}, status=404)
+        products, next_cursor = paginate(products, limit)
+        categories = {products[0].get("category"): category_title} if products else {}
+        data = [raw_product_to_dict(p, fields, categories) for p in products]
+        return JsonResponse({"results": data, "next": next_cursor})
@@ -0,0 +1,40 @@
+from django.http import JsonResponse
+from django.views import View
+from ..services.AsyncProductService import AsyncProductService
+from ..serializers import parse_fields, raw_product_to_dict
+from ..pagination import parse_page_params, parse_sort, paginate
+from ..filters import parse_product_filters
+from .ProductViews import ProductListView, ProductDetailView
+
+class AsyncProductListView(View):
+    """Async twin of ProductListView for ASGI deployments; same parameters and response."""
+    default_fields = ProductListView.default_fields
+
+    async def get(self, request):
+        try:
+            sort = parse_sort(request.GET.get("sort"))
+            after, limit = parse_page_params(request.GET, sort)
+            fields = parse_fields(request.GET.get("fields"), self.default_fields)
+            filters = parse_product_filters(request.GET)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        products = await AsyncProductService.list_products(after, limit, fields, filters, sort)
+        products, next_cursor = paginate(products, limit, sort)
+        categories = await AsyncProductService.get_category_map(products) if "category" in fields else {}
+        data = [raw_product_to_dict(p, fields, categories) for p in products]
+        return JsonResponse({"results": data, "next": next_cursor})
+
+class AsyncProductDetailView(View):
+    """Async twin of ProductDetailView's GET."""
+    default_fields = ProductDetailView.default_fields
+
+    async def get(self, request, product_id):
+        try:
+            fields = parse_fields(request.GET.get("fields"), self.default_fields)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        product = await AsyncProductService.get_product(product_id, fields)
+        if not product:
+            return JsonResponse({"error": "Product not found"}, status=404)
+        categories = await AsyncProductService.get_category_map([product]) if "category" in fields else {}
+        return JsonResponse(raw_product_to_dict(product, fields, categories))
@@ -2,16 +2,30 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from ..services.ProductCategoryService import ProductCategoryService
+from ..services.ProductService import ProductService
+from ..pagination import parse_page_params, paginate
+from ..serializers import parse_fields, raw_product_to_dict, raw_category_to_dict, delete_job_to_dict
 from mongoengine.queryset.visitor import Q
 from django.http import JsonResponse
+from django.urls import reverse
 from django.views import View
 from product.models.ProductModel import Product
 from product.models.CategoryModel import ProductCategory  # Import your models
 
 class CategoryListView(APIView):
     def get(self, request):
-        categories = ProductCategoryService.list_categories()
-        data = [{"id": str(cat.id), "title": cat.title, "description": cat.description} for cat in categories]
+        categories = ProductCategoryService.list_categories(raw=True)
+        data = [raw_category_to_dict(cat) for cat in categories]
+        return Response(data, status=status.HTTP_200_OK)
+
+class CategoryStatsView(APIView):
+    """Per-category product count, stock, inventory value and min/avg/max price."""
+    def get(self, request):
+        stats = ProductCategoryService.get_category_stats()
+        data = [
+            {"id": str(row["_id"]), "title": row["title"], **{k: v for k, v in row.items() if k not in ("_id", "title")}}
+            for row in stats
+        ]
         return Response(data, status=status.HTTP_200_OK)
 
 class CategoryCreateView(APIView):
@@ -24,34 +38,50 @@ class CategoryCreateView(APIView):
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class ProductsByCategoryView(View):
-    def get(self, request, category_title):
+class CategoryDetailView(APIView):
+    def delete(self, request, title):
+        """Delete a category and its products in the background; poll the returned job for progress."""
+        try:
+            job = ProductCategoryService.delete_category_in_background(title)
+        except ValueError as e:
+            code = status.HTTP_404_NOT_FOUND if str(e) == "Category not found." else status.HTTP_409_CONFLICT
+            return Response({"error": str(e)}, status=code)
+        return Response(
+            {"message": "Category deletion started", "job": delete_job_to_dict(job)},
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("category-delete-job", args=[str(job.id)])},
+        )
+
+class CategoryDeleteJobView(APIView):
+    def get(self, request, job_id):
         try:
-            # Find the category by title
-            category = ProductCategory.objects.filter(title=category_title).first()
-            
-            if not category:
-                return JsonResponse({"error": "Category not found"}, status=404)
+            job = ProductCategoryService.get_delete_job(job_id)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(delete_job_to_dict(job), status=status.HTTP_200_OK)
 
-            # Find products belonging to this category
-            products = Product.objects.filter(category=category)
+class ProductsByCategoryView(View):
+    default_fields = ("id", "name", "brand", "price", "quantity")
 
-            # Convert query result to JSON response
-            data = [
-                {
-                    "id": str(p.id),
-                    "name": p.name,
-                    "brand": p.brand,
-                    "price": p.price,
-                    "quantity": p.quantity
-                }
-                for p in products
-            ]
+    def get(self, request, category_title):
+        try:
+            after, limit = parse_page_params(request.GET)
+            fields = parse_fields(request.GET.get("fields"), self.default_fields)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        try:
+            products, next_cursor = paginate(
+                ProductService.get_products_by_category(category_title, after, limit, fields, raw=True), limit
+            )
+        except ValueError:
+            return JsonResponse({"error": "Category not found"}, status=404)
 
-            return JsonResponse(data, safe=False)
+        # Raw documents with only the requested fields, rendered without hydration; every product is in
+        # the requested category, so its title stands in for a missing `category_title` snapshot
+        categories = {products[0].get("category"): category_title} if products else {}
+        data = [raw_product_to_dict(p, fields, categories) for p in products]
 
-        except Exception as e:
-            return JsonResponse({"error": str(e)}, status=500)
+        return JsonResponse({"results": data, "next": next_cursor})
 
 
 class AddProductToCategoryView(APIView):
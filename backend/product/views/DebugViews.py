@@ -0,0 +1,54 @@
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from ..cache.CategoryCache import category_cache
+from ..cache.ResponseCache import response_cache
+from ..conf import get_setting
+from ..monitoring.Metrics import registry
+from ..monitoring.PoolMonitor import pool_monitors
+from ..monitoring.SlowQueryLog import slow_query_log
+
+
+class CacheStatsView(APIView):
+    """API endpoint exposing hit/miss counters of the in-process caches."""
+    def get(self, request):
+        data = {"category_cache": category_cache.stats(), "response_cache": response_cache.stats()}
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class PoolStatsView(APIView):
+    """API endpoint exposing connection pool usage and checkout waits per Mongo client."""
+    def get(self, request):
+        data = {
+            "options": get_setting("MONGO_CLIENT_OPTIONS", {}),
+            "read_alias": get_setting("MONGO_READ_ALIAS", "default"),
+            "pools": {name: monitor.stats() for name, monitor in pool_monitors.items()},
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class SlowQueryLogView(APIView):
+    """API endpoint listing the slowest recent Mongo commands of this process, newest first."""
+    def get(self, request):
+        try:
+            limit = int(request.GET["limit"]) if "limit" in request.GET else None
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        data = {
+            "threshold_ms": slow_query_log.threshold_ms,
+            "max_entries": slow_query_log.max_entries,
+            "explain_sample_rate": slow_query_log.explain_sample_rate,
+            "entries": slow_query_log.entries(limit),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        slow_query_log.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class MetricsView(View):
+    """Prometheus scrape endpoint: request, Mongo command, pool and cache metrics of this process."""
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,14 +1,62 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 from ..services.ProductService import ProductService
+from ..services.ProductImportService import ProductImportService
+from ..services.ProductExportService import ProductExportService
+from ..repositories.ProductRepository import InsufficientStockError
+from ..serializers import PRODUCT_FIELDS, parse_fields, raw_product_to_dict
+from ..pagination import parse_offset_params, parse_page_params, parse_sort, paginate, paginate_offset
+from ..filters import parse_product_filters
 
 class ProductListView(APIView):
-    """API endpoint to list all products."""
+    """API endpoint to list products, one keyset page at a time.
+
+    Filters: `price_min`, `price_max`, `brand` (comma-separated), `in_stock`,
+    `category` (title) and `created_after`; `sort` is one of `name`, `price`,
+    `created_at` or `updated_at`, prefixed with `-` for descending.
+    """
+    default_fields = ("id", "name", "description", "brand", "category", "price", "quantity")
+
+    def get(self, request):
+        try:
+            sort = parse_sort(request.query_params.get("sort"))
+            after, limit = parse_page_params(request.query_params, sort)
+            fields = parse_fields(request.query_params.get("fields"), self.default_fields)
+            filters = parse_product_filters(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        products = ProductService.list_products(after, limit, fields, raw=True, filters=filters, sort=sort)
+        products, next_cursor = paginate(products, limit, sort)
+        categories = ProductService.get_category_map(products) if "category" in fields else {}
+        data = [raw_product_to_dict(p, fields, categories) for p in products]
+        return Response({"results": data, "next": next_cursor}, status=status.HTTP_200_OK)
+
+class ProductSearchView(APIView):
+    """API endpoint for full-text search over name, brand and description, best matches first.
+
+    Takes `q` plus the list endpoint's `fields`, `limit` and filters.
+    """
+    default_fields = ProductListView.default_fields
+
     def get(self, request):
-        products = ProductService.list_products()
-        data = [{"id": str(p.id), "name": p.name, "description": p.description, "brand": p.brand, "category": p.category.title, "price": p.price, "quantity": p.quantity} for p in products]
-        return Response(data, status=status.HTTP_200_OK)
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response({"error": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            offset, limit = parse_offset_params(request.query_params)
+            fields = parse_fields(request.query_params.get("fields"), self.default_fields)
+            filters = parse_product_filters(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        products = ProductService.search_products(text, offset, limit, fields, filters)
+        products, next_cursor = paginate_offset(products, offset, limit)
+        categories = ProductService.get_category_map(products) if "category" in fields else {}
+        data = [raw_product_to_dict(p, fields, categories) for p in products]
+        return Response({"results": data, "next": next_cursor}, status=status.HTTP_200_OK)
 
 class ProductCreateView(APIView):
     """API endpoint to create a product."""
@@ -29,14 +77,83 @@ class ProductCreateView(APIView):
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+class ProductImportView(APIView):
+    """API endpoint to bulk import products from a streamed NDJSON or CSV upload.
+
+    Send `Content-Type: text/csv` for CSV; anything else is read as NDJSON.
+    Rows use the same keys as product creation, including `category_title`.
+    """
+    def post(self, request):
+        max_batch_size = getattr(settings, "PRODUCT_IMPORT_MAX_BATCH_SIZE", 10000)
+        try:
+            batch_size = int(request.query_params.get("batch_size") or getattr(settings, "PRODUCT_IMPORT_BATCH_SIZE", 1000))
+        except ValueError:
+            return Response({"error": "batch_size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= batch_size <= max_batch_size:
+            return Response({"error": f"batch_size must be between 1 and {max_batch_size}."}, status=status.HTTP_400_BAD_REQUEST)
+        if request.stream is None:
+            return Response({"error": "Empty upload"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = "csv" if request.content_type.startswith("text/csv") else "ndjson"
+        report = ProductImportService.import_products(request.stream, fmt, batch_size)
+        return Response(report, status=status.HTTP_200_OK)
+
+class ProductExportView(View):
+    """API endpoint to stream the whole catalog as NDJSON (default) or CSV.
+
+    Pick CSV with `?format=csv` or `Accept: text/csv`. A plain Django view,
+    so DRF content negotiation does not reject the CSV Accept header.
+    """
+    content_types = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    def get(self, request):
+        fmt = request.GET.get("format") or ("csv" if "text/csv" in request.headers.get("Accept", "") else "ndjson")
+        if fmt not in self.content_types:
+            return JsonResponse({"error": "format must be ndjson or csv."}, status=400)
+        max_batch_size = getattr(settings, "PRODUCT_EXPORT_MAX_BATCH_SIZE", 10000)
+        try:
+            batch_size = int(request.GET.get("batch_size") or getattr(settings, "PRODUCT_EXPORT_BATCH_SIZE", 1000))
+        except ValueError:
+            return JsonResponse({"error": "batch_size must be an integer."}, status=400)
+        try:
+            fields = parse_fields(request.GET.get("fields"), PRODUCT_FIELDS)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        if not 1 <= batch_size <= max_batch_size:
+            return JsonResponse({"error": f"batch_size must be between 1 and {max_batch_size}."}, status=400)
+
+        chunks = ProductExportService.export_products(fields, fmt, batch_size)
+        response = StreamingHttpResponse(chunks, content_type=self.content_types[fmt])
+        response["Content-Disposition"] = f'attachment; filename="products.{fmt}"'
+        return response
+
+class ProductBulkUpdateView(APIView):
+    """API endpoint to patch many products at once.
+
+    Takes a list of `{"id": ..., "changes": {...}}` items; `changes` uses the
+    same keys as a product update, including `category_title`.
+    """
+    def patch(self, request):
+        if not isinstance(request.data, list):
+            return Response({"error": "Expected a list of {id, changes} items"}, status=status.HTTP_400_BAD_REQUEST)
+        batch_size = getattr(settings, "PRODUCT_BULK_UPDATE_BATCH_SIZE", 1000)
+        report = ProductService.bulk_update_products(request.data, batch_size)
+        return Response(report, status=status.HTTP_200_OK)
+
 class ProductDetailView(APIView):
     """API endpoint to retrieve, update, or delete a product."""
+    default_fields = ("id", "name", "brand", "category", "price", "quantity")
+
     def get(self, request, product_id):
-        product = ProductService.get_product(product_id)
+        try:
+            fields = parse_fields(request.query_params.get("fields"), self.default_fields)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        product = ProductService.get_product(product_id, fields, raw=True)
         if not product:
             return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
-        data = {"id": str(product.id), "name": product.name, "brand": product.brand, "category": product.category.title, "price": product.price, "quantity": product.quantity}
-        return Response(data)
+        categories = ProductService.get_category_map([product]) if "category" in fields else {}
+        return Response(raw_product_to_dict(product, fields, categories))
 
     def put(self, request, product_id):
         try:
@@ -52,12 +169,42 @@ class ProductDetailView(APIView):
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+class ProductStockView(APIView):
+    """API endpoint to reserve, release or adjust a product's stock atomically.
+
+    `reserve` and `release` take `{"quantity": n}`; `adjust` takes `{"delta": n}`.
+    """
+    stock_action = None
+
+    def post(self, request, product_id):
+        try:
+            if self.stock_action == "reserve":
+                quantity = ProductService.reserve_stock(product_id, request.data.get("quantity"))
+            elif self.stock_action == "release":
+                quantity = ProductService.release_stock(product_id, request.data.get("quantity"))
+            else:
+                quantity = ProductService.adjust_stock(product_id, request.data.get("delta"))
+        except InsufficientStockError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except ValueError as e:
+            code = status.HTTP_404_NOT_FOUND if str(e) == "Product not found." else status.HTTP_400_BAD_REQUEST
+            return Response({"error": str(e)}, status=code)
+        return Response({"id": product_id, "quantity": quantity}, status=status.HTTP_200_OK)
+
 class ProductsByCategoryView(APIView):
     """API endpoint to fetch products by category."""
+    default_fields = ("id", "name", "brand", "price")
+
     def get(self, request, category_title):
         try:
-            products = ProductService.get_products_by_category(category_title)
-            data = [{"id": str(p.id), "name": p.name, "brand": p.brand, "price": p.price} for p in products]
-            return Response(data, status=status.HTTP_200_OK)
+            after, limit = parse_page_params(request.query_params)
+            fields = parse_fields(request.query_params.get("fields"), self.default_fields)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            products, next_cursor = paginate(ProductService.get_products_by_category(category_title, after, limit, fields, raw=True), limit)
+            categories = {products[0].get("category"): category_title} if products else {}
+            data = [raw_product_to_dict(p, fields, categories) for p in products]
+            return Response({"results": data, "next": next_cursor}, status=status.HTTP_200_OK)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
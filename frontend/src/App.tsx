@@ -25,7 +25,7 @@ const App = () => {
         }
       }
       const res = await axios.get(url);
-      setProducts(res.data);
+      setProducts(res.data.results);
     } catch (err) {
       console.error("Failed to fetch products", err);
     }